@@ -0,0 +1,175 @@
+"""AI Doctor Agent - Admission Control
+
+동시 상담(에이전트 루프) 수를 제한하고, 초과 요청은 제한된 크기의 대기열에서
+FIFO로 기다리게 한다. 대기열까지 가득 차면 즉시 거절(429)하여 트래픽 급증 시
+프로바이더 rate limit과 전체 지연 시간 붕괴를 막는다.
+"""
+
+import asyncio
+import statistics
+import time
+from collections import deque
+from typing import AsyncGenerator
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 참 - 즉시 거절"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("상담 대기열이 가득 찼습니다")
+        self.retry_after = retry_after
+
+
+class AdmissionTimeout(Exception):
+    """대기 시간 초과"""
+
+
+class AdmissionController:
+    """동시 실행 제한 + 제한된 대기열"""
+
+    def __init__(self, max_concurrent: int = 64, max_queue: int = 128,
+                 queue_timeout: float = 30.0, retry_after: int = 5,
+                 position_update_interval: float = 1.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.position_update_interval = position_update_interval
+
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._wait_times: deque[float] = deque(maxlen=1000)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def reject(self) -> QueueFullError:
+        """거절 기록 후 예외 반환"""
+        self.rejected += 1
+        return QueueFullError(self.retry_after)
+
+    def reserve(self) -> "Reservation":
+        """실행 슬롯 또는 대기열 자리를 즉시 확보 (await 없이 확인과 확보를 함께 수행)
+
+        스트림 응답을 만들기 전에 호출하면 확인 후 마지막 자리를 다른 요청에
+        빼앗겨 200 응답 뒤 오류 이벤트로 끝나는 경우가 없다. 반환된 Reservation은
+        wait()로 슬롯을 기다리고, 끝나면 반드시 release()해야 한다.
+
+        Raises:
+            QueueFullError: 대기열이 가득 참
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._record_admission(0.0)
+            return Reservation(self)
+
+        if len(self._waiters) >= self.max_queue:
+            raise self.reject()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return Reservation(self, waiter)
+
+    def release(self) -> None:
+        """슬롯 반환 - 대기자가 있으면 가장 오래 기다린 요청에 바로 넘김"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _record_admission(self, wait_time: float) -> None:
+        self.admitted += 1
+        self._wait_times.append(wait_time)
+
+    def stats(self) -> dict:
+        """대기열 깊이 및 대기 시간 통계"""
+        waits = sorted(self._wait_times)
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds": {
+                "mean": round(statistics.fmean(waits), 4) if waits else 0.0,
+                "p50": round(_percentile(waits, 0.50), 4),
+                "p95": round(_percentile(waits, 0.95), 4),
+                "max": round(waits[-1], 4) if waits else 0.0,
+            },
+        }
+
+
+class Reservation:
+    """reserve()로 확보한 실행 슬롯 또는 대기열 자리"""
+
+    def __init__(self, controller: AdmissionController, waiter: asyncio.Future | None = None):
+        self._controller = controller
+        self._waiter = waiter  # None이면 확보 시점에 이미 슬롯 보유
+        self._started = time.monotonic()
+        self._released = False
+
+    async def wait(self) -> AsyncGenerator[int, None]:
+        """슬롯을 넘겨받을 때까지 대기열 위치(1부터)를 전달 - 이미 슬롯을 보유하면 바로 끝남
+
+        대기 중 시간 초과/취소/예외가 나면 자리를 반환한 뒤 다시 발생시킨다.
+
+        Raises:
+            AdmissionTimeout: queue_timeout 안에 슬롯을 얻지 못함
+        """
+        waiter = self._waiter
+        if waiter is None:
+            return
+
+        controller = self._controller
+        deadline = self._started + controller.queue_timeout
+        position = None
+        try:
+            while not waiter.done():
+                current = controller._waiters.index(waiter) + 1
+                if current != position:
+                    position = current
+                    yield position
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    controller.timed_out += 1
+                    raise AdmissionTimeout(f"대기 시간 초과 ({controller.queue_timeout:.0f}초)")
+                await asyncio.wait({waiter}, timeout=min(remaining, controller.position_update_interval))
+        except BaseException:
+            self.release()
+            raise
+
+        # release()가 슬롯을 그대로 넘겨주었으므로 active는 이미 포함됨
+        controller._record_admission(time.monotonic() - self._started)
+
+    def release(self) -> None:
+        """슬롯 또는 대기열 자리 반환 (여러 번 호출해도 한 번만 반영)"""
+        if self._released:
+            return
+        self._released = True
+
+        waiter = self._waiter
+        if waiter is None or (waiter.done() and not waiter.cancelled()):
+            # 슬롯 보유 중 (넘겨받은 직후 취소/시간 초과 포함) - 다음 대기자에게 반환
+            self._controller.release()
+        else:
+            waiter.cancel()
+            if waiter in self._controller._waiters:
+                self._controller._waiters.remove(waiter)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """정렬된 값의 분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
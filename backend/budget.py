@@ -0,0 +1,127 @@
+"""AI Doctor Agent - Token/Cost Budgets
+
+상담 단위, 환자 단위(고정 기간 누적) 토큰/비용 예산과 전체 누적 사용량.
+
+예산은 LLM 응답의 usage로 집계한 실제 사용량 기준이다. 예산이 소진되면 에이전트 루프가
+도구 없이 최종 답변을 작성하는 마지막 턴을 실행한다 (main._consult 참고).
+"""
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+from backend.cache import TTLCache
+from backend.usage import UsageTracker
+
+
+@dataclass
+class Budget:
+    """토큰/비용 한도 (0이면 제한 없음)"""
+    tokens: int = 0
+    cost: float = 0.0
+
+    def exceeded(self, tokens: int, cost: float) -> str | None:
+        """소진된 항목 ("tokens" / "cost") 또는 None"""
+        if self.tokens and tokens >= self.tokens:
+            return "tokens"
+        if self.cost and cost >= self.cost:
+            return "cost"
+        return None
+
+
+@dataclass
+class PatientSpend:
+    """환자 1명의 현재 기간 누적 사용량"""
+    started_at: float
+    tokens: int = 0
+    cost: float = 0.0
+    consultations: int = 0
+
+
+class BudgetLedger:
+    """예산 확인 및 환자별/전체 누적 사용량 기록
+
+    환자별 사용량은 window(초) 단위 고정 기간으로 누적하고 기간이 지나면 0부터 다시 센다.
+    최근 사용 환자 max_patients명까지만 보관한다.
+    """
+
+    def __init__(self, consultation: Budget, patient: Budget, window: float = 86400.0,
+                 max_patients: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.consultation = consultation
+        self.patient = patient
+        self.window = window
+        self._clock = clock
+        self._patients = TTLCache(max_entries=max_patients, ttl=window, clock=clock)
+        self._lock = threading.Lock()
+
+        self.total_tokens = 0
+        self.total_cost = 0.0
+        self.consultations = 0
+        self.exhausted: Counter[str] = Counter()
+
+    def _spend(self, patient_id: str) -> PatientSpend:
+        now = self._clock()
+        spend = self._patients.get(patient_id)
+        if spend is None or now - spend.started_at >= self.window:
+            spend = PatientSpend(started_at=now)
+            self._patients.set(patient_id, spend)
+        return spend
+
+    def start(self, patient_id: str) -> None:
+        """상담 시작 기록"""
+        with self._lock:
+            self._spend(patient_id).consultations += 1
+            self.consultations += 1
+
+    def charge(self, patient_id: str, tokens: int, cost: float) -> None:
+        """LLM 호출 1회 사용량 누적"""
+        with self._lock:
+            spend = self._spend(patient_id)
+            spend.tokens += tokens
+            spend.cost += cost
+            self._patients.set(patient_id, spend)
+            self.total_tokens += tokens
+            self.total_cost += cost
+
+    def check(self, patient_id: str, usage: UsageTracker) -> str | None:
+        """소진된 예산 ("consultation_tokens", "patient_cost" 등) 또는 None"""
+        reason = self.consultation.exceeded(usage.total_tokens, usage.cost)
+        if reason:
+            return f"consultation_{reason}"
+        with self._lock:
+            spend = self._spend(patient_id)
+            reason = self.patient.exceeded(spend.tokens, spend.cost)
+        return f"patient_{reason}" if reason else None
+
+    def record_exhausted(self, reason: str) -> None:
+        with self._lock:
+            self.exhausted[reason] += 1
+
+    def patient_summary(self, patient_id: str) -> dict:
+        """환자의 현재 기간 사용량과 한도"""
+        with self._lock:
+            spend = self._spend(patient_id)
+            return {
+                "tokens": spend.tokens,
+                "cost_usd": round(spend.cost, 6),
+                "consultations": spend.consultations,
+                "token_budget": self.patient.tokens,
+                "cost_budget_usd": self.patient.cost,
+            }
+
+    def stats(self) -> dict:
+        """대시보드용 누적 사용량"""
+        with self._lock:
+            return {
+                "total_tokens": self.total_tokens,
+                "total_cost_usd": round(self.total_cost, 6),
+                "consultations": self.consultations,
+                "budget_exhausted": dict(self.exhausted),
+                "tracked_patients": len(self._patients),
+                "consultation_budget": {"tokens": self.consultation.tokens, "cost_usd": self.consultation.cost},
+                "patient_budget": {
+                    "tokens": self.patient.tokens, "cost_usd": self.patient.cost, "window_s": self.window,
+                },
+            }
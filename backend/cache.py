@@ -0,0 +1,175 @@
+"""AI Doctor Agent - LRU/TTL Cache
+
+세션 저장소, 응답 캐시, RxNorm 조회 등에서 공통으로 사용하는 인메모리 캐시와
+동시 호출 합치기(SingleFlight).
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU + TTL 캐시 (스레드 안전)
+
+    max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    ttl(초)이 지난 항목은 조회 시점에 만료 처리한다. ttl이 None이면 만료 없음.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """조회 (적중 시 최근 사용으로 갱신)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = _MISSING) -> None:
+        """저장 (ttl 미지정 시 캐시 기본 ttl 사용)"""
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        """전체 비우기 (통계는 유지)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """적중/미스/제거 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class _Call:
+    """진행 중인 호출 1건"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """같은 키의 동시 호출을 하나로 합침 (스레드 안전)
+
+    먼저 들어온 호출만 fn을 실행하고, 실행 중에 들어온 같은 키의 호출은 그 결과(또는 예외)를
+    함께 받는다. 결과를 저장하지 않으므로 캐시(TTLCache 등)와 함께 사용한다.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """실행/합쳐진 호출 수"""
+        with self._lock:
+            return {"in_flight": len(self._calls), "calls": self.calls, "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight:
+    """SingleFlight의 asyncio 버전 (같은 이벤트 루프 안에서 사용)
+
+    공유 작업은 태스크로 실행하므로 기다리던 호출 하나가 취소되어도 다른 호출의 작업은 계속된다.
+    """
+
+    def __init__(self):
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """실행/합쳐진 호출 수"""
+        return {"in_flight": len(self._tasks), "calls": self.calls, "coalesced": self.coalesced}
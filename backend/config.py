@@ -15,19 +15,187 @@ class Config:
     prompts_dir: Path = None
     data_dir: Path = None
 
+    # 시스템 프롬프트 변경 확인 주기 (초, 0이면 매 요청마다 확인)
+    prompt_check_interval: float = 2.0
+
+    # 멀티턴 세션 (LRU + TTL) 및 컨텍스트 압축
+    session_max_sessions: int = 1000
+    session_ttl: float = 1800.0
+    context_token_budget: int = 6000
+    session_keep_recent_turns: int = 1
+
+    # 정확 일치 응답 캐시 (replay=True면 기록된 이벤트 스트림 전체를 재생)
+    response_cache_enabled: bool = False
+    response_cache_max_entries: int = 512
+    response_cache_ttl: float = 600.0
+    response_cache_replay: bool = False
+
     # 서버
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # 도구 실행 (동기 도구용 스레드 풀 크기, 결정적 도구 결과 캐시)
+    tool_max_workers: int = 16
+    tool_cache_enabled: bool = True
+
+    # 약물 조회 도구의 RxNorm 동시 요청 수 (도구 실행 간 공유)
+    rxnorm_max_concurrency: int = 8
+
+    # 오프라인 RxNorm 미러 (RRF 릴리스를 가져온 SQLite 파일, None이면 RxNav 사용)
+    # 약물 검색/속성/관련 약물은 미러에서만 조회 (상호작용은 RRF에 없으므로 RxNav)
+    rxnorm_mirror_path: Path = None
+
+    # 비동기 RxNorm 클라이언트 커넥션 풀 (keep-alive, RxNav 단일 호스트 기준 동시 연결 수)
+    rxnorm_max_connections: int = 20
+    rxnorm_max_keepalive_connections: int = 10
+    rxnorm_keepalive_expiry: float = 30.0
+    rxnorm_timeout: float = 10.0
+
+    # RxNorm 응답 디스크 캐시 (SQLite, 워커 프로세스 간 공유)
+    # 빈 결과는 negative_ttl, 만료 후 stale_ttl 동안은 이전 응답을 주고 백그라운드 갱신
+    rxnorm_cache_enabled: bool = True
+    rxnorm_cache_path: Path = None
+    rxnorm_cache_negative_ttl: float = 3600.0
+    rxnorm_cache_stale_ttl: float = 7 * 86400.0
+
+    # RxNorm 인메모리 LRU (0이면 비활성화) - 동시 동일 조회는 항상 요청 1건으로 합침
+    rxnorm_memory_cache_size: int = 4096
+    rxnorm_memory_cache_ttl: float = 3600.0
+
+    # 동시 상담 제한 (초과 요청은 대기열에서 대기, 대기열도 가득 차면 429)
+    chat_max_concurrent: int = 64
+    chat_max_queue: int = 128
+    chat_queue_timeout: float = 30.0
+    chat_retry_after: int = 5
+
+    # 상담 1건의 최대 실행 시간 (초, 0이면 제한 없음) - 초과 시 부분 답변으로 종료
+    chat_deadline: float = 120.0
+
+    # 배치 상담 (/api/chat/batch) - 기본/최대 동시 실행 수, 요청당 최대 케이스 수
+    batch_parallelism: int = 8
+    batch_max_parallelism: int = 32
+    batch_max_cases: int = 1000
+
+    # 토큰/비용 예산 (0이면 제한 없음) - 소진 시 도구 없이 최종 답변 턴 실행
+    consultation_token_budget: int = 100_000
+    consultation_cost_budget: float = 0.50
+    patient_token_budget: int = 0
+    patient_cost_budget: float = 0.0
+    patient_budget_window: float = 86400.0  # 환자별 누적 기간 (초)
+
+    # 트레이싱 - 최근 트레이스 메모리 보관 수, OTLP/JSON 내보내기 파일 (빈 값이면 내보내지 않음)
+    trace_enabled: bool = True
+    trace_max_traces: int = 200
+    trace_export_path: str = ""
+
+    # 관리자 전용 기능 (X-Admin-Token) - 빈 값이면 비활성
+    admin_token: str = ""
+
+    # 요청 단위 샘플링 프로파일러 (X-Profile 헤더) - 결과 디렉토리, 샘플링 간격 (초)
+    profile_dir: Path = None
+    profile_interval: float = 0.005
+
+    # SSE heartbeat 간격 (초, 0이면 보내지 않음) - 긴 LLM/도구 대기 중 프록시 유휴 타임아웃 방지
+    sse_heartbeat_interval: float = 15.0
+
+    # 스트림 페이싱: "fast" (지연 없음, API/배치용) 또는 "ui" (이벤트 사이 지연)
+    stream_pacing: str = "fast"
+    ui_pacing_delay: float = 0.1
+
     # OpenAI
     openai_api_key: str = None
     openai_model: str = "gpt-4o"
 
+    # LLM 백엔드: "openai" 또는 "scripted" (네트워크 없이 정해진 도구 호출 순서를 재현)
+    llm_backend: str = "openai"
+    scripted_llm_latency: float = 0.5
+    scripted_llm_chunk_delay: float = 0.0
+    scripted_llm_medications: bool = False  # 치료 단계에서 get_medication_options(RxNorm)도 호출
+
+    # LLM 커넥션 풀 (워커 전체에서 공유)
+    llm_max_connections: int = 200
+    llm_max_keepalive_connections: int = 50
+    llm_timeout: float = 60.0
+    llm_streaming: bool = True  # 토큰 단위 스트리밍 (response_delta 이벤트)
+
+    # 프롬프트 캐시 / 토큰 단가 (USD / 1M 토큰)
+    prompt_cache_key: str = "doctor-agent"
+    llm_input_price: float = 2.50
+    llm_cached_input_price: float = 1.25
+    llm_output_price: float = 10.00
+
     def __post_init__(self):
         self.skills_dir = self.base_dir / "skills"
         self.prompts_dir = self.base_dir / "prompts"
         self.data_dir = self.base_dir / "data"
+        self.profile_dir = self.base_dir / os.getenv("PROFILE_DIR", "profiles")  # 상대 경로는 프로젝트 기준
         self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
+        self.prompt_check_interval = float(os.getenv("PROMPT_CHECK_INTERVAL", self.prompt_check_interval))
+        self.session_max_sessions = int(os.getenv("SESSION_MAX_SESSIONS", self.session_max_sessions))
+        self.session_ttl = float(os.getenv("SESSION_TTL", self.session_ttl))
+        self.context_token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", self.context_token_budget))
+        self.session_keep_recent_turns = int(os.getenv("SESSION_KEEP_RECENT_TURNS", self.session_keep_recent_turns))
+        self.response_cache_enabled = _env_bool("RESPONSE_CACHE_ENABLED", self.response_cache_enabled)
+        self.response_cache_max_entries = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", self.response_cache_max_entries))
+        self.response_cache_ttl = float(os.getenv("RESPONSE_CACHE_TTL", self.response_cache_ttl))
+        self.response_cache_replay = _env_bool("RESPONSE_CACHE_REPLAY", self.response_cache_replay)
+        self.tool_max_workers = int(os.getenv("TOOL_MAX_WORKERS", self.tool_max_workers))
+        self.tool_cache_enabled = _env_bool("TOOL_CACHE_ENABLED", self.tool_cache_enabled)
+        self.rxnorm_max_concurrency = int(os.getenv("RXNORM_MAX_CONCURRENCY", self.rxnorm_max_concurrency))
+        rxnorm_mirror = os.getenv("RXNORM_MIRROR_PATH", "")
+        self.rxnorm_mirror_path = self.base_dir / rxnorm_mirror if rxnorm_mirror else None
+        self.rxnorm_max_connections = int(os.getenv("RXNORM_MAX_CONNECTIONS", self.rxnorm_max_connections))
+        self.rxnorm_max_keepalive_connections = int(
+            os.getenv("RXNORM_MAX_KEEPALIVE_CONNECTIONS", self.rxnorm_max_keepalive_connections)
+        )
+        self.rxnorm_keepalive_expiry = float(os.getenv("RXNORM_KEEPALIVE_EXPIRY", self.rxnorm_keepalive_expiry))
+        self.rxnorm_timeout = float(os.getenv("RXNORM_TIMEOUT", self.rxnorm_timeout))
+        self.rxnorm_cache_enabled = _env_bool("RXNORM_CACHE_ENABLED", self.rxnorm_cache_enabled)
+        self.rxnorm_cache_path = self.base_dir / os.getenv("RXNORM_CACHE_PATH", "cache/rxnorm.sqlite3")
+        self.rxnorm_cache_negative_ttl = float(os.getenv("RXNORM_CACHE_NEGATIVE_TTL", self.rxnorm_cache_negative_ttl))
+        self.rxnorm_cache_stale_ttl = float(os.getenv("RXNORM_CACHE_STALE_TTL", self.rxnorm_cache_stale_ttl))
+        self.rxnorm_memory_cache_size = int(os.getenv("RXNORM_MEMORY_CACHE_SIZE", self.rxnorm_memory_cache_size))
+        self.rxnorm_memory_cache_ttl = float(os.getenv("RXNORM_MEMORY_CACHE_TTL", self.rxnorm_memory_cache_ttl))
+        self.chat_max_concurrent = int(os.getenv("CHAT_MAX_CONCURRENT", self.chat_max_concurrent))
+        self.chat_max_queue = int(os.getenv("CHAT_MAX_QUEUE", self.chat_max_queue))
+        self.chat_queue_timeout = float(os.getenv("CHAT_QUEUE_TIMEOUT", self.chat_queue_timeout))
+        self.chat_retry_after = int(os.getenv("CHAT_RETRY_AFTER", self.chat_retry_after))
+        self.chat_deadline = float(os.getenv("CHAT_DEADLINE", self.chat_deadline))
+        self.batch_parallelism = int(os.getenv("BATCH_PARALLELISM", self.batch_parallelism))
+        self.batch_max_parallelism = int(os.getenv("BATCH_MAX_PARALLELISM", self.batch_max_parallelism))
+        self.batch_max_cases = int(os.getenv("BATCH_MAX_CASES", self.batch_max_cases))
+        self.consultation_token_budget = int(os.getenv("CONSULTATION_TOKEN_BUDGET", self.consultation_token_budget))
+        self.consultation_cost_budget = float(os.getenv("CONSULTATION_COST_BUDGET", self.consultation_cost_budget))
+        self.patient_token_budget = int(os.getenv("PATIENT_TOKEN_BUDGET", self.patient_token_budget))
+        self.patient_cost_budget = float(os.getenv("PATIENT_COST_BUDGET", self.patient_cost_budget))
+        self.patient_budget_window = float(os.getenv("PATIENT_BUDGET_WINDOW", self.patient_budget_window))
+        self.trace_enabled = _env_bool("TRACE_ENABLED", self.trace_enabled)
+        self.trace_max_traces = int(os.getenv("TRACE_MAX_TRACES", self.trace_max_traces))
+        self.trace_export_path = os.getenv("TRACE_EXPORT_PATH", self.trace_export_path)
+        self.admin_token = os.getenv("ADMIN_TOKEN", self.admin_token)
+        self.profile_interval = float(os.getenv("PROFILE_INTERVAL", self.profile_interval))
+        self.sse_heartbeat_interval = float(os.getenv("SSE_HEARTBEAT_INTERVAL", self.sse_heartbeat_interval))
+        self.stream_pacing = os.getenv("STREAM_PACING", self.stream_pacing)
+        self.ui_pacing_delay = float(os.getenv("UI_PACING_DELAY", self.ui_pacing_delay))
+        self.llm_backend = os.getenv("LLM_BACKEND", self.llm_backend)
+        self.scripted_llm_latency = float(os.getenv("SCRIPTED_LLM_LATENCY", self.scripted_llm_latency))
+        self.scripted_llm_chunk_delay = float(os.getenv("SCRIPTED_LLM_CHUNK_DELAY", self.scripted_llm_chunk_delay))
+        self.scripted_llm_medications = _env_bool("SCRIPTED_LLM_MEDICATIONS", self.scripted_llm_medications)
+        self.llm_max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", self.llm_max_connections))
+        self.llm_max_keepalive_connections = int(
+            os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", self.llm_max_keepalive_connections)
+        )
+        self.llm_timeout = float(os.getenv("LLM_TIMEOUT", self.llm_timeout))
+        self.prompt_cache_key = os.getenv("PROMPT_CACHE_KEY", self.prompt_cache_key)
+        self.llm_input_price = float(os.getenv("LLM_INPUT_PRICE", self.llm_input_price))
+        self.llm_cached_input_price = float(os.getenv("LLM_CACHED_INPUT_PRICE", self.llm_cached_input_price))
+        self.llm_output_price = float(os.getenv("LLM_OUTPUT_PRICE", self.llm_output_price))
+        self.llm_streaming = _env_bool("LLM_STREAMING", self.llm_streaming)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """불리언 환경 변수 (1/true/yes)"""
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
 
 
 config = Config()
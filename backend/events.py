@@ -0,0 +1,68 @@
+"""AI Doctor Agent - Event Encoding
+
+스트림 이벤트 JSON 직렬화와 SSE 프레이밍.
+
+- orjson이 설치되어 있으면 사용하고, 없으면 표준 json (같은 compact 형식, 비ASCII 그대로)
+- 내용이 고정된 이벤트는 static_event()로 한 번만 인코딩하여 재사용
+- 내부 이벤트는 JSON 한 줄("...\\n") 형식이고, /api/chat 응답에서만 sse_frames()로
+  `data:` 프레임으로 감싼다 (배치 NDJSON, 응답 캐시 재생, 테스트는 줄 형식 그대로 사용)
+"""
+
+import json
+from contextlib import aclosing
+from functools import lru_cache
+from typing import AsyncGenerator
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# 유휴 구간에 보내는 SSE 주석 (클라이언트는 무시, 프록시 유휴 타임아웃 방지)
+SSE_HEARTBEAT = ": ping\n\n"
+
+
+def dumps(obj) -> str:
+    """compact JSON 문자열"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_event(event_type: str, data: dict) -> str:
+    """{"type": ..., "data": ...} 한 줄"""
+    return dumps({"type": event_type, "data": data}) + "\n"
+
+
+@lru_cache(maxsize=512)
+def _static(event_type: str, items: tuple) -> str:
+    return encode_event(event_type, dict(items))
+
+
+def static_event(event_type: str, **data) -> str:
+    """내용이 고정된 이벤트 - 같은 인자면 캐시된 문자열 반환 (인자 값은 hashable이어야 함)"""
+    return _static(event_type, tuple(data.items()))
+
+
+def sse_frame(event: str) -> str:
+    """JSON 한 줄 → SSE data 프레임"""
+    return f"data: {event.rstrip()}\n\n"
+
+
+async def sse_frames(events: AsyncGenerator[str, None]) -> AsyncGenerator[str, None]:
+    """줄 단위 이벤트 스트림을 SSE 프레임 스트림으로 변환"""
+    async with aclosing(events):
+        async for event in events:
+            yield sse_frame(event)
+
+
+def parse_sse(text: str) -> list[dict]:
+    """SSE 응답 본문 → 이벤트 목록 (주석/heartbeat 제외)"""
+    events = []
+    for frame in text.split("\n\n"):
+        data = "\n".join(line[5:].lstrip() for line in frame.splitlines() if line.startswith("data:"))
+        if data:
+            events.append(json.loads(data))
+    return events
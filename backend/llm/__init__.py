@@ -0,0 +1,41 @@
+"""AI Doctor Agent - LLM Backends"""
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from .base import LLMBackend, assistant_message
+from .openai_backend import OpenAIBackend
+from .scripted import ScriptedBackend
+
+__all__ = [
+    "LLMBackend",
+    "OpenAIBackend",
+    "ScriptedBackend",
+    "assistant_message",
+    "create_backend",
+]
+
+
+def create_backend(config) -> LLMBackend:
+    """Config.llm_backend에 따른 백엔드 생성 ("openai" 또는 "scripted")"""
+    if config.llm_backend == "scripted":
+        return ScriptedBackend(
+            latency=config.scripted_llm_latency,
+            chunk_delay=config.scripted_llm_chunk_delay,
+            medications=config.scripted_llm_medications,
+        )
+
+    if config.llm_backend == "openai":
+        # 비동기 클라이언트: 완료 대기 중에도 이벤트 루프가 다른 스트림을 처리
+        return OpenAIBackend(AsyncOpenAI(
+            api_key=config.openai_api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=config.llm_max_connections,
+                    max_keepalive_connections=config.llm_max_keepalive_connections,
+                ),
+                timeout=config.llm_timeout,
+            ),
+        ))
+
+    raise ValueError(f"알 수 없는 LLM 백엔드: {config.llm_backend}")
@@ -0,0 +1,37 @@
+"""AI Doctor Agent - LLM Backend Interface
+
+에이전트 루프가 사용하는 LLM 호출 인터페이스. 요청 파라미터는 OpenAI
+Chat Completions 형식(model, messages, tools, ...)을 그대로 사용하고,
+응답은 대화 이력에 바로 추가할 수 있는 어시스턴트 메시지 dict로 반환한다.
+"""
+
+from typing import AsyncGenerator
+
+
+class LLMBackend:
+    """LLM 백엔드 기본 클래스"""
+
+    name = "base"
+
+    async def complete(self, **request) -> tuple[dict, object]:
+        """비스트리밍 호출 - (어시스턴트 메시지 dict, usage) 반환"""
+        raise NotImplementedError
+
+    def stream(self, **request) -> AsyncGenerator[tuple[str, str | dict], None]:
+        """스트리밍 호출
+
+        ("delta", text)를 도착 즉시, ("usage", usage)를 마지막 청크에서,
+        ("message", 어시스턴트 메시지)를 맨 마지막에 전달한다.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """커넥션 등 리소스 정리"""
+
+
+def assistant_message(content: str | None, tool_calls: list) -> dict:
+    """대화 이력에 추가할 어시스턴트 메시지 생성"""
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return message
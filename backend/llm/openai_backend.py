@@ -0,0 +1,73 @@
+"""AI Doctor Agent - OpenAI LLM Backend"""
+
+from typing import AsyncGenerator
+
+from openai import AsyncOpenAI
+
+from backend.llm.base import LLMBackend, assistant_message
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI Chat Completions 백엔드 (비동기 클라이언트, 공유 커넥션 풀)"""
+
+    name = "openai"
+
+    def __init__(self, client: AsyncOpenAI):
+        self.client = client
+
+    async def complete(self, **request) -> tuple[dict, object]:
+        response = await self.client.chat.completions.create(**request)
+        message = response.choices[0].message
+        tool_calls = [
+            {
+                "id": tool_call.id,
+                "type": "function",
+                "function": {
+                    "name": tool_call.function.name,
+                    "arguments": tool_call.function.arguments,
+                },
+            }
+            for tool_call in message.tool_calls or []
+        ]
+        return assistant_message(message.content, tool_calls), response.usage
+
+    async def stream(self, **request) -> AsyncGenerator[tuple[str, str | dict], None]:
+        """content 델타는 도착 즉시 전달하고, tool_call 델타는 index별로 조립"""
+        stream = await self.client.chat.completions.create(
+            **request,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        content_parts = []
+        tool_calls: dict[int, dict] = {}
+        async with stream:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    yield "usage", chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield "delta", delta.content
+
+                for tool_call_delta in delta.tool_calls or []:
+                    tool_call = tool_calls.setdefault(tool_call_delta.index, {
+                        "id": None,
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""},
+                    })
+                    if tool_call_delta.id:
+                        tool_call["id"] = tool_call_delta.id
+                    function = tool_call_delta.function
+                    if function is not None:
+                        tool_call["function"]["name"] += function.name or ""
+                        tool_call["function"]["arguments"] += function.arguments or ""
+
+        content = "".join(content_parts) or None
+        yield "message", assistant_message(content, [tool_calls[i] for i in sorted(tool_calls)])
+
+    async def close(self) -> None:
+        await self.client.close()
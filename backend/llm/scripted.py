@@ -0,0 +1,166 @@
+"""AI Doctor Agent - Scripted LLM Backend
+
+네트워크/API 비용 없이 실제 에이전트 루프를 실행하기 위한 결정적 대체 LLM.
+부하 테스트, 벤치마크, CI에서 오케스트레이션 오버헤드를 측정하는 용도.
+
+대화 상태(이번 질문 이후의 도구 호출 라운드 수)에 따라 다음 순서로 응답한다:
+read_skill → analyze_symptoms → assess_severity → recommend_treatment → 최종 답변
+(medications=True면 recommend_treatment와 함께 get_medication_options를 병렬 호출)
+tool_choice="none"이면 순서와 관계없이 지금까지의 도구 결과로 최종 답변을 반환한다.
+"""
+
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from typing import AsyncGenerator
+
+from backend.llm.base import LLMBackend, assistant_message
+from backend.sessions import estimate_tokens
+
+# 증상 키워드 → 예상 진단명
+DIAGNOSES = {
+    "허리": "요추 추간판 탈출증",
+    "두통": "긴장성 두통",
+    "머리": "긴장성 두통",
+    "무릎": "퇴행성 관절염",
+    "어깨": "회전근개 건염",
+}
+DEFAULT_DIAGNOSIS = "근골격계 통증"
+
+SEVERITY_MARKERS = {"🟢": "mild", "🟡": "moderate", "🔴": "severe"}
+SEVERITY_KR = {"mild": "경증", "moderate": "중등증", "severe": "중증"}
+
+PATIENT_ID = re.compile(r"\[환자 ID: ([^\]]+)\]")
+STREAM_CHUNK_CHARS = 4
+
+
+class ScriptedBackend(LLMBackend):
+    """정해진 도구 호출 순서를 따르는 결정적 로컬 백엔드
+
+    latency: 호출마다 첫 응답까지의 지연 (초)
+    chunk_delay: 스트리밍 청크 사이 지연 (초)
+    medications: 치료 추천 단계에서 약물 옵션(RxNorm)도 조회
+    """
+
+    name = "scripted"
+
+    def __init__(self, latency: float = 0.0, chunk_delay: float = 0.0, medications: bool = False):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.medications = medications
+        self.calls = 0
+
+    async def complete(self, **request) -> tuple[dict, object]:
+        self.calls += 1
+        await _sleep(self.latency)
+        return self._respond(request["messages"], request.get("tool_choice") == "none")
+
+    async def stream(self, **request) -> AsyncGenerator[tuple[str, str | dict], None]:
+        self.calls += 1
+        await _sleep(self.latency)
+        message, usage = self._respond(request["messages"], request.get("tool_choice") == "none")
+
+        content = message["content"] or ""
+        for i in range(0, len(content), STREAM_CHUNK_CHARS):
+            yield "delta", content[i:i + STREAM_CHUNK_CHARS]
+            await _sleep(self.chunk_delay)
+        yield "usage", usage
+        yield "message", message
+
+    def _respond(self, messages: list, final: bool = False) -> tuple[dict, object]:
+        """대화 상태에 따른 다음 응답"""
+        question, rounds = _current_turn(messages)
+        diagnosis = next((d for k, d in DIAGNOSES.items() if k in question), DEFAULT_DIAGNOSIS)
+        match = PATIENT_ID.search(question)
+        patient_id = match.group(1) if match else "P001"
+        symptoms = PATIENT_ID.sub("", question).strip().splitlines()[0] if question.strip() else ""
+
+        if final or len(rounds) >= 4:
+            severity = _severity(rounds[2]) if len(rounds) > 2 else "moderate"
+            content = _final_answer(patient_id, diagnosis, severity, rounds[3] if len(rounds) > 3 else "")
+            return assistant_message(content, []), _usage(messages, content)
+        elif len(rounds) == 0:
+            calls = [("read_skill", {"skill_name": "symptom-analysis"})]
+        elif len(rounds) == 1:
+            calls = [("analyze_symptoms", {"symptoms": symptoms[:100]})]
+        elif len(rounds) == 2:
+            calls = [("assess_severity", {"diagnosis": diagnosis, "symptoms_summary": symptoms[:100]})]
+        else:
+            severity = _severity(rounds[-1])
+            calls = [("recommend_treatment", {"diagnosis": diagnosis, "severity": severity})]
+            if self.medications:
+                calls.append(("get_medication_options", {"diagnosis": diagnosis}))
+
+        tool_calls = [
+            {
+                "id": f"call_{len(rounds)}_{index}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args, ensure_ascii=False)},
+            }
+            for index, (name, args) in enumerate(calls)
+        ]
+        message = assistant_message(None, tool_calls)
+        return message, _usage(messages, json.dumps(tool_calls, ensure_ascii=False))
+
+
+def _current_turn(messages: list) -> tuple[str, list[str]]:
+    """(이번 질문 텍스트, 도구 호출 라운드별 결과 목록)"""
+    question, rounds = "", []
+    for message in messages:
+        role = message["role"]
+        if role == "user":
+            question, rounds = _text(message.get("content")), []
+        elif role == "assistant" and message.get("tool_calls"):
+            rounds.append("")
+        elif role == "tool" and rounds:
+            rounds[-1] += message.get("content") or ""
+    return question, rounds
+
+
+def _severity(tool_output: str) -> str:
+    """assess_severity 결과에서 심각도 추출"""
+    for marker, severity in SEVERITY_MARKERS.items():
+        if marker in tool_output:
+            return severity
+    return "moderate"
+
+
+def _final_answer(patient_id: str, diagnosis: str, severity: str, treatment: str) -> str:
+    """최종 답변 (치료 추천 결과의 치료 방향 포함)"""
+    direction = next(
+        (line.split(":", 1)[1].strip() for line in treatment.splitlines() if line.startswith("**치료 방향**")),
+        "보존적 치료",
+    )
+    emoji = next(marker for marker, value in SEVERITY_MARKERS.items() if value == severity)
+    return (
+        f"## 진단 결과 (환자 {patient_id})\n\n"
+        f"**예상 진단**: {diagnosis}\n"
+        f"**심각도**: {emoji} {SEVERITY_KR[severity]}\n\n"
+        f"### 치료 방향\n- {direction}\n\n"
+        "증상이 악화되거나 새로운 증상이 나타나면 전문의 진료를 받으세요."
+    )
+
+
+def _usage(messages: list, completion: str):
+    """추정 토큰 사용량 - 첫 호출 이후에는 시스템 프롬프트 접두부가 캐시된 것으로 간주"""
+    prompt_tokens = estimate_tokens(messages)
+    cached_tokens = 0
+    if any(message["role"] == "assistant" for message in messages):
+        cached_tokens = estimate_tokens(messages[:1]) // 128 * 128
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=max(1, len(completion) // 3),
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+    )
+
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+    return content or ""
+
+
+async def _sleep(delay: float) -> None:
+    if delay > 0:
+        await asyncio.sleep(delay)
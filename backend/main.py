@@ -5,24 +5,42 @@ Agent Skills 스펙 기반 의료 AI 에이전트
 
 import json
 import asyncio
+import re
+import secrets
 import sys
+import threading
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Literal
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
-from pydantic import BaseModel
-from openai import OpenAI, OpenAIError
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from openai import OpenAIError
 
 # 경로 설정
 BASE_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
+from backend import metrics, tracing
 from backend.config import config
 from backend.skill_loader import SkillLoader
+from backend.prompt_cache import SystemPromptCache
 from backend.tools.registry import ToolRegistry
-from backend.tools.definitions import TOOL_DEFINITIONS
+from backend.tools.definitions import CACHEABLE_TOOL_DEFINITIONS
+from backend.llm import LLMBackend, create_backend
+from backend.usage import TokenPricing, UsageTracker
+from backend.budget import Budget, BudgetLedger
+from backend.events import JSON_BACKEND, SSE_HEARTBEAT, dumps, encode_event, sse_frames, static_event
+from backend.sessions import SessionStore, compact_history, estimate_tokens
+from backend.response_cache import CachedResponse, ResponseCache
+from backend.admission import AdmissionController, AdmissionTimeout, QueueFullError, Reservation
+from backend.profiler import SamplingProfiler
+from backend.services import rxnorm_api, rxnorm_async
 from backend.logger import get_logger
 from data import MockDataSource
 
@@ -32,10 +50,23 @@ logger = get_logger("main")
 
 # === 초기화 ===
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명주기 - 종료 시 공유 커넥션 풀 정리"""
+    yield
+    await llm_backend.close()
+    await rxnorm_async.async_rxnorm_client.aclose()
+    tool_executor.shutdown(wait=False, cancel_futures=True)
+    tool_registry.close()
+    tracer.close()
+    logger.info("LLM backend, RxNorm client, tool executor and trace exporter closed")
+
+
 app = FastAPI(
     title="AI Doctor Agent API",
     description="Agent Skills 기반 AI 의료 보조 에이전트",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -55,7 +86,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     logger.warning(f"HTTP {exc.status_code}: {exc.detail} | Path: {request.url.path}")
     return JSONResponse(
         status_code=exc.status_code,
-        content={"error": exc.detail, "status_code": exc.status_code}
+        content={"error": exc.detail, "status_code": exc.status_code},
+        headers=exc.headers,
     )
 
 
@@ -75,14 +107,63 @@ try:
     skill_loader = SkillLoader(config.skills_dir)
     logger.info(f"Loaded {len(skill_loader.skills)} skills")
 
+    system_prompt_cache = SystemPromptCache(
+        config.prompts_dir / "system.md", skill_loader, config.prompt_check_interval
+    )
+    system_prompt_cache.get()
+    logger.info(f"System prompt compiled (version: {system_prompt_cache.version})")
+
     data_source = MockDataSource()
     logger.info("Mock data source initialized")
 
-    tool_registry = ToolRegistry(data_source, skill_loader)
-    logger.info("Tool registry initialized")
+    session_store = SessionStore(config.session_max_sessions, config.session_ttl)
+
+    response_cache = (
+        ResponseCache(config.response_cache_max_entries, config.response_cache_ttl)
+        if config.response_cache_enabled else None
+    )
+    logger.info(f"Response cache {'enabled' if response_cache else 'disabled'}")
+
+    admission = AdmissionController(
+        max_concurrent=config.chat_max_concurrent,
+        max_queue=config.chat_max_queue,
+        queue_timeout=config.chat_queue_timeout,
+        retry_after=config.chat_retry_after,
+    )
+    logger.info(
+        f"Admission control initialized (concurrent: {config.chat_max_concurrent}, queue: {config.chat_max_queue})"
+    )
+
+    budget_ledger = BudgetLedger(
+        consultation=Budget(config.consultation_token_budget, config.consultation_cost_budget),
+        patient=Budget(config.patient_token_budget, config.patient_cost_budget),
+        window=config.patient_budget_window,
+    )
+    logger.info(
+        f"Budgets initialized (consultation: {config.consultation_token_budget} tokens / "
+        f"${config.consultation_cost_budget}, patient: {config.patient_token_budget} tokens / "
+        f"${config.patient_cost_budget} per {config.patient_budget_window:.0f}s)"
+    )
 
-    openai_client = OpenAI(api_key=config.openai_api_key)
-    logger.info(f"OpenAI client initialized (model: {config.openai_model})")
+    tool_registry = ToolRegistry(
+        data_source, skill_loader, None if config.tool_cache_enabled else {},
+        lookup_workers=config.rxnorm_max_concurrency,
+    )
+    tool_executor = ThreadPoolExecutor(max_workers=config.tool_max_workers, thread_name_prefix="tool")
+    logger.info(
+        f"Tool registry initialized (workers: {config.tool_max_workers}, "
+        f"RxNorm concurrency: {config.rxnorm_max_concurrency})"
+    )
+
+    llm_backend: LLMBackend = create_backend(config)
+    logger.info(f"LLM backend initialized ({llm_backend.name}, model: {config.openai_model})")
+
+    tracer = tracing.Tracer(
+        enabled=config.trace_enabled,
+        max_traces=config.trace_max_traces,
+        export_path=config.trace_export_path or None,
+    )
+    logger.info(f"Tracing {'enabled' if tracer.enabled else 'disabled'} (export: {config.trace_export_path or 'none'})")
 except Exception as e:
     logger.critical(f"Failed to initialize application: {str(e)}", exc_info=True)
     raise
@@ -90,19 +171,9 @@ except Exception as e:
 
 # === 프롬프트 관리 ===
 
-def load_prompt_template(name: str) -> str:
-    """프롬프트 템플릿 로드"""
-    prompt_path = config.prompts_dir / f"{name}.md"
-    if prompt_path.exists():
-        return prompt_path.read_text(encoding="utf-8")
-    raise FileNotFoundError(f"프롬프트를 찾을 수 없습니다: {name}")
-
-
 def create_system_prompt() -> str:
-    """시스템 프롬프트 생성 (템플릿 + 스킬 XML 주입)"""
-    template = load_prompt_template("system")
-    available_skills_xml = skill_loader.generate_available_skills_xml()
-    return template.replace("{{available_skills}}", available_skills_xml)
+    """시스템 프롬프트 반환 (템플릿 + 스킬 XML 주입, 변경 시에만 재생성)"""
+    return system_prompt_cache.get()
 
 
 # === 요청/응답 모델 ===
@@ -111,6 +182,33 @@ class ChatRequest(BaseModel):
     message: str
     patient_id: str = "P001"
     image: str | None = None  # Base64 인코딩된 이미지 (data:image/...;base64,...)
+    pacing: Literal["fast", "ui"] | None = None  # 이벤트 페이싱 (None이면 서버 기본값)
+    session_id: str | None = Field(default=None, max_length=128)  # 멀티턴 세션 ID (클라이언트 생성)
+
+
+class BatchChatRequest(BaseModel):
+    requests: list[ChatRequest] = Field(min_length=1)
+    parallelism: int | None = Field(default=None, ge=1)  # 동시 실행 수 (None이면 서버 기본값)
+
+
+@dataclass
+class ConsultationResult:
+    """상담 실행 결과 - process_chat이 채우며 응답 캐시 등에서 사용"""
+    content: str | None = None
+    error: str | None = None
+    tool_errors: int = 0
+    iterations: int = 0
+    usage: UsageTracker | None = None
+    trace_id: str | None = None
+    budget_exhausted: str | None = None  # 예산 소진으로 최종 답변을 강제한 사유
+
+
+# 예산 소진/마지막 반복에서 도구 없이 최종 답변을 요청하는 지시
+FINAL_TURN_INSTRUCTION = (
+    "사용 가능한 토큰/비용 예산 또는 분석 단계가 모두 소진되었습니다. "
+    "더 이상 도구를 호출하지 말고, 지금까지의 도구 결과만으로 최종 답변을 작성하세요. "
+    "확인하지 못한 항목은 추가 진료가 필요하다고 안내하세요."
+)
 
 
 # === 채팅 처리 ===
@@ -143,38 +241,106 @@ def build_user_content(message: str, patient_id: str, image: str | None = None)
     return content
 
 
-async def process_chat(message: str, patient_id: str = "P001", image: str | None = None) -> AsyncGenerator[str, None]:
+async def process_chat(
+    message: str,
+    patient_id: str = "P001",
+    image: str | None = None,
+    pacing: str | None = None,
+    session_id: str | None = None,
+    result: ConsultationResult | None = None,
+    trace_id: str | None = None,
+) -> AsyncGenerator[str, None]:
     """채팅 처리 - SSE 스트리밍
 
     Agent Skills 스펙에 따른 동작:
     1. Discovery: 시작 시 스킬 메타데이터가 시스템 프롬프트에 포함됨
     2. Activation: LLM이 read_skill 도구로 필요한 스킬의 전체 내용을 로드
     3. Execution: LLM이 스킬 지침에 따라 도구들을 실행
-    """
 
-    # 사용자 메시지 생성 (이미지 포함 가능)
-    user_content = build_user_content(message, patient_id, image)
+    pacing: "fast"(지연 없음) 또는 "ui"(이벤트 사이 지연). None이면 Config 기본값.
+    session_id: 지정 시 세션의 이전 대화 이력을 이어서 사용하고 완료 후 저장.
+    result: 지정 시 최종 답변, 오류, 반복 횟수, 토큰 사용량을 기록.
 
-    messages = [
-        {"role": "system", "content": create_system_prompt()},
-        {"role": "user", "content": user_content}
-    ]
+    config.chat_deadline을 넘기면 진행 중인 LLM 호출/도구 실행을 취소하고
+    그때까지의 답변을 부분 응답(partial)으로 반환한다.
+
+    상담 전체를 trace_id(미지정 시 새로 생성) 트레이스의 루트 스팬으로 기록하며,
+    trace_id는 마지막 usage 이벤트와 result.trace_id로 전달된다.
+    """
+    result = result if result is not None else ConsultationResult()
+    root = tracer.start_trace(
+        "consultation", trace_id, patient_id=patient_id, image=bool(image), session=bool(session_id),
+    )
+    result.trace_id = root.trace_id
+    try:
+        async with aclosing(_consult(message, patient_id, image, pacing, session_id, result, root)) as events:
+            async for event in events:
+                yield event
+    except (GeneratorExit, asyncio.CancelledError):
+        root.set(cancelled=True)
+        raise
+    except Exception as e:
+        root.record_error(e)
+        raise
+    finally:
+        root.set(iterations=result.iterations, tool_errors=result.tool_errors)
+        if result.error and root.error is None:
+            root.record_error(result.error)
+        root.end()
+
+
+async def _consult(
+    message: str,
+    patient_id: str,
+    image: str | None,
+    pacing: str | None,
+    session_id: str | None,
+    result: ConsultationResult,
+    root: tracing.Span,
+) -> AsyncGenerator[str, None]:
+    """process_chat 본문 - 단계별 스팬을 root 아래에 기록"""
+    pacing_delay = _pacing_delay(pacing)
+    deadline = (
+        asyncio.get_running_loop().time() + config.chat_deadline
+        if config.chat_deadline > 0 else None
+    )
 
-    # === 1단계: Discovery ===
-    yield _log_event(
-        "discovery",
-        "🏥 AI Doctor Agent 시작",
+    with root.child("discovery") as span:
+        # 사용자 메시지 생성 (이미지 포함 가능)
+        user_content = build_user_content(message, patient_id, image)
+
+        # 세션 이력 (환자별로 분리, 토큰 예산 초과 시 압축)
+        session = session_store.get_or_create(session_id, patient_id) if session_id else None
+        history = session.messages if session else []
+        history_tokens = estimate_tokens(history)
+        if history_tokens > config.context_token_budget:
+            history = compact_history(history, config.context_token_budget, config.session_keep_recent_turns)
+        span.set(history_tokens=history_tokens)
+
+        # 고정 접두부(시스템 프롬프트) → 이전 대화 → 이번 질문 순서
+        messages = [
+            {"role": "system", "content": create_system_prompt()},
+            *history,
+            {"role": "user", "content": user_content}
+        ]
+
+    # === 1단계: Discovery === (고정 이벤트는 미리 인코딩된 문자열 재사용)
+    yield static_event(
+        "log",
+        step="discovery",
+        message="🏥 AI Doctor Agent 시작",
         description="스킬 메타데이터 로드 완료"
     )
-    await asyncio.sleep(0.1)
+    await _pace(pacing_delay)
 
     skill_names = [s["name"] for s in skill_loader.list_skills()]
-    yield _log_event(
-        "skills_loaded",
-        f"사용 가능한 스킬: {skill_names}",
+    yield static_event(
+        "log",
+        step="skills_loaded",
+        message=f"사용 가능한 스킬: {skill_names}",
         description="진단 및 치료 스킬 준비됨"
     )
-    await asyncio.sleep(0.1)
+    await _pace(pacing_delay)
 
     # 이미지 첨부 여부에 따른 로그
     if image:
@@ -189,140 +355,763 @@ async def process_chat(message: str, patient_id: str = "P001", image: str | None
             f"환자 증상 접수: {message[:50]}...",
             description="증상 분석 시작"
         )
-    await asyncio.sleep(0.1)
+    await _pace(pacing_delay)
+
+    if history:
+        yield _log_event(
+            "session_resumed",
+            f"🗂️ 이전 상담 이어가기 (턴 #{session.turns + 1})",
+            description="이전 대화 이력을 참고합니다",
+            session_id=session.session_id,
+            turn=session.turns + 1,
+        )
+        if history is not session.messages:
+            yield _log_event(
+                "context_compacted",
+                f"🗜️ 대화 이력 압축: ~{history_tokens} → ~{estimate_tokens(history)} 토큰",
+                description="이전 도구 결과와 오래된 대화를 요약했습니다",
+            )
+        await _pace(pacing_delay)
 
     # === 2단계: 에이전트 루프 ===
+    usage_tracker = UsageTracker(pricing=TokenPricing(
+        input=config.llm_input_price,
+        cached_input=config.llm_cached_input_price,
+        output=config.llm_output_price,
+    ))
+    result.usage = usage_tracker
+    budget_ledger.start(patient_id)
     max_iterations = 10
     for iteration in range(1, max_iterations + 1):
-        yield _log_event(
-            "llm_thinking",
-            f"[진단 단계 #{iteration}] 분석 중...",
+        result.iterations = iteration
+
+        # 예산이 소진되었거나 마지막 반복이면 도구 없이 최종 답변 턴 실행
+        final_turn = iteration == max_iterations
+        exhausted = budget_ledger.check(patient_id, usage_tracker)
+        if exhausted:
+            result.budget_exhausted = exhausted
+            budget_ledger.record_exhausted(exhausted)
+            metrics.budget_exhausted.inc(reason=exhausted)
+            logger.warning(
+                f"Budget exhausted ({exhausted}) | patient_id: {patient_id} | "
+                f"tokens: {usage_tracker.total_tokens} cost: ${usage_tracker.cost:.4f}"
+            )
+            yield _log_event(
+                "budget_exhausted",
+                f"💰 예산 소진 ({exhausted}) - 최종 답변 작성",
+                description="도구 없이 지금까지의 결과로 최종 답변을 작성합니다",
+                reason=exhausted,
+            )
+            final_turn = True
+
+        yield static_event(
+            "log",
+            step="llm_thinking",
+            message=f"[진단 단계 #{iteration}] 분석 중...",
             description="AI가 증상을 분석하고 있습니다"
         )
-        await asyncio.sleep(0.1)
+        await _pace(pacing_delay)
+
+        # 최종 답변 턴은 지시문을 덧붙여 호출 (대화 이력에는 남기지 않음)
+        request_messages = (
+            [*messages, {"role": "system", "content": FINAL_TURN_INSTRUCTION}] if final_turn else messages
+        )
 
-        # OpenAI API 호출
+        # OpenAI API 호출 (스트리밍 모드에서는 content 델타를 즉시 전달)
+        partial_parts = []
+        llm_started = time.perf_counter()
+        cost_before = usage_tracker.cost
+        llm_span = root.child("llm.call", iteration=iteration, streaming=config.llm_streaming, final=final_turn)
         try:
-            response = openai_client.chat.completions.create(
-                model=config.openai_model,
-                messages=messages,
-                tools=TOOL_DEFINITIONS,
-                tool_choice="auto",
+            if config.llm_streaming:
+                assistant_message, usage = None, None
+                async with aclosing(_stream_completion(request_messages, final=final_turn)) as stream:
+                    while (item := await _before(deadline, anext(stream, None))) is not None:
+                        kind, payload = item
+                        if kind == "delta":
+                            partial_parts.append(payload)
+                            yield _response_delta_event(payload, iteration)
+                        elif kind == "usage":
+                            usage = payload
+                        else:
+                            assistant_message = payload
+            else:
+                assistant_message, usage = await _before(
+                    deadline, _create_completion(request_messages, final=final_turn)
+                )
+
+            entry = usage_tracker.record(iteration, usage)
+            budget_ledger.charge(
+                patient_id, entry.prompt_tokens + entry.completion_tokens, usage_tracker.cost - cost_before
+            )
+            _record_llm_call(llm_span, iteration, llm_started, "ok", entry, cost=usage_tracker.cost - cost_before)
+            logger.debug(
+                f"OpenAI API response received (iteration {iteration}) | "
+                f"prompt: {entry.prompt_tokens} cached: {entry.cached_tokens} "
+                f"completion: {entry.completion_tokens}"
             )
-            logger.debug(f"OpenAI API response received (iteration {iteration})")
+        except asyncio.TimeoutError:
+            _record_llm_call(llm_span, iteration, llm_started, "timeout")
+            async for event in _deadline_exceeded(result, "".join(partial_parts)):
+                yield event
+            break
         except OpenAIError as e:
+            _record_llm_call(llm_span, iteration, llm_started, "error", error=e)
             error_msg = f"OpenAI API 오류: {str(e)}"
             logger.error(error_msg, exc_info=True)
+            result.error = error_msg
             yield _log_event("error", error_msg)
             yield _response_event(f"죄송합니다. AI 서비스 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
             break
         except Exception as e:
+            _record_llm_call(llm_span, iteration, llm_started, "error", error=e)
             error_msg = f"예상치 못한 오류: {str(e)}"
             logger.error(error_msg, exc_info=True)
+            result.error = error_msg
             yield _log_event("error", error_msg)
             yield _response_event(f"죄송합니다. 시스템 오류가 발생했습니다: {str(e)}")
             break
 
-        choice = response.choices[0]
-        assistant_message = choice.message
-
-        # 도구 호출 처리
-        if assistant_message.tool_calls:
+        # 도구 호출 처리 (최종 답변 턴에서는 도구 호출을 무시)
+        if assistant_message.get("tool_calls") and not final_turn:
             messages.append(assistant_message)
 
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
-
-                # 도구 유형에 따른 로그
-                if tool_name == "read_skill":
-                    yield _log_event(
-                        "activation",
-                        f"📚 스킬 로드: {tool_args.get('skill_name')}",
-                        description="진단/치료 가이드라인 확인 중",
-                        tool=tool_name,
-                        args=tool_args
-                    )
-                elif tool_name.startswith("analyze"):
-                    emoji = "🔬" if "xray" in tool_name or "mri" in tool_name or "ct" in tool_name else "🩺"
-                    yield _log_event(
-                        "tool_call",
-                        f"{emoji} 분석 도구 실행: {tool_name}",
-                        description="의료 데이터 분석 중",
-                        tool=tool_name,
-                        args=tool_args
-                    )
-                elif tool_name == "assess_severity":
-                    yield _log_event(
-                        "tool_call",
-                        f"⚖️ 심각도 평가 중",
-                        description="질병 진행 단계 판단",
-                        tool=tool_name,
-                        args=tool_args
+            tool_calls = []
+            for tool_call in assistant_message["tool_calls"]:
+                tool_name = tool_call["function"]["name"]
+                tool_args = json.loads(tool_call["function"]["arguments"] or "{}")
+                tool_calls.append((tool_call["id"], tool_name, tool_args))
+
+                yield _tool_call_event(tool_name, tool_args)
+                await _pace(pacing_delay)
+
+            # 같은 턴의 도구 호출은 서로 독립적이므로 동시 실행
+            # (결과 이벤트는 완료 순서대로, 대화 이력은 원래 tool_call 순서대로)
+            tasks = {
+                asyncio.create_task(_run_traced_tool(
+                    root.child("tool", tool=tool_name, iteration=iteration), tool_name, tool_args,
+                )): index
+                for index, (_, tool_name, tool_args) in enumerate(tool_calls)
+            }
+            tool_results = [None] * len(tool_calls)
+            try:
+                pending = set(tasks)
+                while pending:
+                    done, pending = await _before(
+                        deadline, asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
                     )
-                elif tool_name == "recommend_treatment":
-                    yield _log_event(
-                        "tool_call",
-                        f"💊 치료법 검색 중",
-                        description="최적의 치료 옵션 탐색",
-                        tool=tool_name,
-                        args=tool_args
-                    )
-                else:
-                    yield _log_event(
-                        "tool_call",
-                        f"🔧 도구 실행: {tool_name}",
-                        tool=tool_name,
-                        args=tool_args
-                    )
-                await asyncio.sleep(0.1)
-
-                # 도구 실행
-                try:
-                    logger.info(f"Executing tool: {tool_name} with args: {tool_args}")
-                    tool_result = tool_registry.execute(tool_name, tool_args)
-                    logger.debug(f"Tool {tool_name} executed successfully")
-
-                    yield _log_event(
-                        "tool_result",
-                        f"✅ {tool_name} 완료",
-                        tool=tool_name,
-                        result=tool_result[:300] if len(tool_result) > 300 else tool_result
-                    )
-                except Exception as e:
-                    error_msg = f"도구 실행 오류 ({tool_name}): {str(e)}"
-                    logger.error(error_msg, exc_info=True)
-                    tool_result = json.dumps({"error": error_msg}, ensure_ascii=False)
-                    yield _log_event("error", error_msg)
-
-                await asyncio.sleep(0.1)
-
+                    for task in sorted(done, key=tasks.get):
+                        index = tasks[task]
+                        tool_name = tool_calls[index][1]
+                        tool_result, error_msg = task.result()
+                        tool_results[index] = tool_result
+
+                        if error_msg:
+                            result.tool_errors += 1
+                            yield _log_event("error", error_msg)
+                        else:
+                            yield _log_event(
+                                "tool_result",
+                                f"✅ {tool_name} 완료",
+                                tool=tool_name,
+                                result=tool_result[:300] if len(tool_result) > 300 else tool_result
+                            )
+                        await _pace(pacing_delay)
+            except asyncio.TimeoutError:
+                async for event in _deadline_exceeded(result, ""):
+                    yield event
+                break
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            for (tool_call_id, _, _), tool_result in zip(tool_calls, tool_results):
                 messages.append({
                     "role": "tool",
-                    "tool_call_id": tool_call.id,
+                    "tool_call_id": tool_call_id,
                     "content": tool_result
                 })
 
         # 최종 응답
         else:
-            yield _log_event(
-                "complete",
-                "📋 진단 및 치료 추천 완료",
-                description="AI 분석이 완료되었습니다"
-            )
-            yield _response_event(assistant_message.content)
+            if final_turn:
+                assistant_message = {
+                    "role": "assistant",
+                    "content": assistant_message.get("content")
+                    or "죄송합니다. 분석 한도 안에서 답변을 완료하지 못했습니다. 전문의 진료를 받아보시기 바랍니다.",
+                }
+            result.content = assistant_message["content"]
+            yield _complete_event()
+            yield _response_event(assistant_message["content"])
+
+            # 세션 저장 (시스템 프롬프트 제외)
+            if session is not None:
+                messages.append(assistant_message)
+                session.messages = messages[1:]
+                session.turns += 1
+                session_store.save(session)
             break
 
+    # === 3단계: 토큰 사용량 집계 ===
+    metrics.consultation_iterations.observe(result.iterations)
+    logger.info(
+        f"Token usage | prompt: {usage_tracker.prompt_tokens} "
+        f"cached: {usage_tracker.cached_tokens} ({usage_tracker.cache_hit_ratio:.0%}) "
+        f"completion: {usage_tracker.completion_tokens} "
+        f"cost: ${usage_tracker.cost:.4f} saved: ${usage_tracker.savings:.4f} "
+        f"trace: {result.trace_id}"
+    )
+    yield _usage_event({
+        **usage_tracker.summary(),
+        "trace_id": result.trace_id,
+        "budget": {
+            "exhausted": result.budget_exhausted,
+            "consultation": {
+                "tokens": config.consultation_token_budget, "cost_usd": config.consultation_cost_budget,
+            },
+            "patient": budget_ledger.patient_summary(patient_id),
+        },
+    })
+
+
+async def process_chat_cached(
+    message: str,
+    patient_id: str = "P001",
+    image: str | None = None,
+    pacing: str | None = None,
+    session_id: str | None = None,
+    result: ConsultationResult | None = None,
+    trace_id: str | None = None,
+) -> AsyncGenerator[str, None]:
+    """응답 캐시를 거치는 채팅 처리
+
+    세션 요청은 이전 대화에 따라 답이 달라지므로 캐시하지 않는다.
+    오류, 도구 실패, 예산 소진 없이 최종 답변까지 완료된 상담만 기록한다 (_is_cacheable).
+    """
+    result = result if result is not None else ConsultationResult()
+    if response_cache is None or session_id:
+        async for event in process_chat(
+            message, patient_id, image, pacing=pacing, session_id=session_id, result=result, trace_id=trace_id
+        ):
+            yield event
+        return
+
+    create_system_prompt()  # 프롬프트/스킬 버전 최신화
+    key = ResponseCache.make_key(
+        message, patient_id, image, f"{llm_backend.name}/{config.openai_model}",
+        system_prompt_cache.version, system_prompt_cache.skills_version,
+    )
+
+    cached = response_cache.get(key)
+    if cached is not None:
+        logger.info(f"Response cache hit | patient_id: {patient_id}")
+        root = tracer.start_trace("consultation", trace_id, patient_id=patient_id, response_cache="hit")
+        root.end()
+        result.content = cached.content
+        result.usage = UsageTracker()
+        result.trace_id = root.trace_id
+        yield _log_event(
+            "cache_hit",
+            "⚡ 이전 상담 결과 재사용",
+            description="동일한 상담 요청의 결과를 반환합니다"
+        )
+        if config.response_cache_replay:
+            for event in cached.events:
+                yield event
+        else:
+            yield _complete_event()
+            yield _response_event(cached.content)
+        yield _usage_event({**UsageTracker().summary(), "response_cache": "hit", "trace_id": result.trace_id})
+        return
+
+    recorded = []
+    async for event in process_chat(message, patient_id, image, pacing=pacing, result=result, trace_id=trace_id):
+        recorded.append(event)
+        yield event
+
+    if _is_cacheable(result):
+        # 마지막 usage 이벤트는 재생 시 0 사용량으로 대체
+        response_cache.set(key, CachedResponse(events=recorded[:-1], content=result.content))
+
+
+def _is_cacheable(result: ConsultationResult) -> bool:
+    """응답 캐시 기록 여부
+
+    도구 실패(ToolError)를 바탕으로 한 답변이나 예산 소진으로 도구 없이 강제한
+    축약 답변은 예산이 남은 다른 환자에게 재사용하지 않는다.
+    """
+    return (
+        bool(result.content) and not result.error and not result.tool_errors
+        and not result.budget_exhausted
+    )
+
+
+async def process_batch(requests: list[ChatRequest], parallelism: int) -> AsyncGenerator[str, None]:
+    """배치 상담 - 케이스별 결과를 완료 순서대로 NDJSON 한 줄씩 전달
+
+    parallelism개의 워커가 케이스를 나눠 같은 에이전트 루프(응답 캐시 포함)로
+    실행한다. 케이스마다 /api/chat과 같은 동시 상담 슬롯(admission)을 얻어 실행하므로
+    배치도 전역 동시 실행 제한 안에서 돈다. 각 줄에는 요청 순번(index), 소요 시간,
+    반복 횟수, 토큰 사용량이 포함된다.
+    """
+    pending: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(len(requests)):
+        pending.put_nowait(index)
+    finished: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def worker():
+        while not pending.empty():
+            index = pending.get_nowait()
+            finished.put_nowait(await _run_batch_case(index, requests[index]))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(parallelism, len(requests)))]
+    started = time.perf_counter()
+    try:
+        for _ in requests:
+            yield dumps(await finished.get()) + "\n"
+    finally:
+        for task in workers:
+            task.cancel()
+    logger.info(
+        f"Batch completed | cases: {len(requests)} parallelism: {parallelism} "
+        f"elapsed: {time.perf_counter() - started:.2f}s"
+    )
+
+
+async def _run_batch_case(index: int, request: ChatRequest) -> dict:
+    """배치 케이스 1건 실행 - 동시 상담 슬롯을 얻은 뒤 실행, 이벤트는 버리고 결과만 반환
+
+    대기열이 가득 찼거나 대기 시간이 초과되면 상담 없이 error 상태로 보고한다.
+    """
+    result = ConsultationResult()
+    started = time.perf_counter()
+    try:
+        reservation = admission.reserve()
+        try:
+            async with aclosing(reservation.wait()) as queue:
+                async for _ in queue:
+                    pass
+            async for _ in process_chat_cached(
+                request.message, request.patient_id, request.image,
+                pacing="fast", session_id=request.session_id, result=result,
+            ):
+                pass
+        finally:
+            reservation.release()
+    except (QueueFullError, AdmissionTimeout) as e:
+        result.error = str(e)
+        logger.warning(f"Batch case {index} not admitted: {str(e)} | {admission.stats()}")
+    except Exception as e:
+        result.error = f"예상치 못한 오류: {str(e)}"
+        logger.error(f"Batch case {index} failed: {str(e)}", exc_info=True)
+
+    return {
+        "index": index,
+        "patient_id": request.patient_id,
+        "status": "ok" if result.content and not result.error else "error",
+        "content": result.content,
+        "error": result.error,
+        "iterations": result.iterations,
+        "tool_errors": result.tool_errors,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "usage": result.usage.summary() if result.usage else None,
+        "budget_exhausted": result.budget_exhausted,
+        "trace_id": result.trace_id,
+    }
+
+
+async def admit(
+    events: AsyncGenerator[str, None],
+    reservation: Reservation | None = None,
+) -> AsyncGenerator[str, None]:
+    """동시 상담 제한 적용 - 슬롯을 얻을 때까지 queued 이벤트로 대기열 위치 전달
+
+    reservation: 엔드포인트가 응답 전에 미리 확보한 자리 (None이면 여기서 확보).
+    대기 중 시간 초과나 대기열 초과 시 상담을 시작하지 않고 오류 응답으로 끝낸다.
+    """
+    try:
+        if reservation is None:
+            reservation = admission.reserve()
+        async with aclosing(reservation.wait()) as queue:
+            async for position in queue:
+                yield _queued_event(position)
+    except (QueueFullError, AdmissionTimeout) as e:
+        logger.warning(f"Chat request not admitted: {str(e)} | {admission.stats()}")
+        await events.aclose()
+        yield _log_event("error", str(e))
+        yield _response_event("죄송합니다. 현재 상담 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+        return
+
+    try:
+        async with aclosing(events):
+            async for event in events:
+                yield event
+    finally:
+        reservation.release()
+
+
+class ReservedStreamingResponse(StreamingResponse):
+    """동시 상담 자리를 보유한 스트림 응답
+
+    응답 시작 전에 연결이 끊겨 본문 제너레이터가 실행되지 않아도 자리를 반환한다
+    (정상 종료 시에는 admit()이 이미 반환했으므로 아무 일도 하지 않음).
+    """
+
+    def __init__(self, content, reservation: Reservation, **kwargs):
+        super().__init__(content, **kwargs)
+        self.reservation = reservation
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.reservation.release()
+
+
+async def observe_stream(endpoint: str, events: AsyncGenerator[str, None]) -> AsyncGenerator[str, None]:
+    """열린 스트림 수와 스트림 지속 시간 메트릭 기록 (중단 시 outcome=cancelled)"""
+    metrics.active_streams.inc(endpoint=endpoint)
+    started = time.perf_counter()
+    outcome = "cancelled"
+    try:
+        async with aclosing(events):
+            async for event in events:
+                yield event
+        outcome = "completed"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        metrics.active_streams.dec(endpoint=endpoint)
+        metrics.request_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+        metrics.requests.inc(endpoint=endpoint, outcome=outcome)
+
+
+async def profile_stream(name: str, events: AsyncGenerator[str, None]) -> AsyncGenerator[str, None]:
+    """요청 단위 샘플링 프로파일링 - 스트림이 끝나면 결과 파일 링크를 profile 이벤트로 전달
+
+    이벤트 루프 스레드와 도구 워커 스레드를 샘플링하여 config.profile_dir에
+    collapsed stack 파일(<name>.collapsed)로 저장한다.
+    """
+    loop_thread = threading.get_ident()
+    profiler = SamplingProfiler(lambda: _profiled_threads(loop_thread), config.profile_interval).start()
+    path = config.profile_dir / f"{name}.collapsed"
+    try:
+        async with aclosing(events):
+            async for event in events:
+                yield event
+    finally:
+        profiler.stop().write(path)
+        logger.info(f"Profile written: {path} | samples: {profiler.samples}")
+    yield _profile_event(name, path, profiler.summary())
+
+
+def _profiled_threads(loop_thread: int):
+    """프로파일링 대상 (스레드 id, 레이블) - 이벤트 루프 + 도구 스레드 풀"""
+    yield loop_thread, "event-loop"
+    for thread in threading.enumerate():
+        if thread.name.startswith("tool"):
+            yield thread.ident, "tool-worker"
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    events: AsyncGenerator[str, None],
+    heartbeat_interval: float = 0,
+) -> AsyncGenerator[str, None]:
+    """클라이언트 연결이 끊기면 상담 중단
+
+    이벤트 사이(LLM 응답 대기, 도구 실행 중)에도 연결 종료를 감지하여 진행 중인
+    단계를 취소한다. 취소는 상담 제너레이터 안으로 전달되어 LLM 스트림을 닫고
+    남은 도구 태스크를 취소하며, 동시 상담 슬롯도 반환된다.
+    heartbeat_interval > 0이면 그동안 이벤트가 없을 때 SSE heartbeat 주석을 보낸다.
+    """
+    disconnected = asyncio.create_task(_wait_for_disconnect(request))
+    timeout = heartbeat_interval if heartbeat_interval > 0 else None
+    next_event = None
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(anext(events, None))
+            done, _ = await asyncio.wait(
+                {next_event, disconnected}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done and not next_event.done():
+                logger.info("Client disconnected - consultation cancelled")
+                return
+            if not done:
+                yield SSE_HEARTBEAT
+                continue
+            event = next_event.result()
+            next_event = None
+            if event is None:
+                return
+            yield event
+    finally:
+        disconnected.cancel()
+        if next_event is not None and not next_event.done():
+            next_event.cancel()
+            await asyncio.gather(next_event, return_exceptions=True)
+        await events.aclose()
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """http.disconnect 메시지 수신까지 대기"""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _before(deadline: float | None, awaitable):
+    """마감 시각(이벤트 루프 시간) 전까지 대기 - 초과 시 취소 후 asyncio.TimeoutError
+
+    Python 3.10 호환을 위해 asyncio.timeout_at(3.11+) 대신 wait_for 사용
+    """
+    if deadline is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, max(0.0, deadline - asyncio.get_running_loop().time()))
+
+
+async def _deadline_exceeded(result: ConsultationResult, partial: str) -> AsyncGenerator[str, None]:
+    """상담 시간 초과 - 지금까지의 답변을 부분 응답으로 반환"""
+    error_msg = f"상담 시간 초과 ({config.chat_deadline:.0f}초)"
+    logger.warning(f"{error_msg} | iteration: {result.iterations}")
+    result.error = error_msg
+    yield _log_event("deadline", f"⏱️ {error_msg}", description="지금까지의 분석 결과를 반환합니다")
+    if partial:
+        content = f"{partial}\n\n(상담 시간이 초과되어 답변이 중단되었습니다.)"
+    else:
+        content = "죄송합니다. 상담 시간이 초과되어 분석을 완료하지 못했습니다. 다시 시도해주세요."
+    yield _response_event(content, partial=True)
+
+
+def _pacing_delay(pacing: str | None) -> float:
+    """페이싱 모드별 이벤트 간 지연 (초)"""
+    mode = pacing or config.stream_pacing
+    return config.ui_pacing_delay if mode == "ui" else 0.0
+
+
+async def _pace(delay: float) -> None:
+    """UI 페이싱 - fast 모드에서는 아무것도 하지 않음"""
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def _run_traced_tool(span, tool_name: str, tool_args: dict) -> tuple[str, str | None]:
+    """도구 스팬을 현재 스팬으로 두고 실행 - 도구 내부(RxNorm 호출 등) 스팬의 부모가 된다"""
+    with span:
+        tool_result, error_msg = await _run_tool(tool_name, tool_args)
+        if error_msg:
+            span.record_error(error_msg)
+        return tool_result, error_msg
+
+
+async def _run_tool(tool_name: str, tool_args: dict) -> tuple[str, str | None]:
+    """도구 실행 - (결과, 오류 메시지) 반환
+
+    동기 도구는 공유 스레드 풀에서, 비동기 도구는 이벤트 루프에서 직접 실행된다.
+    알 수 없는 도구나 도구 내부 예외(ToolError)는 오류 메시지와 함께 오류 JSON을
+    결과로 돌려주어 LLM이 다음 단계에서 참고할 수 있게 한다.
+    """
+    started = time.perf_counter()
+    try:
+        logger.info(f"Executing tool: {tool_name} with args: {tool_args}")
+        tool_result = await tool_registry.aexecute(tool_name, tool_args, executor=tool_executor)
+        logger.debug(f"Tool {tool_name} executed successfully")
+        metrics.tool_calls.inc(tool=tool_name, outcome="ok")
+        return tool_result, None
+    except Exception as e:
+        metrics.tool_calls.inc(tool=tool_name, outcome="error")
+        error_msg = f"도구 실행 오류 ({tool_name}): {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return json.dumps({"error": error_msg}, ensure_ascii=False), error_msg
+    finally:
+        metrics.tool_duration.observe(time.perf_counter() - started, tool=tool_name)
+
+
+def _record_llm_call(span, iteration: int, started: float, outcome: str, entry=None, error=None,
+                     cost: float = 0.0) -> None:
+    """LLM 호출 지연/결과, 토큰/비용 메트릭 기록, 호출 스팬 종료"""
+    metrics.llm_call_duration.observe(time.perf_counter() - started, iteration=iteration)
+    metrics.llm_calls.inc(outcome=outcome)
+    span.set(outcome=outcome)
+    if entry is not None:
+        metrics.llm_tokens.inc(entry.prompt_tokens, kind="prompt")
+        metrics.llm_tokens.inc(entry.cached_tokens, kind="cached")
+        metrics.llm_tokens.inc(entry.completion_tokens, kind="completion")
+        metrics.llm_cost.inc(cost)
+        span.set(
+            prompt_tokens=entry.prompt_tokens,
+            cached_tokens=entry.cached_tokens,
+            completion_tokens=entry.completion_tokens,
+        )
+    if error is not None:
+        span.record_error(error)
+    span.end()
+
+
+def _collect_metrics():
+    """수집 시점에 읽는 컴포넌트 통계 (대기열, 세션, 캐시)"""
+    yield "admission_active", "gauge", "Consultations holding a slot", [({}, admission.active)]
+    yield "admission_queue_depth", "gauge", "Consultations waiting for a slot", [({}, admission.queue_depth)]
+    yield "admission_rejected", "counter", "Requests rejected by admission control", [({}, admission.rejected)]
+    yield "admission_timed_out", "counter", "Requests that timed out in the queue", [({}, admission.timed_out)]
+    yield "sessions", "gauge", "Stored conversation sessions", [({}, len(session_store))]
+
+    caches = {f"tool:{name}": stats for name, stats in tool_registry.cache_stats().items()}
+    if response_cache is not None:
+        caches["response"] = response_cache.stats()
+    # 디스크 캐시/미러 통계는 SQLite 조회이므로 스크레이프에서는 메모리 카운터만 읽음
+    rxnorm = rxnorm_api.rxnorm_client.memory_stats()
+    flights = (rxnorm["singleflight"], rxnorm_async.async_rxnorm_client.stats()["singleflight"])
+    if "hits" in rxnorm["memory"]:
+        caches["rxnorm_memory"] = rxnorm["memory"]
+    yield "cache_lookups", "counter", "Cache lookups by cache and result (tool:get_medication_options is RxNorm)", [
+        ({"cache": cache, "result": result}, stats[key])
+        for cache, stats in caches.items() for result, key in (("hit", "hits"), ("miss", "misses"))
+    ]
+    yield "rxnorm_loads", "counter", "RxNorm loads after an in-memory miss (disk cache or RxNav)", [
+        ({}, sum(flight["calls"] for flight in flights)),
+    ]
+    yield "rxnorm_coalesced", "counter", "RxNorm lookups that waited on an identical in-flight request", [
+        ({}, sum(flight["coalesced"] for flight in flights)),
+    ]
+
+
+metrics.registry.register_collector(_collect_metrics)
+
+
+def _completion_kwargs(messages: list, final: bool = False) -> dict:
+    """LLM 요청 파라미터
+
+    도구 정의 → 시스템 프롬프트 → 환자별 메시지 순서가 항상 유지되도록 하여
+    프로바이더 프롬프트 캐시가 고정 접두부를 재사용할 수 있게 한다.
+    final=True면 도구 정의는 그대로 두고(캐시 접두부 유지) 도구 호출만 막는다.
+    """
+    kwargs = {
+        "model": config.openai_model,
+        "messages": messages,
+        "tools": CACHEABLE_TOOL_DEFINITIONS,
+        "tool_choice": "none" if final else "auto",
+    }
+    if config.prompt_cache_key:
+        # 같은 접두부를 가진 요청이 같은 캐시로 라우팅되도록 프롬프트 버전 포함
+        kwargs["extra_body"] = {"prompt_cache_key": f"{config.prompt_cache_key}:{system_prompt_cache.version}"}
+    return kwargs
+
+
+async def _create_completion(messages: list, final: bool = False) -> tuple[dict, object]:
+    """LLM 호출 (비스트리밍) - (어시스턴트 메시지 dict, usage) 반환"""
+    return await llm_backend.complete(**_completion_kwargs(messages, final))
+
+
+def _stream_completion(messages: list, final: bool = False) -> AsyncGenerator[tuple[str, str | dict], None]:
+    """LLM 호출 (스트리밍)
+
+    content 델타는 ("delta", text)로 도착 즉시 전달하고, tool_call이 조립된
+    어시스턴트 메시지는 마지막에 ("message", dict)로 반환한다.
+    토큰 사용량은 ("usage", usage)로 전달된다.
+    """
+    return llm_backend.stream(**_completion_kwargs(messages, final))
+
+
+def _tool_call_event(tool_name: str, tool_args: dict) -> str:
+    """도구 유형에 따른 호출 로그 이벤트 생성"""
+    if tool_name == "read_skill":
+        return _log_event(
+            "activation",
+            f"📚 스킬 로드: {tool_args.get('skill_name')}",
+            description="진단/치료 가이드라인 확인 중",
+            tool=tool_name,
+            args=tool_args
+        )
+    if tool_name.startswith("analyze"):
+        emoji = "🔬" if "xray" in tool_name or "mri" in tool_name or "ct" in tool_name else "🩺"
+        return _log_event(
+            "tool_call",
+            f"{emoji} 분석 도구 실행: {tool_name}",
+            description="의료 데이터 분석 중",
+            tool=tool_name,
+            args=tool_args
+        )
+    if tool_name == "assess_severity":
+        return _log_event(
+            "tool_call",
+            f"⚖️ 심각도 평가 중",
+            description="질병 진행 단계 판단",
+            tool=tool_name,
+            args=tool_args
+        )
+    if tool_name == "recommend_treatment":
+        return _log_event(
+            "tool_call",
+            f"💊 치료법 검색 중",
+            description="최적의 치료 옵션 탐색",
+            tool=tool_name,
+            args=tool_args
+        )
+    return _log_event(
+        "tool_call",
+        f"🔧 도구 실행: {tool_name}",
+        tool=tool_name,
+        args=tool_args
+    )
+
+
+def _complete_event() -> str:
+    """상담 완료 로그 이벤트 (고정)"""
+    return static_event(
+        "log",
+        step="complete",
+        message="📋 진단 및 치료 추천 완료",
+        description="AI 분석이 완료되었습니다"
+    )
+
 
 def _log_event(step: str, message: str, **extra) -> str:
     """로그 이벤트 생성"""
-    data = {"step": step, "message": message, **extra}
-    return json.dumps({"type": "log", "data": data}, ensure_ascii=False) + "\n"
+    return encode_event("log", {"step": step, "message": message, **extra})
+
+
+def _response_event(content: str, partial: bool = False) -> str:
+    """응답 이벤트 생성 (partial: 시간 초과로 중단된 답변)"""
+    data = {"content": content, "partial": True} if partial else {"content": content}
+    return encode_event("response", data)
+
+
+def _usage_event(summary: dict) -> str:
+    """토큰 사용량 이벤트 생성"""
+    return encode_event("usage", summary)
 
 
-def _response_event(content: str) -> str:
-    """응답 이벤트 생성"""
-    return json.dumps({"type": "response", "data": {"content": content}}, ensure_ascii=False) + "\n"
+def _profile_event(name: str, path: Path, summary: dict) -> str:
+    """프로파일 결과 링크 이벤트 생성"""
+    data = {"url": f"/api/profiles/{name}", "file": str(path), **summary}
+    return encode_event("profile", data)
+
+
+def _queued_event(position: int) -> str:
+    """대기열 위치 이벤트 생성"""
+    data = {"position": position, "active": admission.active, "queue_depth": admission.queue_depth}
+    return encode_event("queued", data)
+
+
+def _response_delta_event(content: str, iteration: int) -> str:
+    """응답 델타 이벤트 생성 (토큰 스트리밍)"""
+    data = {"content": content, "iteration": iteration}
+    return encode_event("response_delta", data)
+
+
+# === 관리자 인증 ===
+
+def _require_admin(http_request: Request) -> None:
+    """ADMIN_TOKEN이 설정되어 있고 X-Admin-Token 헤더가 일치해야 통과 (아니면 403)"""
+    token = http_request.headers.get("x-admin-token", "")
+    if not config.admin_token or not secrets.compare_digest(token.encode(), config.admin_token.encode()):
+        raise HTTPException(status_code=403, detail="관리자 인증이 필요합니다")
+
+
+def _header_flag(http_request: Request, name: str) -> bool:
+    return http_request.headers.get(name, "").lower() in ("1", "true", "yes")
 
 
 # === API 엔드포인트 ===
@@ -342,22 +1131,127 @@ async def get_skills():
 
 
 @app.post("/api/chat")
-async def chat(request: ChatRequest):
-    """채팅 API - SSE 스트리밍 (이미지 첨부 지원)"""
+async def chat(request: ChatRequest, http_request: Request):
+    """채팅 API - SSE 스트리밍 (이미지 첨부 지원, 연결 종료 시 상담 취소)"""
     try:
         logger.info(f"Chat request received | patient_id: {request.patient_id} | message: {request.message[:50]}...")
         if request.image:
             logger.info("Image attached to request")
 
-        return StreamingResponse(
-            process_chat(request.message, request.patient_id, request.image),
-            media_type="text/event-stream"
-        )
+        # X-Profile 헤더는 관리자만 사용 가능 (ADMIN_TOKEN 미설정 시 항상 거절)
+        profile = _header_flag(http_request, "x-profile")
+        if profile:
+            _require_admin(http_request)
+
+        # 슬롯/대기열 자리를 응답 전에 원자적으로 확보 - 가득 찼으면 스트림을 열지 않고 429
+        try:
+            reservation = admission.reserve()
+        except QueueFullError as error:
+            metrics.requests.inc(endpoint="chat", outcome="rejected")
+            raise HTTPException(
+                status_code=429,
+                detail=str(error),
+                headers={"Retry-After": str(error.retry_after)},
+            )
+
+        try:
+            # 스트림 시작 전에 trace_id를 정해 헤더로 먼저 전달 (중단된 요청도 조회 가능)
+            trace_id = tracing.new_trace_id() if tracer.enabled else None
+            events = observe_stream("chat", admit(process_chat_cached(
+                request.message, request.patient_id, request.image,
+                pacing=request.pacing, session_id=request.session_id, trace_id=trace_id,
+            ), reservation))
+            if profile:
+                events = profile_stream(f"{time.strftime('%Y%m%d-%H%M%S')}-{trace_id or secrets.token_hex(8)}", events)
+            # 프록시가 버퍼링하지 않도록 헤더 지정 (nginx: X-Accel-Buffering)
+            headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            if trace_id:
+                headers["X-Trace-Id"] = trace_id
+            return ReservedStreamingResponse(
+                cancel_on_disconnect(http_request, sse_frames(events), config.sse_heartbeat_interval),
+                reservation,
+                media_type="text/event-stream",
+                headers=headers,
+            )
+        except BaseException:
+            reservation.release()
+            raise
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chat processing failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Chat processing failed")
 
 
+@app.post("/api/chat/batch")
+async def chat_batch(request: BatchChatRequest, http_request: Request):
+    """배치 상담 API - 케이스별 결과를 완료 순서대로 NDJSON 스트리밍"""
+    if len(request.requests) > config.batch_max_cases:
+        raise HTTPException(
+            status_code=413,
+            detail=f"배치 케이스는 최대 {config.batch_max_cases}건까지 가능합니다",
+        )
+
+    parallelism = min(request.parallelism or config.batch_parallelism, config.batch_max_parallelism)
+    logger.info(f"Batch request received | cases: {len(request.requests)} | parallelism: {parallelism}")
+    return StreamingResponse(
+        cancel_on_disconnect(http_request, observe_stream("batch", process_batch(request.requests, parallelism))),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """캐시 적중/미스 통계 (RxNorm 디스크 캐시/미러 집계는 워커 스레드에서 실행)"""
+    rxnorm = await asyncio.to_thread(rxnorm_api.rxnorm_client.stats)
+    return {
+        "response_cache": response_cache.stats() if response_cache else {"enabled": False},
+        "tools": tool_registry.cache_stats(),
+        "sessions": session_store.stats(),
+        "rxnorm": {**rxnorm, "async": rxnorm_async.async_rxnorm_client.stats()},
+    }
+
+
+@app.get("/api/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """최근 상담 트레이스 조회 (진행 중인 상담 포함)"""
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"트레이스를 찾을 수 없습니다: {trace_id}")
+    return trace
+
+
+@app.get("/api/profiles/{name}")
+async def get_profile(name: str, http_request: Request):
+    """프로파일 결과 (collapsed stack 텍스트) - 관리자 전용"""
+    _require_admin(http_request)
+    path = config.profile_dir / f"{name}.collapsed"
+    if not re.fullmatch(r"[\w.-]+", name) or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"프로파일을 찾을 수 없습니다: {name}")
+    return PlainTextResponse(path.read_text(encoding="utf-8"))
+
+
+@app.get("/api/usage/stats")
+async def usage_stats(patient_id: str | None = None):
+    """누적 토큰/비용 사용량과 예산 소진 횟수 (patient_id 지정 시 해당 환자 사용량 포함)"""
+    stats = budget_ledger.stats()
+    if patient_id:
+        stats["patient"] = {"patient_id": patient_id, **budget_ledger.patient_summary(patient_id)}
+    return stats
+
+
+@app.get("/api/admission/stats")
+async def admission_stats():
+    """동시 실행/대기열 깊이 및 대기 시간 통계"""
+    return admission.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/health")
 async def health():
     """헬스체크"""
@@ -367,6 +1261,11 @@ async def health():
             "agent": "AI Doctor Agent",
             "skills_count": len(skill_loader.skills),
             "model": config.openai_model,
+            "llm_backend": llm_backend.name,
+            "json_backend": JSON_BACKEND,
+            "active_sessions": len(session_store),
+            "active_chats": admission.active,
+            "queued_chats": admission.queue_depth,
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}", exc_info=True)
@@ -0,0 +1,251 @@
+"""AI Doctor Agent - Metrics
+
+Prometheus 텍스트 형식(/metrics)으로 노출하는 인프로세스 카운터/게이지/히스토그램.
+
+핫 경로에서는 레이블 튜플 조회와 정수 덧셈만 수행하고, 캐시/대기열처럼 이미
+통계를 가진 컴포넌트는 수집 시점에 콜백(collector)으로 읽어 추가 비용이 없다.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# 지연 시간 히스토그램 기본 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Sample = tuple[dict, float]
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(f"{self.name}_total", self._labels(key), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블별 [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def sum(self, **labels) -> float:
+        entry = self._values.get(self._key(labels))
+        return entry[1] if entry else 0.0
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            items = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+
+        samples = []
+        for key, counts, total, count in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 Prometheus 텍스트 렌더링"""
+
+    def __init__(self, namespace: str = "doctor_agent"):
+        self.namespace = namespace
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(f"{self.namespace}_{name}", help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(f"{self.namespace}_{name}", help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]) -> None:
+        """수집 시점에 (이름, 타입, 설명, [(레이블, 값)])을 반환하는 콜백 등록"""
+        self._collectors.append(collector)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            _header(lines, metric.name, metric.type, metric.help)
+            for name, labels, value in metric.samples():
+                lines.append(_sample(name, labels, value))
+
+        for collector in self._collectors:
+            for name, type_, help, samples in collector():
+                name = f"{self.namespace}_{name}"
+                _header(lines, name, type_, help)
+                sample_name = f"{name}_total" if type_ == "counter" else name
+                for labels, value in samples:
+                    lines.append(_sample(sample_name, labels, value))
+        return "\n".join(lines) + "\n"
+
+
+def _header(lines: list, name: str, type_: str, help: str) -> None:
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} {type_}")
+
+
+def _sample(name: str, labels: dict, value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+# === 애플리케이션 메트릭 ===
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    "request_duration_seconds", "Stream duration of chat/batch requests", ["endpoint"],
+)
+requests = registry.counter(
+    "requests", "Finished chat/batch streams by outcome", ["endpoint", "outcome"],
+)
+active_streams = registry.gauge(
+    "active_streams", "Open response streams", ["endpoint"],
+)
+llm_call_duration = registry.histogram(
+    "llm_call_duration_seconds", "LLM call latency per agent-loop iteration", ["iteration"],
+)
+llm_calls = registry.counter(
+    "llm_calls", "LLM calls by outcome", ["outcome"],
+)
+llm_tokens = registry.counter(
+    "llm_tokens", "LLM tokens by kind (prompt includes cached)", ["kind"],
+)
+llm_cost = registry.counter(
+    "llm_cost_usd", "LLM spend in USD (cached prompt tokens at the discounted price)",
+)
+budget_exhausted = registry.counter(
+    "budget_exhausted", "Consultations forced to a final answer by a token/cost budget", ["reason"],
+)
+consultation_iterations = registry.histogram(
+    "consultation_iterations", "Agent-loop iterations per consultation",
+    buckets=(1, 2, 3, 4, 5, 6, 7, 8, 9, 10),
+)
+tool_duration = registry.histogram(
+    "tool_duration_seconds", "Tool execution latency (including cache hits)", ["tool"],
+)
+tool_calls = registry.counter(
+    "tool_calls", "Tool executions by outcome", ["tool", "outcome"],
+)
+rxnorm_request_duration = registry.histogram(
+    "rxnorm_request_duration_seconds", "RxNorm REST call latency", ["endpoint"],
+)
+rxnorm_requests = registry.counter(
+    "rxnorm_requests", "RxNorm REST calls by outcome", ["endpoint", "outcome"],
+)
+rxnorm_cache_lookups = registry.counter(
+    "rxnorm_cache_lookups", "RxNorm disk cache lookups by result (fresh/stale/expired/miss)", ["result"],
+)
@@ -0,0 +1,108 @@
+"""AI Doctor Agent - Sampling Profiler
+
+요청 단위로 켜는 샘플링 프로파일러.
+
+별도 스레드가 interval마다 이벤트 루프 스레드와 도구 워커 스레드의 스택을
+sys._current_frames()로 읽어 collapsed stack 형식("root;...;leaf count")으로 집계한다.
+flamegraph.pl, speedscope, inferno 등에 그대로 넣을 수 있다.
+
+대상 코드에 훅을 걸지 않으므로 프로파일링하지 않는 요청의 비용은 0이다. 이벤트 루프는
+공유되므로 같은 시간에 실행된 다른 상담의 스택도 함께 샘플링된다.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable
+
+# 대기 중인 스레드의 리프 프레임 (파일 이름 끝, 함수 이름) - 샘플에서 제외
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("concurrent/futures/thread.py", "_worker"),
+    ("threading.py", "wait"),
+}
+
+
+class SamplingProfiler:
+    """interval마다 대상 스레드 스택을 샘플링"""
+
+    def __init__(self, threads: Callable[[], Iterable[tuple[int, str]]], interval: float = 0.005):
+        self.threads = threads
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, label in self.threads():
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                self.samples += 1
+                if _is_idle(frame):
+                    self.idle_samples += 1
+                    continue
+                self.stacks[_collapse(frame, label)] += 1
+
+    def collapsed(self) -> str:
+        """collapsed stack 텍스트 (샘플 수 내림차순)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 5) -> dict:
+        """샘플 수, 리프 함수별 상위 샘플"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return {
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "interval_ms": self.interval * 1000,
+            "elapsed_s": round(self.elapsed, 3),
+            "top": [{"frame": frame, "samples": count} for frame, count in leaves.most_common(top)],
+        }
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed(), encoding="utf-8")
+        return path
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", Path(code.co_filename).stem)
+    return f"{module}:{code.co_name}:{code.co_firstlineno}"
+
+
+def _collapse(frame, root: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(root)
+    return ";".join(reversed(labels))
+
+
+def _is_idle(frame) -> bool:
+    filename = frame.f_code.co_filename.replace("\\", "/")
+    return any(filename.endswith(suffix) and frame.f_code.co_name == name for suffix, name in IDLE_FRAMES)
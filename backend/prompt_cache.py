@@ -0,0 +1,102 @@
+"""AI Doctor Agent - System Prompt Cache
+
+렌더링된 시스템 프롬프트를 메모리에 유지하고, 프롬프트 템플릿이나
+SKILL.md 파일이 실제로 바뀐 경우에만 다시 만든다.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from backend import tracing
+from backend.skill_loader import SkillLoader
+
+
+class SystemPromptCache:
+    """시스템 프롬프트 캐시 (mtime 기반 무효화)
+
+    템플릿과 각 SKILL.md 의 (mtime, size) 목록을 서명으로 사용한다.
+    서명 확인(stat)도 check_interval 초에 한 번만 수행하므로 대부분의
+    요청은 파일 시스템에 접근하지 않고 동일한 문자열을 그대로 받는다.
+    """
+
+    PLACEHOLDER = "{{available_skills}}"
+
+    def __init__(self, template_path: str | Path, skill_loader: SkillLoader,
+                 check_interval: float = 2.0):
+        self.template_path = Path(template_path)
+        self.skill_loader = skill_loader
+        self.check_interval = check_interval
+
+        self.version = ""         # 렌더링된 프롬프트 해시
+        self.skills_version = ""  # SKILL.md 내용 해시
+        self.rebuilds = 0
+
+        self._prompt: str | None = None
+        self._signature: tuple | None = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """시스템 프롬프트 반환 (변경 시에만 재생성)"""
+        if self._prompt is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._prompt
+
+        with self._lock:
+            signature = self._current_signature()
+            if signature != self._signature:
+                with tracing.span("prompt.rebuild"):
+                    # 최초 빌드는 SkillLoader 생성 시 탐색 결과를 그대로 사용
+                    if self._signature is not None:
+                        self.skill_loader.reload()
+                    self._render()
+                self._signature = signature
+            self._checked_at = time.monotonic()
+            return self._prompt
+
+    def invalidate(self) -> None:
+        """다음 get() 호출에서 서명을 다시 확인하도록 강제"""
+        self._checked_at = float("-inf")
+
+    def _render(self) -> None:
+        """템플릿 + 스킬 XML 렌더링"""
+        try:
+            template = self.template_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"프롬프트를 찾을 수 없습니다: {self.template_path.stem}")
+
+        prompt = template.replace(self.PLACEHOLDER, self.skill_loader.generate_available_skills_xml())
+
+        skills_hash = hashlib.sha256()
+        for skill in self.skill_loader.skills.values():
+            skills_hash.update(skill.metadata.name.encode("utf-8"))
+            skills_hash.update((skill.path / "SKILL.md").read_bytes())
+
+        self._prompt = prompt
+        self.version = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        self.skills_version = skills_hash.hexdigest()[:12]
+        self.rebuilds += 1
+
+    def _current_signature(self) -> tuple:
+        """템플릿과 SKILL.md 파일들의 (경로, mtime, size) 서명"""
+        entries = [_stat_entry(self.template_path)]
+
+        skills_dir = self.skill_loader.skills_dir
+        if skills_dir.exists():
+            with os.scandir(skills_dir) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        entries.append(_stat_entry(Path(entry.path) / "SKILL.md"))
+
+        return tuple(sorted(entries))
+
+
+def _stat_entry(path: Path) -> tuple:
+    """파일 서명 항목 - 파일이 없으면 (경로, 0, 0)"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (str(path), 0, 0)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
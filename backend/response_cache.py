@@ -0,0 +1,53 @@
+"""AI Doctor Agent - Response Cache
+
+동일한 상담 요청(키오스크 버튼의 정형 증상 문구 등)에 대해 기록된 이벤트
+스트림을 재사용하는 정확 일치 응답 캐시.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+
+from backend.cache import TTLCache
+
+
+@dataclass
+class CachedResponse:
+    """기록된 상담 결과"""
+    events: list[str]  # 재생용 전체 이벤트 스트림 (usage 이벤트 제외)
+    content: str       # 최종 답변
+
+
+class ResponseCache:
+    """정확 일치 응답 캐시 (LRU + TTL)"""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 600):
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    @staticmethod
+    def make_key(message: str, patient_id: str, image: str | None, model: str,
+                 prompt_version: str, skills_version: str) -> str:
+        """요청 정규화 키
+
+        메시지는 공백을 정리하고 대소문자를 통일한다. 이미지는 해시만 사용한다.
+        """
+        normalized = " ".join(message.split()).casefold()
+        image_hash = hashlib.sha256(image.encode("utf-8")).hexdigest() if image else ""
+        payload = json.dumps(
+            [normalized, patient_id, image_hash, model, prompt_version, skills_version],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        self._cache.set(key, response)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """적중/미스 통계"""
+        return self._cache.stats()
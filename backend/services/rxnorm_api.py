@@ -4,9 +4,19 @@ RxNorm is a normalized naming system for drugs provided by the U.S. National Lib
 API Documentation: https://lhncbc.nlm.nih.gov/RxNav/APIs/
 """
 
+import os
+import threading
+import time
+
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Tuple
+from backend import metrics, tracing
+from backend.cache import SingleFlight, TTLCache
+from backend.config import config
 from backend.logger import get_logger
+from backend.services.rxnorm_cache import RxNormDiskCache, cache_key
+from backend.services.rxnorm_mirror import RxNormMirror
 
 logger = get_logger("rxnorm_api")
 
@@ -16,12 +26,127 @@ class RxNormAPI:
 
     BASE_URL = "https://rxnav.nlm.nih.gov/REST"
 
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, pool_maxsize: int = 16,
+                 cache: Optional[RxNormDiskCache] = None, memory: Optional[TTLCache] = None,
+                 mirror: Optional[RxNormMirror] = None):
+        # RXNORM_BASE_URL points the client at a mirror or local stub (load tests)
+        self.BASE_URL = (base_url or os.getenv("RXNORM_BASE_URL") or self.BASE_URL).rstrip("/")
+        # Offline RRF mirror: when set, search/properties/related never touch the network
+        self.mirror = mirror
+        # Lookup order: in-process LRU -> disk cache -> RxNav; concurrent misses for the
+        # same URL share one load through the singleflight group
+        self.memory = memory
+        self.cache = cache
+        self._inflight = SingleFlight()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
         self.session = requests.Session()
+        # Lookups are fanned out from several threads; keep enough pooled connections per host
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "User-Agent": "AI-Doctor-Agent/1.0"
         })
 
+    def _get(self, endpoint: str, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET with latency/outcome metrics; raises requests exceptions on failure"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracing.span(f"rxnorm.{endpoint}", url=url) as span:
+                response = self.session.get(url, params=params, timeout=10)
+                span.set(status_code=response.status_code)
+                response.raise_for_status()
+            outcome = "ok"
+            return response
+        finally:
+            metrics.rxnorm_request_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+            metrics.rxnorm_requests.inc(endpoint=endpoint, outcome=outcome)
+
+    def _fetch(self, endpoint: str, url: str, params: Optional[Dict] = None) -> Dict:
+        """Response JSON from the in-memory LRU, else one shared load per key"""
+        key = cache_key(url, params)
+        if self.memory is not None:
+            data = self.memory.get(key)
+            if data is not None:
+                return data
+
+        # Stale/expired disk hits are served without entering the LRU, so the memory copy
+        # never outlives the background refresh
+        data, fresh = self._inflight.do(key, lambda: self._load(endpoint, key, url, params))
+        if fresh and self.memory is not None:
+            self.memory.set(key, data)
+        return data
+
+    def _load(self, endpoint: str, key: str, url: str, params: Optional[Dict]) -> Tuple[Dict, bool]:
+        """(response JSON, is fresh), served from the disk cache when available
+
+        Stale entries are returned immediately and refreshed in the background;
+        expired entries are only used if RxNav cannot be reached.
+        """
+        if self.cache is None:
+            return self._get(endpoint, url, params).json(), True
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            metrics.rxnorm_cache_lookups.inc(result=entry.state)
+            if entry.state == "fresh":
+                return entry.data, True
+            if entry.state == "stale":
+                self._refresh_in_background(key, endpoint, url, params)
+                return entry.data, False
+        else:
+            metrics.rxnorm_cache_lookups.inc(result="miss")
+
+        try:
+            return self._fetch_and_store(key, endpoint, url, params), True
+        except requests.exceptions.RequestException:
+            if entry is None:
+                raise
+            logger.warning(f"RxNorm unreachable, serving expired cache entry: {key}")
+            return entry.data, False
+
+    def _fetch_and_store(self, key: str, endpoint: str, url: str, params: Optional[Dict]) -> Dict:
+        data = self._get(endpoint, url, params).json()
+        self.cache.set(key, endpoint, data, negative=_is_empty(endpoint, data))
+        if self.memory is not None:
+            self.memory.set(key, data)
+        return data
+
+    def stats(self) -> Dict:
+        """Cache hit/miss and request coalescing counters (queries the disk cache and mirror)"""
+        return {
+            **self.memory_stats(),
+            "disk": self.cache.stats() if self.cache is not None else {"enabled": False},
+            "mirror": self.mirror.stats() if self.mirror is not None else {"enabled": False},
+        }
+
+    def memory_stats(self) -> Dict:
+        """In-memory cache and request coalescing counters only (no SQLite access, cheap to scrape)"""
+        return {
+            "memory": self.memory.stats() if self.memory is not None else {"enabled": False},
+            "singleflight": self._inflight.stats(),
+        }
+
+    def _refresh_in_background(self, key: str, endpoint: str, url: str, params: Optional[Dict]) -> None:
+        """Revalidate a stale entry once (concurrent readers keep getting the stale copy)"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, endpoint, url, params)
+            except Exception as e:
+                logger.warning(f"RxNorm cache refresh failed for {key}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="rxnorm-refresh", daemon=True).start()
+
     def search_drugs(self, query: str) -> List[Dict]:
         """Search drugs by name
 
@@ -36,29 +161,9 @@ class RxNormAPI:
             params = {"name": query}
 
             logger.info(f"Searching drugs: {query}")
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-
-            if not data.get("drugGroup"):
-                logger.warning(f"No drugs found for: {query}")
-                return []
-
-            concepts = data["drugGroup"].get("conceptGroup", [])
-            drugs = []
-
-            for concept_group in concepts:
-                if "conceptProperties" in concept_group:
-                    for drug in concept_group["conceptProperties"]:
-                        drugs.append({
-                            "rxcui": drug.get("rxcui"),
-                            "name": drug.get("name"),
-                            "synonym": drug.get("synonym", ""),
-                        })
-
-            logger.info(f"Found {len(drugs)} drugs for: {query}")
-            return drugs[:5]  # Return top 5 results
+            if self.mirror is not None:
+                return self.mirror.search_drugs(query)
+            return parse_drugs(query, self._fetch("drugs", url, params))
 
         except requests.exceptions.RequestException as e:
             logger.error(f"RxNorm API error: {str(e)}", exc_info=True)
@@ -80,21 +185,9 @@ class RxNormAPI:
             url = f"{self.BASE_URL}/rxcui/{rxcui}/properties.json"
 
             logger.info(f"Getting drug info for RxCUI: {rxcui}")
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-
-            if not data.get("properties"):
-                return None
-
-            props = data["properties"]
-            return {
-                "rxcui": props.get("rxcui"),
-                "name": props.get("name"),
-                "synonym": props.get("synonym", ""),
-                "tty": props.get("tty"),  # Term type (e.g., IN, BN, SCD)
-            }
+            if self.mirror is not None:
+                return self.mirror.get_drug_info(rxcui)
+            return parse_properties(self._fetch("properties", url))
 
         except requests.exceptions.RequestException as e:
             logger.error(f"RxNorm API error for RxCUI {rxcui}: {str(e)}", exc_info=True)
@@ -117,28 +210,7 @@ class RxNormAPI:
             params = {"rxcui": rxcui}
 
             logger.info(f"Getting interactions for RxCUI: {rxcui}")
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-
-            if not data.get("interactionTypeGroup"):
-                return []
-
-            interactions = []
-            for group in data["interactionTypeGroup"]:
-                if "interactionType" in group:
-                    for interaction_type in group["interactionType"]:
-                        if "interactionPair" in interaction_type:
-                            for pair in interaction_type["interactionPair"]:
-                                interactions.append({
-                                    "drug": pair["interactionConcept"][1]["minConceptItem"]["name"],
-                                    "severity": pair.get("severity", "Unknown"),
-                                    "description": pair.get("description", "No description available")
-                                })
-
-            logger.info(f"Found {len(interactions)} interactions for RxCUI: {rxcui}")
-            return interactions[:10]  # Return top 10
+            return parse_interactions(rxcui, self._fetch("interaction", url, params))
 
         except requests.exceptions.RequestException as e:
             logger.error(f"RxNorm API error for interactions: {str(e)}", exc_info=True)
@@ -162,25 +234,9 @@ class RxNormAPI:
             params = {"tty": relation}
 
             logger.info(f"Getting related drugs for RxCUI: {rxcui}, type: {relation}")
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-
-            if not data.get("relatedGroup"):
-                return []
-
-            related = []
-            for group in data["relatedGroup"].get("conceptGroup", []):
-                if "conceptProperties" in group:
-                    for drug in group["conceptProperties"]:
-                        related.append({
-                            "rxcui": drug.get("rxcui"),
-                            "name": drug.get("name"),
-                            "tty": drug.get("tty")
-                        })
-
-            return related
+            if self.mirror is not None:
+                return self.mirror.get_related_drugs(rxcui, relation)
+            return parse_related(self._fetch("related", url, params))
 
         except requests.exceptions.RequestException as e:
             logger.error(f"RxNorm API error for related drugs: {str(e)}", exc_info=True)
@@ -190,5 +246,124 @@ class RxNormAPI:
             return []
 
 
+# === Response parsing (shared with the async client) ===
+
+def parse_drugs(query: str, data: Dict) -> List[Dict]:
+    """drugs.json -> top 5 concepts"""
+    if not data.get("drugGroup"):
+        logger.warning(f"No drugs found for: {query}")
+        return []
+
+    concepts = data["drugGroup"].get("conceptGroup", [])
+    drugs = []
+
+    for concept_group in concepts:
+        if "conceptProperties" in concept_group:
+            for drug in concept_group["conceptProperties"]:
+                drugs.append({
+                    "rxcui": drug.get("rxcui"),
+                    "name": drug.get("name"),
+                    "synonym": drug.get("synonym", ""),
+                })
+
+    logger.info(f"Found {len(drugs)} drugs for: {query}")
+    return drugs[:5]  # Return top 5 results
+
+
+def parse_properties(data: Dict) -> Optional[Dict]:
+    """properties.json -> drug information or None"""
+    if not data.get("properties"):
+        return None
+
+    props = data["properties"]
+    return {
+        "rxcui": props.get("rxcui"),
+        "name": props.get("name"),
+        "synonym": props.get("synonym", ""),
+        "tty": props.get("tty"),  # Term type (e.g., IN, BN, SCD)
+    }
+
+
+def parse_interactions(rxcui: str, data: Dict) -> List[Dict]:
+    """interaction.json -> top 10 interactions"""
+    if not data.get("interactionTypeGroup"):
+        return []
+
+    interactions = []
+    for group in data["interactionTypeGroup"]:
+        if "interactionType" in group:
+            for interaction_type in group["interactionType"]:
+                if "interactionPair" in interaction_type:
+                    for pair in interaction_type["interactionPair"]:
+                        interactions.append({
+                            "drug": pair["interactionConcept"][1]["minConceptItem"]["name"],
+                            "severity": pair.get("severity", "Unknown"),
+                            "description": pair.get("description", "No description available")
+                        })
+
+    logger.info(f"Found {len(interactions)} interactions for RxCUI: {rxcui}")
+    return interactions[:10]  # Return top 10
+
+
+def parse_related(data: Dict) -> List[Dict]:
+    """related.json -> related concepts"""
+    if not data.get("relatedGroup"):
+        return []
+
+    related = []
+    for group in data["relatedGroup"].get("conceptGroup", []):
+        if "conceptProperties" in group:
+            for drug in group["conceptProperties"]:
+                related.append({
+                    "rxcui": drug.get("rxcui"),
+                    "name": drug.get("name"),
+                    "tty": drug.get("tty")
+                })
+
+    return related
+
+
+def _is_empty(endpoint: str, data: Dict) -> bool:
+    """True if the response would produce an empty result (negative-cached)"""
+    if endpoint == "drugs":
+        return not (data.get("drugGroup") or {}).get("conceptGroup")
+    if endpoint == "properties":
+        return not data.get("properties")
+    if endpoint == "interaction":
+        return not data.get("interactionTypeGroup")
+    if endpoint == "related":
+        groups = (data.get("relatedGroup") or {}).get("conceptGroup", [])
+        return not any("conceptProperties" in group for group in groups)
+    return not data
+
+
+def create_mirror() -> Optional[RxNormMirror]:
+    """Offline mirror from settings (None when not configured or not imported yet)"""
+    if config.rxnorm_mirror_path is None:
+        return None
+    if not config.rxnorm_mirror_path.exists():
+        logger.warning(f"RxNorm mirror not found, using RxNav: {config.rxnorm_mirror_path}")
+        return None
+    return RxNormMirror(config.rxnorm_mirror_path)
+
+
+def create_memory_cache() -> Optional[TTLCache]:
+    """In-process LRU from settings (None when disabled)"""
+    if config.rxnorm_memory_cache_size <= 0:
+        return None
+    return TTLCache(max_entries=config.rxnorm_memory_cache_size, ttl=config.rxnorm_memory_cache_ttl)
+
+
+def create_cache() -> Optional[RxNormDiskCache]:
+    """Disk cache from settings (None when disabled)"""
+    if not config.rxnorm_cache_enabled:
+        return None
+    return RxNormDiskCache(
+        config.rxnorm_cache_path,
+        negative_ttl=config.rxnorm_cache_negative_ttl,
+        stale_ttl=config.rxnorm_cache_stale_ttl,
+    )
+
+
 # Singleton instance
-rxnorm_client = RxNormAPI()
+rxnorm_client = RxNormAPI(cache=create_cache(), memory=create_memory_cache(), mirror=create_mirror())
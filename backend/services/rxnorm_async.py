@@ -0,0 +1,220 @@
+"""Async RxNorm API Client
+
+httpx-based counterpart of RxNormAPI for code running on the event loop (the
+medication tool). Same endpoints, same return shapes (shared parse functions),
+and the same in-memory LRU / disk cache objects as the sync client, so either
+client warms the cache for the other.
+
+Connections come from one pooled httpx.AsyncClient with keep-alive; the pool
+limits bound concurrent requests to RxNav (a single host).
+
+Disk cache and offline mirror calls are blocking SQLite I/O (a WAL file shared by
+every worker process, with a busy timeout), so they run in worker threads via
+asyncio.to_thread and a held write lock never stalls the event loop.
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from backend import metrics, tracing
+from backend.cache import AsyncSingleFlight, TTLCache
+from backend.config import config
+from backend.logger import get_logger
+from backend.services.rxnorm_api import (
+    RxNormAPI,
+    _is_empty,
+    parse_drugs,
+    parse_interactions,
+    parse_properties,
+    parse_related,
+    rxnorm_client,
+)
+from backend.services.rxnorm_cache import RxNormDiskCache, cache_key
+from backend.services.rxnorm_mirror import RxNormMirror
+
+logger = get_logger("rxnorm_api")
+
+
+class AsyncRxNormAPI:
+    """Async RxNorm API Client for drug information"""
+
+    BASE_URL = RxNormAPI.BASE_URL
+
+    def __init__(self, base_url: Optional[str] = None, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0, timeout: float = 10.0,
+                 cache: Optional[RxNormDiskCache] = None, memory: Optional[TTLCache] = None,
+                 mirror: Optional[RxNormMirror] = None):
+        self.BASE_URL = (base_url or os.getenv("RXNORM_BASE_URL") or self.BASE_URL).rstrip("/")
+        self.mirror = mirror
+        self.memory = memory
+        self.cache = cache
+        self._inflight = AsyncSingleFlight()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            headers={"User-Agent": "AI-Doctor-Agent/1.0"},
+        )
+
+    async def aclose(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.client.aclose()
+
+    async def _get(self, endpoint: str, url: str, params: Optional[Dict] = None) -> httpx.Response:
+        """GET with latency/outcome metrics; raises httpx exceptions on failure"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracing.span(f"rxnorm.{endpoint}", url=url) as span:
+                response = await self.client.get(url, params=params)
+                span.set(status_code=response.status_code)
+                response.raise_for_status()
+            outcome = "ok"
+            return response
+        finally:
+            metrics.rxnorm_request_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+            metrics.rxnorm_requests.inc(endpoint=endpoint, outcome=outcome)
+
+    async def _fetch(self, endpoint: str, url: str, params: Optional[Dict] = None) -> Dict:
+        """Response JSON from the in-memory LRU, else one shared load per key"""
+        key = cache_key(url, params)
+        if self.memory is not None:
+            data = self.memory.get(key)
+            if data is not None:
+                return data
+
+        # Stale/expired disk hits are served without entering the LRU, so the memory copy
+        # never outlives the background refresh
+        data, fresh = await self._inflight.do(key, lambda: self._load(endpoint, key, url, params))
+        if fresh and self.memory is not None:
+            self.memory.set(key, data)
+        return data
+
+    async def _load(self, endpoint: str, key: str, url: str, params: Optional[Dict]) -> Tuple[Dict, bool]:
+        """(response JSON, is fresh), served from the disk cache when available (see RxNormAPI._load)"""
+        if self.cache is None:
+            return (await self._get(endpoint, url, params)).json(), True
+
+        entry = await asyncio.to_thread(self.cache.get, key)
+        if entry is not None:
+            metrics.rxnorm_cache_lookups.inc(result=entry.state)
+            if entry.state == "fresh":
+                return entry.data, True
+            if entry.state == "stale":
+                self._refresh_in_background(key, endpoint, url, params)
+                return entry.data, False
+        else:
+            metrics.rxnorm_cache_lookups.inc(result="miss")
+
+        try:
+            return await self._fetch_and_store(key, endpoint, url, params), True
+        except httpx.HTTPError:
+            if entry is None:
+                raise
+            logger.warning(f"RxNorm unreachable, serving expired cache entry: {key}")
+            return entry.data, False
+
+    async def _fetch_and_store(self, key: str, endpoint: str, url: str, params: Optional[Dict]) -> Dict:
+        data = (await self._get(endpoint, url, params)).json()
+        await asyncio.to_thread(self.cache.set, key, endpoint, data, negative=_is_empty(endpoint, data))
+        if self.memory is not None:
+            self.memory.set(key, data)
+        return data
+
+    def _refresh_in_background(self, key: str, endpoint: str, url: str, params: Optional[Dict]) -> None:
+        """Revalidate a stale entry once (concurrent readers keep getting the stale copy)"""
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self._fetch_and_store(key, endpoint, url, params)
+            except Exception as e:
+                logger.warning(f"RxNorm cache refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> Dict:
+        """Request coalescing counters (memory/disk caches are shared with the sync client)"""
+        return {"singleflight": self._inflight.stats()}
+
+    async def search_drugs(self, query: str) -> List[Dict]:
+        """Search drugs by name (see RxNormAPI.search_drugs)"""
+        try:
+            logger.info(f"Searching drugs: {query}")
+            if self.mirror is not None:
+                return await asyncio.to_thread(self.mirror.search_drugs, query)
+            url = f"{self.BASE_URL}/drugs.json"
+            return parse_drugs(query, await self._fetch("drugs", url, {"name": query}))
+        except httpx.HTTPError as e:
+            logger.error(f"RxNorm API error: {str(e)}", exc_info=True)
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error in search_drugs: {str(e)}", exc_info=True)
+            return []
+
+    async def get_drug_info(self, rxcui: str) -> Optional[Dict]:
+        """Get detailed drug information by RxCUI (see RxNormAPI.get_drug_info)"""
+        try:
+            logger.info(f"Getting drug info for RxCUI: {rxcui}")
+            if self.mirror is not None:
+                return await asyncio.to_thread(self.mirror.get_drug_info, rxcui)
+            url = f"{self.BASE_URL}/rxcui/{rxcui}/properties.json"
+            return parse_properties(await self._fetch("properties", url))
+        except httpx.HTTPError as e:
+            logger.error(f"RxNorm API error for RxCUI {rxcui}: {str(e)}", exc_info=True)
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error in get_drug_info: {str(e)}", exc_info=True)
+            return None
+
+    async def get_drug_interactions(self, rxcui: str) -> List[Dict]:
+        """Get drug interactions (see RxNormAPI.get_drug_interactions)"""
+        try:
+            logger.info(f"Getting interactions for RxCUI: {rxcui}")
+            url = f"{self.BASE_URL}/interaction/interaction.json"
+            return parse_interactions(rxcui, await self._fetch("interaction", url, {"rxcui": rxcui}))
+        except httpx.HTTPError as e:
+            logger.error(f"RxNorm API error for interactions: {str(e)}", exc_info=True)
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error in get_drug_interactions: {str(e)}", exc_info=True)
+            return []
+
+    async def get_related_drugs(self, rxcui: str, relation: str = "SCD") -> List[Dict]:
+        """Get related drugs (see RxNormAPI.get_related_drugs)"""
+        try:
+            logger.info(f"Getting related drugs for RxCUI: {rxcui}, type: {relation}")
+            if self.mirror is not None:
+                return await asyncio.to_thread(self.mirror.get_related_drugs, rxcui, relation)
+            url = f"{self.BASE_URL}/rxcui/{rxcui}/related.json"
+            return parse_related(await self._fetch("related", url, {"tty": relation}))
+        except httpx.HTTPError as e:
+            logger.error(f"RxNorm API error for related drugs: {str(e)}", exc_info=True)
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error in get_related_drugs: {str(e)}", exc_info=True)
+            return []
+
+
+# Singleton instance (shares caches with the sync client)
+async_rxnorm_client = AsyncRxNormAPI(
+    max_connections=config.rxnorm_max_connections,
+    max_keepalive_connections=config.rxnorm_max_keepalive_connections,
+    keepalive_expiry=config.rxnorm_keepalive_expiry,
+    timeout=config.rxnorm_timeout,
+    cache=rxnorm_client.cache,
+    memory=rxnorm_client.memory,
+    mirror=rxnorm_client.mirror,
+)
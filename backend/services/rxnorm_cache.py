@@ -0,0 +1,153 @@
+"""Persistent RxNorm response cache
+
+SQLite file cache for raw RxNav JSON responses, shared by every worker process on
+the host (WAL mode, one connection per thread).
+
+- Per-endpoint TTLs (RxNorm is released monthly, so concept data is kept for weeks)
+- Negative caching: empty results are stored with a short TTL
+- Stale-while-revalidate: after expiry an entry is still served for ``stale_ttl``
+  seconds while the client refreshes it in the background; older entries are only
+  used as a fallback when RxNav cannot be reached
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from backend.logger import get_logger
+
+logger = get_logger("rxnorm_cache")
+
+DAY = 86400.0
+
+# Fresh lifetime per endpoint (seconds)
+DEFAULT_TTLS = {
+    "drugs": 7 * DAY,
+    "properties": 30 * DAY,
+    "related": 30 * DAY,
+    "interaction": 7 * DAY,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    body TEXT NOT NULL,
+    negative INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CacheEntry:
+    """Cached response and its freshness"""
+    data: dict
+    negative: bool
+    state: str  # "fresh" | "stale" | "expired"
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """Canonical key: URL plus sorted query parameters"""
+    if not params:
+        return url
+    return url + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+
+class RxNormDiskCache:
+    """SQLite-backed RxNav response cache"""
+
+    def __init__(self, path: Path, ttls: Optional[Dict[str, float]] = None,
+                 negative_ttl: float = 3600.0, stale_ttl: float = 7 * DAY,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.counts = {"fresh": 0, "stale": 0, "expired": 0, "miss": 0, "stores": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, result: str) -> None:
+        with self._lock:
+            self.counts[result] += 1
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up a response; None if it was never cached"""
+        row = self._connection().execute(
+            "SELECT body, negative, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self._count("miss")
+            return None
+
+        body, negative, expires_at = row
+        now = self._clock()
+        if now < expires_at:
+            state = "fresh"
+        elif now < expires_at + self.stale_ttl:
+            state = "stale"
+        else:
+            state = "expired"
+        self._count(state)
+        return CacheEntry(data=json.loads(body), negative=bool(negative), state=state)
+
+    def set(self, key: str, endpoint: str, data: dict, negative: bool = False) -> None:
+        """Store a response (empty results use the negative TTL)"""
+        now = self._clock()
+        ttl = self.negative_ttl if negative else self.ttls.get(endpoint, DAY)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, endpoint, body, negative, fetched_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, endpoint, json.dumps(data, separators=(",", ":")), int(negative), now, now + ttl),
+        )
+        self._count("stores")
+
+    def purge(self) -> int:
+        """Delete entries past their stale window; returns the number removed"""
+        cursor = self._connection().execute(
+            "DELETE FROM responses WHERE expires_at + ? <= ?", (self.stale_ttl, self._clock())
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> dict:
+        entries, negative = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(negative), 0) FROM responses"
+        ).fetchone()
+        with self._lock:
+            counts = dict(self.counts)
+        lookups = counts["fresh"] + counts["stale"] + counts["expired"] + counts["miss"]
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "negative_entries": negative,
+            **counts,
+            "hit_rate": round((counts["fresh"] + counts["stale"]) / lookups, 4) if lookups else 0.0,
+        }
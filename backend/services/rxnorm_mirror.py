@@ -0,0 +1,356 @@
+"""Offline RxNorm mirror
+
+Imports the RxNorm RRF release files (RXNCONSO, RXNREL, RXNSAT) into a local
+SQLite store so RxNormAPI can answer drug search, properties and related-concept
+lookups without network access (air-gapped sites) and without a round-trip.
+
+- Only RXNORM-source rows are kept (what RxNav serves for these endpoints)
+- Files are streamed line by line and written in batches, so memory stays
+  bounded regardless of release size
+- Rows are upserted by their RRF identifiers (RXAUI, RUI, ATUI), and files whose
+  size/mtime match the previous import are skipped. A full release (full=True,
+  ``--full``) also deletes rows it no longer contains: every row written by an
+  import carries that import's generation, and rows of an older generation are
+  deleted in the same transaction. Without it (weekly updates, which only list
+  changed rows) nothing is deleted
+- Each file is imported in one transaction, so readers never see a half-loaded file
+- Name search uses an FTS5 index kept in sync by triggers; lookups by RxCUI use
+  regular indexes
+
+    python -m backend.services.rxnorm_mirror import /path/to/rrf --full --db data/rxnorm_mirror.sqlite3
+    RXNORM_MIRROR_PATH=data/rxnorm_mirror.sqlite3 python run.py
+"""
+
+import argparse
+import re
+import sqlite3
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from backend import tracing
+from backend.logger import get_logger
+
+logger = get_logger("rxnorm_mirror")
+
+# Term types returned by drug search, in RxNav conceptGroup order
+DRUG_TTYS = ("SBD", "SCD", "BPCK", "GPCK")
+# Synonym term types (never the concept's display name)
+SYNONYM_TTYS = ("SY", "TMSY", "PSN")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS concepts (
+    rxaui INTEGER PRIMARY KEY,
+    rxcui TEXT NOT NULL,
+    tty TEXT NOT NULL,
+    str TEXT NOT NULL,
+    suppress TEXT NOT NULL,
+    gen INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS concepts_rxcui ON concepts (rxcui, tty);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS concepts_fts USING fts5(str, content='concepts', content_rowid='rxaui');
+CREATE TRIGGER IF NOT EXISTS concepts_ai AFTER INSERT ON concepts BEGIN
+    INSERT INTO concepts_fts (rowid, str) VALUES (new.rxaui, new.str);
+END;
+CREATE TRIGGER IF NOT EXISTS concepts_ad AFTER DELETE ON concepts BEGIN
+    INSERT INTO concepts_fts (concepts_fts, rowid, str) VALUES ('delete', old.rxaui, old.str);
+END;
+CREATE TRIGGER IF NOT EXISTS concepts_au AFTER UPDATE ON concepts BEGIN
+    INSERT INTO concepts_fts (concepts_fts, rowid, str) VALUES ('delete', old.rxaui, old.str);
+    INSERT INTO concepts_fts (rowid, str) VALUES (new.rxaui, new.str);
+END;
+
+CREATE TABLE IF NOT EXISTS relations (
+    rui TEXT PRIMARY KEY,
+    rxcui1 TEXT NOT NULL,
+    rxcui2 TEXT NOT NULL,
+    rela TEXT NOT NULL,
+    gen INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS relations_rxcui1 ON relations (rxcui1);
+
+CREATE TABLE IF NOT EXISTS attributes (
+    atui TEXT PRIMARY KEY,
+    rxcui TEXT NOT NULL,
+    atn TEXT NOT NULL,
+    atv TEXT NOT NULL,
+    gen INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS attributes_rxcui ON attributes (rxcui);
+
+CREATE TABLE IF NOT EXISTS imports (
+    file TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    imported_at REAL NOT NULL,
+    gen INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Tables that gained the generation column after the first schema version
+_GEN_TABLES = ("concepts", "relations", "attributes", "imports")
+
+
+def _conso_rows(lines: Iterator[List[str]]) -> Iterator[tuple]:
+    # RXCUI|LAT|TS|LUI|STT|SUI|ISPREF|RXAUI|SAUI|SCUI|SDUI|SAB|TTY|CODE|STR|SRL|SUPPRESS|CVF|
+    for f in lines:
+        if f[11] == "RXNORM":
+            yield int(f[7]), f[0], f[12], f[14], f[16]
+
+
+def _rel_rows(lines: Iterator[List[str]]) -> Iterator[tuple]:
+    # RXCUI1|RXAUI1|STYPE1|REL|RXCUI2|RXAUI2|STYPE2|RELA|RUI|SRUI|SAB|SL|RG|DIR|SUPPRESS|CVF|
+    for f in lines:
+        if f[10] == "RXNORM" and f[0] and f[4]:
+            yield f[8], f[0], f[4], f[7]
+
+
+def _sat_rows(lines: Iterator[List[str]]) -> Iterator[tuple]:
+    # RXCUI|LUI|SUI|RXAUI|STYPE|CODE|ATUI|SATUI|ATN|SAB|ATV|SUPPRESS|CVF|
+    for f in lines:
+        if f[9] == "RXNORM" and f[11] != "Y":
+            yield f[6], f[0], f[8], f[10]
+
+
+# file name -> (table, row generator, upsert statement; the last parameter is the import generation)
+_FILES = {
+    "RXNCONSO.RRF": (
+        "concepts",
+        _conso_rows,
+        "INSERT INTO concepts (rxaui, rxcui, tty, str, suppress, gen) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (rxaui) DO UPDATE SET rxcui = excluded.rxcui, tty = excluded.tty, "
+        "str = excluded.str, suppress = excluded.suppress, gen = excluded.gen",
+    ),
+    "RXNREL.RRF": (
+        "relations",
+        _rel_rows,
+        "INSERT OR REPLACE INTO relations (rui, rxcui1, rxcui2, rela, gen) VALUES (?, ?, ?, ?, ?)",
+    ),
+    "RXNSAT.RRF": (
+        "attributes",
+        _sat_rows,
+        "INSERT OR REPLACE INTO attributes (atui, rxcui, atn, atv, gen) VALUES (?, ?, ?, ?, ?)",
+    ),
+}
+
+
+def _read_rrf(path: Path) -> Iterator[List[str]]:
+    """Stream pipe-delimited RRF records"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line.rstrip("\n").split("|")
+
+
+def _fts_query(text: str) -> str:
+    """User text -> FTS5 query (all words, last one as a prefix)"""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return ""
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+class RxNormMirror:
+    """Local RxNorm store built from RRF files"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            _add_gen_columns(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # === Import ===
+
+    def import_release(self, rrf_dir: Path, batch_size: int = 10_000, force: bool = False,
+                       full: bool = False) -> Dict[str, int]:
+        """Import RXNCONSO/RXNREL/RXNSAT from a release's rrf directory
+
+        full: the directory holds a complete release, so rows missing from a file
+        (retired concepts, relationships, attributes) are deleted. Leave it off for
+        weekly update releases, which only contain changed rows.
+
+        Returns rows upserted per file (files unchanged since the last import are skipped).
+        """
+        rrf_dir = Path(rrf_dir)
+        counts = {}
+        for name, (table, rows_of, statement) in _FILES.items():
+            path = rrf_dir / name
+            if not path.exists():
+                logger.warning(f"RRF file not found, skipped: {path}")
+                continue
+            if not force and self._already_imported(path):
+                logger.info(f"Unchanged since last import, skipped: {name}")
+                continue
+            counts[name] = self._import_file(path, table, rows_of, statement, batch_size, full)
+        return counts
+
+    def _already_imported(self, path: Path) -> bool:
+        stat = path.stat()
+        row = self._connection().execute(
+            "SELECT size, mtime FROM imports WHERE file = ?", (path.name,)
+        ).fetchone()
+        return row is not None and row == (stat.st_size, stat.st_mtime)
+
+    def _import_file(self, path: Path, table: str, rows_of, statement: str, batch_size: int, full: bool) -> int:
+        """Upsert one file in a single transaction (full: then delete rows of older generations)"""
+        conn = self._connection()
+        started = time.perf_counter()
+        previous = conn.execute("SELECT gen FROM imports WHERE file = ?", (path.name,)).fetchone()
+        gen = (previous[0] if previous else 0) + 1
+        rows = rows_of(_read_rrf(path))
+        total = deleted = 0
+        with conn:
+            while batch := list(islice(rows, batch_size)):
+                conn.executemany(statement, [(*row, gen) for row in batch])
+                total += len(batch)
+            if full:
+                deleted = conn.execute(f"DELETE FROM {table} WHERE gen != ?", (gen,)).rowcount
+
+            stat = path.stat()
+            conn.execute(
+                "INSERT OR REPLACE INTO imports (file, size, mtime, rows, imported_at, gen) VALUES (?, ?, ?, ?, ?, ?)",
+                (path.name, stat.st_size, stat.st_mtime, total, time.time(), gen),
+            )
+        logger.info(
+            f"Imported {path.name}: {total} rows{f', {deleted} retired rows deleted' if full else ''} "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return total
+
+    # === Queries (same return shapes as RxNormAPI) ===
+
+    def search_drugs(self, query: str, limit: int = 5) -> List[Dict]:
+        """Drug products whose name or synonym matches the query"""
+        match = _fts_query(query)
+        if not match:
+            return []
+        order = " ".join(f"WHEN '{tty}' THEN {i}" for i, tty in enumerate(DRUG_TTYS))
+        with tracing.span("rxnorm.mirror.drugs"):
+            rows = self._connection().execute(
+                f"""
+                SELECT d.rxcui, d.str, (
+                    SELECT s.str FROM concepts s
+                    WHERE s.rxcui = d.rxcui AND s.tty IN ({_placeholders(SYNONYM_TTYS)}) AND s.suppress = 'N'
+                    ORDER BY s.rxaui LIMIT 1
+                )
+                FROM concepts d
+                WHERE d.tty IN ({_placeholders(DRUG_TTYS)}) AND d.suppress = 'N' AND d.rxcui IN (
+                    SELECT c.rxcui FROM concepts_fts JOIN concepts c ON c.rxaui = concepts_fts.rowid
+                    WHERE concepts_fts MATCH ? AND c.suppress = 'N'
+                )
+                ORDER BY CASE d.tty {order} END, d.str
+                LIMIT ?
+                """,
+                (*SYNONYM_TTYS, *DRUG_TTYS, match, limit),
+            ).fetchall()
+        if not rows:
+            logger.warning(f"No drugs found for: {query}")
+        return [{"rxcui": rxcui, "name": name, "synonym": synonym or ""} for rxcui, name, synonym in rows]
+
+    def get_drug_info(self, rxcui: str) -> Optional[Dict]:
+        """Concept properties (display name, first synonym, term type) or None"""
+        with tracing.span("rxnorm.mirror.properties"):
+            rows = self._connection().execute(
+                "SELECT tty, str FROM concepts WHERE rxcui = ? AND suppress != 'Y' ORDER BY rxaui", (rxcui,)
+            ).fetchall()
+        names = [(tty, name) for tty, name in rows if tty not in SYNONYM_TTYS]
+        if not names:
+            return None
+        tty, name = names[0]
+        synonym = next((name for tty, name in rows if tty in SYNONYM_TTYS), "")
+        return {"rxcui": rxcui, "name": name, "synonym": synonym, "tty": tty}
+
+    def get_related_drugs(self, rxcui: str, relation: str = "SCD") -> List[Dict]:
+        """Concepts of the given term type(s) (space separated) directly related to rxcui"""
+        ttys = relation.split()
+        with tracing.span("rxnorm.mirror.related"):
+            rows = self._connection().execute(
+                f"""
+                SELECT DISTINCT c.rxcui, c.str, c.tty
+                FROM relations r JOIN concepts c ON c.rxcui = r.rxcui2
+                WHERE r.rxcui1 = ? AND c.tty IN ({_placeholders(ttys)}) AND c.suppress = 'N'
+                ORDER BY c.tty, c.str
+                """,
+                (rxcui, *ttys),
+            ).fetchall()
+        return [{"rxcui": related, "name": name, "tty": tty} for related, name, tty in rows]
+
+    def get_attributes(self, rxcui: str) -> Dict[str, List[str]]:
+        """RXNSAT attributes (e.g. RXN_STRENGTH) by name"""
+        attributes: Dict[str, List[str]] = {}
+        for atn, atv in self._connection().execute(
+            "SELECT atn, atv FROM attributes WHERE rxcui = ? ORDER BY atui", (rxcui,)
+        ):
+            attributes.setdefault(atn, []).append(atv)
+        return attributes
+
+    def stats(self) -> Dict:
+        """Rows upserted by the last import of each file (cheap; no table scans)"""
+        imports = self._connection().execute("SELECT file, rows, imported_at FROM imports ORDER BY file")
+        return {
+            "path": str(self.path),
+            "imports": {file: {"rows": rows, "imported_at": imported_at} for file, rows, imported_at in imports},
+        }
+
+
+def _add_gen_columns(conn: sqlite3.Connection) -> None:
+    """Add the generation column to mirrors created before it existed"""
+    for table in _GEN_TABLES:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if "gen" not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN gen INTEGER NOT NULL DEFAULT 0")
+    conn.commit()
+
+
+def _placeholders(values) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline RxNorm mirror")
+    sub = parser.add_subparsers(dest="command", required=True)
+    load = sub.add_parser("import", help="import an RxNorm release (directory containing the .RRF files)")
+    load.add_argument("rrf_dir", type=Path)
+    load.add_argument("--db", type=Path, default=Path("data/rxnorm_mirror.sqlite3"))
+    load.add_argument("--batch-size", type=int, default=10_000)
+    load.add_argument("--force", action="store_true", help="re-import files even if unchanged")
+    load.add_argument("--full", action="store_true",
+                      help="complete (monthly full) release: delete rows the release no longer contains")
+    search = sub.add_parser("search", help="search drugs in an imported mirror")
+    search.add_argument("query")
+    search.add_argument("--db", type=Path, default=Path("data/rxnorm_mirror.sqlite3"))
+    args = parser.parse_args()
+
+    mirror = RxNormMirror(args.db)
+    if args.command == "import":
+        counts = mirror.import_release(args.rrf_dir, batch_size=args.batch_size, force=args.force, full=args.full)
+        print(f"Imported: {counts}")
+        print(mirror.stats())
+    else:
+        for drug in mirror.search_drugs(args.query):
+            print(f"{drug['rxcui']:>10}  {drug['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""AI Doctor Agent - Conversation Sessions
+
+멀티턴 상담을 위한 인프로세스 세션 저장소와 컨텍스트 압축.
+
+세션에는 시스템 프롬프트를 제외한 대화 이력만 저장한다. 시스템 프롬프트는
+요청마다 캐시에서 다시 붙이므로 접두부가 항상 최신이면서 동일하게 유지된다.
+"""
+
+import json
+from dataclasses import dataclass, field
+
+from backend.cache import TTLCache
+
+# 토큰 추정치 (한국어/영어 혼합 텍스트 기준 보수적 근사)
+CHARS_PER_TOKEN = 3
+IMAGE_TOKENS = 800
+
+SUMMARY_PREFIX = "[이전 상담 요약]"
+MAX_SUMMARY_CHARS = 2000
+
+
+@dataclass
+class Session:
+    """대화 세션 (환자별)"""
+    session_id: str
+    patient_id: str
+    messages: list = field(default_factory=list)
+    turns: int = 0
+
+
+class SessionStore:
+    """세션 저장소 (LRU + TTL)
+
+    세션은 (patient_id, session_id)로 저장한다. 다른 환자의 session_id를 보내도
+    그 환자의 대화 이력은 이어지지 않고 요청한 환자의 새 세션이 시작된다.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 1800):
+        self._cache = TTLCache(max_entries=max_sessions, ttl=ttl)
+
+    def get_or_create(self, session_id: str, patient_id: str) -> Session:
+        """환자의 세션 조회, 없거나 만료되었으면 새로 생성"""
+        session = self._cache.get((patient_id, session_id))
+        if session is None:
+            session = Session(session_id=session_id, patient_id=patient_id)
+        return session
+
+    def save(self, session: Session) -> None:
+        """세션 저장 (TTL 갱신)"""
+        self._cache.set((session.patient_id, session.session_id), session)
+
+    def delete(self, session_id: str, patient_id: str) -> None:
+        """세션 삭제"""
+        self._cache.pop((patient_id, session_id))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> dict:
+        """세션 저장소 통계"""
+        return self._cache.stats()
+
+
+# === 컨텍스트 압축 ===
+
+def estimate_tokens(messages: list) -> int:
+    """메시지 목록의 대략적인 토큰 수"""
+    total = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            for part in content:
+                if part.get("type") == "image_url":
+                    total += IMAGE_TOKENS
+                else:
+                    total += len(part.get("text", "")) // CHARS_PER_TOKEN
+        elif content:
+            total += len(content) // CHARS_PER_TOKEN
+
+        for tool_call in message.get("tool_calls") or []:
+            total += len(tool_call["function"]["arguments"]) // CHARS_PER_TOKEN
+    return total
+
+
+def compact_history(history: list, budget_tokens: int, keep_recent_turns: int = 1) -> list:
+    """대화 이력이 토큰 예산을 넘으면 압축한 새 목록을 반환
+
+    1단계: 최근 keep_recent_turns 턴을 제외한 이전 턴의 도구 결과(이미 답변에
+           반영된 내용)와 첨부 이미지를 짧은 요약으로 교체
+    2단계: 그래도 넘으면 가장 오래된 턴부터 한 줄 요약으로 합쳐 맨 앞의
+           "[이전 상담 요약]" 메시지에 누적
+    """
+    if estimate_tokens(history) <= budget_tokens:
+        return history
+
+    summary, turns = _split_turns(history)
+    split = max(len(turns) - keep_recent_turns, 0)
+    older, recent = turns[:split], turns[split:]
+
+    # 1단계: 소비된 도구 결과 / 이미지 축약
+    older = [[_compact_message(message) for message in turn] for turn in older]
+    compacted = _join(summary, older, recent)
+    if estimate_tokens(compacted) <= budget_tokens:
+        return compacted
+
+    # 2단계: 오래된 턴부터 요약으로 병합
+    summary_lines = summary.splitlines()[1:] if summary else []
+    while older:
+        summary_lines.append(_summarize_turn(older.pop(0)))
+        summary = _render_summary(summary_lines)
+        compacted = _join(summary, older, recent)
+        if estimate_tokens(compacted) <= budget_tokens:
+            break
+    return compacted
+
+
+def _split_turns(history: list) -> tuple[str | None, list[list]]:
+    """(기존 요약, 턴 목록) 분리 - 턴은 user 메시지에서 시작"""
+    summary = None
+    turns: list[list] = []
+    for message in history:
+        content = message.get("content")
+        if message["role"] == "user" and isinstance(content, str) and content.startswith(SUMMARY_PREFIX):
+            summary = content
+            continue
+        if message["role"] == "user" or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return summary, turns
+
+
+def _join(summary: str | None, older: list[list], recent: list[list]) -> list:
+    """요약 + 턴 목록을 다시 메시지 목록으로"""
+    messages = [{"role": "user", "content": summary}] if summary else []
+    for turn in older + recent:
+        messages.extend(turn)
+    return messages
+
+
+def _compact_message(message: dict) -> dict:
+    """도구 결과는 첫 줄 + 생략 표시로, 이미지는 텍스트 표시로 교체"""
+    content = message.get("content")
+    if message["role"] == "tool" and content and len(content) > 200:
+        first_line = content.strip().splitlines()[0]
+        return {**message, "content": f"{first_line}\n(이전 도구 결과 {len(content)}자 생략)"}
+
+    if message["role"] == "user" and isinstance(content, list):
+        return {**message, "content": f"{_text(content)}\n[이미지 첨부됨 - 분석 완료]"}
+
+    return message
+
+
+def _summarize_turn(turn: list) -> str:
+    """턴 하나를 한 줄 요약 (질문 + 사용 도구 + 최종 답변 앞부분)"""
+    question = _text(turn[0].get("content"))
+    tools = [
+        tool_call["function"]["name"]
+        for message in turn
+        for tool_call in message.get("tool_calls") or []
+    ]
+    answers = [m["content"] for m in turn if m["role"] == "assistant" and m.get("content")]
+    answer = answers[-1] if answers else ""
+
+    line = f"- 질문: {_clip(question, 120)}"
+    if tools:
+        line += f" | 도구: {', '.join(dict.fromkeys(tools))}"
+    if answer:
+        line += f" | 답변: {_clip(answer, 200)}"
+    return line
+
+
+def _render_summary(lines: list[str]) -> str:
+    """요약 메시지 본문 (최대 길이 초과 시 오래된 줄부터 버림)"""
+    while len(lines) > 1 and sum(len(line) for line in lines) > MAX_SUMMARY_CHARS:
+        lines.pop(0)
+    return "\n".join([SUMMARY_PREFIX, *lines])
+
+
+def _text(content) -> str:
+    """메시지 content에서 텍스트만 추출"""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, ensure_ascii=False) if content else ""
+
+
+def _clip(text: str, limit: int) -> str:
+    """한 줄로 자르기"""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit] + "…"
@@ -5,10 +5,12 @@ Progressive Disclosure 패턴 구현
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass
 import yaml
 
+from backend import tracing
+
 
 @dataclass
 class SkillMetadata:
@@ -34,14 +36,35 @@ class SkillLoader:
     def __init__(self, skills_dir: str | Path):
         self.skills_dir = Path(skills_dir)
         self.skills: dict[str, Skill] = {}
+        self._reload_listeners: list[Callable[[], None]] = []
+        self._discover()
+
+    def reload(self) -> None:
+        """스킬 재탐색 (SKILL.md 변경 반영, 캐시된 본문도 폐기)"""
         self._discover()
+        for listener in self._reload_listeners:
+            listener()
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """reload() 후 호출할 함수 등록 (스킬 본문을 따로 캐시하는 쪽의 무효화용)"""
+        self._reload_listeners.append(listener)
 
     def _discover(self) -> None:
-        """Discovery 단계: 모든 스킬의 메타데이터만 로드"""
+        """Discovery 단계: 모든 스킬의 메타데이터만 로드
+
+        디렉토리 이름순으로 탐색하여 생성되는 프롬프트가 항상 동일하도록 한다.
+        """
+        with tracing.span("skill.discover") as span:
+            self._scan()
+            span.set(skills=len(self.skills))
+
+    def _scan(self) -> None:
+        skills: dict[str, Skill] = {}
         if not self.skills_dir.exists():
+            self.skills = skills
             return
 
-        for skill_path in self.skills_dir.iterdir():
+        for skill_path in sorted(self.skills_dir.iterdir()):
             if not skill_path.is_dir():
                 continue
 
@@ -51,12 +74,15 @@ class SkillLoader:
 
             metadata = self._parse_frontmatter(skill_md)
             if metadata:
-                self.skills[metadata.name] = Skill(
+                skills[metadata.name] = Skill(
                     metadata=metadata,
                     path=skill_path,
                     content=None,
                 )
 
+        # 진행 중인 요청이 반쯤 채워진 dict를 보지 않도록 한 번에 교체
+        self.skills = skills
+
     def _parse_frontmatter(self, skill_md: Path) -> Optional[SkillMetadata]:
         """SKILL.md에서 YAML frontmatter 파싱"""
         try:
@@ -110,11 +136,12 @@ class SkillLoader:
         skill = self.skills[skill_name]
 
         if skill.content is None:
-            skill_md = skill.path / "SKILL.md"
-            try:
-                skill.content = skill_md.read_text(encoding="utf-8")
-            except Exception:
-                return None
+            with tracing.span("skill.load", skill=skill_name):
+                skill_md = skill.path / "SKILL.md"
+                try:
+                    skill.content = skill_md.read_text(encoding="utf-8")
+                except Exception:
+                    return None
 
         return skill.content
 
@@ -1,6 +1,13 @@
 """AI Doctor Agent - Tools Package"""
 
-from .registry import ToolRegistry
-from .definitions import TOOL_DEFINITIONS
+from .registry import ToolRegistry, ToolCachePolicy, ToolError, DEFAULT_CACHE_POLICIES
+from .definitions import TOOL_DEFINITIONS, CACHEABLE_TOOL_DEFINITIONS
 
-__all__ = ["ToolRegistry", "TOOL_DEFINITIONS"]
+__all__ = [
+    "ToolRegistry",
+    "ToolCachePolicy",
+    "ToolError",
+    "DEFAULT_CACHE_POLICIES",
+    "TOOL_DEFINITIONS",
+    "CACHEABLE_TOOL_DEFINITIONS",
+]
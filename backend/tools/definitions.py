@@ -3,6 +3,8 @@
 OpenAI Function Calling 스키마 정의
 """
 
+import json
+
 TOOL_DEFINITIONS = [
     # === 증상 분석 도구 ===
     {
@@ -282,3 +284,17 @@ TOOL_DEFINITIONS = [
         }
     }
 ]
+
+
+def _canonicalize(definitions: list) -> list:
+    """도구 정의 정규화 - 이름순 정렬 + 키 정렬
+
+    요청마다 직렬화 결과가 바이트 단위로 동일해야 프로바이더 프롬프트 캐시가
+    도구 정의 + 시스템 프롬프트 접두부를 재사용할 수 있다.
+    """
+    ordered = sorted(definitions, key=lambda tool: tool["function"]["name"])
+    return json.loads(json.dumps(ordered, sort_keys=True, ensure_ascii=False))
+
+
+# LLM 요청에 사용하는 정규화된 도구 정의 (모듈 로드 시 1회 생성)
+CACHEABLE_TOOL_DEFINITIONS = _canonicalize(TOOL_DEFINITIONS)
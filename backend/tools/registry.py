@@ -3,17 +3,65 @@
 도구 실행 관리자. 각 도구의 실제 구현을 담당.
 """
 
+import asyncio
+import contextvars
+import hashlib
+import inspect
 import json
-from typing import Any
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
 from pathlib import Path
 
+from backend import tracing
+from backend.cache import TTLCache
+
+
+class ToolError(Exception):
+    """도구 실행 실패 (알 수 없는 도구 또는 도구 내부 예외)"""
+
+
+class _FallbackResult(str):
+    """외부 조회 실패로 대체 데이터를 사용한 결과 - 성공으로 반환하지만 캐시하지 않음"""
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """도구 결과 캐시 정책"""
+    cacheable: bool = False
+    ttl: float | None = None   # 초 (None이면 만료 없음)
+    max_entries: int = 256
+
+
+# 인자만으로 결과가 결정되는 도구는 길게, 외부 API/스킬 파일에 의존하는 도구는 짧게 캐시.
+# 환자 병력처럼 갱신될 수 있는 데이터 조회는 캐시하지 않는다.
+DEFAULT_CACHE_POLICIES = {
+    "analyze_symptoms": ToolCachePolicy(cacheable=True, ttl=3600, max_entries=512),
+    "analyze_xray": ToolCachePolicy(cacheable=True, ttl=3600),
+    "analyze_mri": ToolCachePolicy(cacheable=True, ttl=3600),
+    "analyze_ct": ToolCachePolicy(cacheable=True, ttl=3600),
+    "assess_severity": ToolCachePolicy(cacheable=True, ttl=3600, max_entries=512),
+    "check_risk_factors": ToolCachePolicy(cacheable=True, ttl=3600),
+    "recommend_treatment": ToolCachePolicy(cacheable=True, ttl=3600, max_entries=512),
+    "get_surgery_options": ToolCachePolicy(cacheable=True, ttl=3600),
+    "get_medication_options": ToolCachePolicy(cacheable=True, ttl=300),
+    "read_skill": ToolCachePolicy(cacheable=True, ttl=300, max_entries=64),
+    "get_patient_history": ToolCachePolicy(cacheable=False),
+}
+
 
 class ToolRegistry:
     """도구 레지스트리 - 도구 실행 관리"""
 
-    def __init__(self, data_source, skill_loader):
+    def __init__(self, data_source, skill_loader, cache_policies: dict[str, ToolCachePolicy] = None,
+                 lookup_workers: int = 8):
         self.data_source = data_source
         self.skill_loader = skill_loader
+        self.cache_policies = DEFAULT_CACHE_POLICIES if cache_policies is None else cache_policies
+
+        # 도구 내부 외부 API 조회(RxNorm) 동시 실행용 스레드 풀 - 도구 스레드 풀과 분리하여
+        # 도구 워커가 자기 풀의 작업을 기다리며 교착되지 않게 한다 (최대 동시 요청 수 = lookup_workers)
+        self._lookup_executor = ThreadPoolExecutor(max_workers=lookup_workers, thread_name_prefix="tool-lookup")
 
         # 도구 매핑
         self._tools = {
@@ -30,17 +78,107 @@ class ToolRegistry:
             "read_skill": self._read_skill,
         }
 
-    def execute(self, tool_name: str, args: dict) -> str:
-        """도구 실행"""
-        if tool_name not in self._tools:
-            return json.dumps({"error": f"알 수 없는 도구: {tool_name}"}, ensure_ascii=False)
+        # 이벤트 루프에서 직접 await 하는 비동기 구현 (aexecute 전용, execute는 위 동기 구현 사용)
+        self._async_tools = {
+            "get_medication_options": self._aget_medication_options,
+        }
+
+        # 도구별 결과 캐시 (정규화된 인자 → 결과 문자열)
+        self._caches = {
+            name: TTLCache(max_entries=policy.max_entries, ttl=policy.ttl)
+            for name, policy in self.cache_policies.items()
+            if policy.cacheable
+        }
+
+        # SKILL.md 변경으로 스킬을 다시 읽으면(시스템 프롬프트 재생성과 같은 시점)
+        # read_skill 결과도 함께 버려 프롬프트와 스킬 본문 버전이 어긋나지 않게 한다
+        skill_loader.add_reload_listener(lambda: self.clear_cache("read_skill"))
 
+    def execute(self, tool_name: str, args: dict) -> str:
+        """도구 실행 (캐시 가능한 도구는 결과 재사용, 실패 시 오류 JSON 반환)"""
         try:
-            result = self._tools[tool_name](**args)
-            return result
-        except Exception as e:
+            return self._execute(tool_name, args)
+        except ToolError as e:
             return json.dumps({"error": str(e)}, ensure_ascii=False)
 
+    async def aexecute(self, tool_name: str, args: dict, executor: Executor = None) -> str:
+        """도구 비동기 실행 - 실패 시 ToolError
+
+        코루틴 도구는 이벤트 루프에서 직접 await 하고, 동기 도구는
+        executor(None이면 기본 스레드 풀)에서 실행하여 루프를 막지 않는다.
+        """
+        tool = self._async_tools.get(tool_name) or self._tools.get(tool_name)
+        if tool is not None and inspect.iscoroutinefunction(tool):
+            cache = self._caches.get(tool_name)
+            key = _cache_key(args) if cache is not None else None
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+
+            with tracing.span("tool.execute", tool=tool_name) as span:
+                try:
+                    result = await tool(**args)
+                except Exception as e:
+                    span.record_error(e)
+                    raise ToolError(str(e)) from e
+
+            if cache is not None and not isinstance(result, _FallbackResult):
+                cache.set(key, result)
+            return result
+
+        # 현재 스팬이 워커 스레드에서도 부모가 되도록 컨텍스트 복사
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, contextvars.copy_context().run, self._execute, tool_name, args)
+
+    def _execute(self, tool_name: str, args: dict) -> str:
+        """동기 도구 실행 - 실패 시 ToolError (실패/대체 데이터 결과는 캐시하지 않음)"""
+        if tool_name not in self._tools:
+            raise ToolError(f"알 수 없는 도구: {tool_name}")
+
+        cache = self._caches.get(tool_name)
+        key = _cache_key(args) if cache is not None else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        with tracing.span("tool.execute", tool=tool_name) as span:
+            try:
+                result = self._tools[tool_name](**args)
+            except Exception as e:
+                span.record_error(e)
+                raise ToolError(str(e)) from e
+
+        if cache is not None and not isinstance(result, _FallbackResult):
+            cache.set(key, result)
+        return result
+
+    def close(self) -> None:
+        """조회 스레드 풀 종료"""
+        self._lookup_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fan_out(self, calls: list[tuple[Callable, tuple]]) -> list:
+        """(함수, 인자) 목록을 조회 스레드 풀에서 동시에 실행하고 결과를 입력 순서대로 반환
+
+        호출마다 현재 컨텍스트를 복사해 실행하므로 트레이싱 span이 호출한 도구 아래에 기록된다.
+        """
+        futures = [
+            self._lookup_executor.submit(contextvars.copy_context().run, fn, *args)
+            for fn, args in calls
+        ]
+        return [future.result() for future in futures]
+
+    def clear_cache(self, tool_name: str = None) -> None:
+        """도구 결과 캐시 비우기 (tool_name 미지정 시 전체)"""
+        for name, cache in self._caches.items():
+            if tool_name is None or name == tool_name:
+                cache.clear()
+
+    def cache_stats(self) -> dict:
+        """도구별 캐시 적중률 통계"""
+        return {name: cache.stats() for name, cache in self._caches.items()}
+
     # === 증상 분석 ===
     def _analyze_symptoms(self, symptoms: str, pain_scale: int = None,
                           duration: str = None, pain_type: str = None) -> str:
@@ -281,19 +419,54 @@ class ToolRegistry:
     def _get_medication_options(self, diagnosis: str, allergies: list = None) -> str:
         """Get medication options using RxNorm API"""
         from backend.services.rxnorm_api import rxnorm_client
-        from backend.logger import get_logger
 
-        logger = get_logger("tools.medication")
         allergies = allergies or []
+        queries = self._get_drug_queries_for_diagnosis(diagnosis)[:3]  # Top 3 drug types
+        if not queries:
+            return self._medication_fallback(diagnosis, allergies, "No drug queries found for diagnosis")
+
+        # RxNorm lookups run concurrently in two rounds (search, then details for the
+        # selected drugs); output keeps the query/drug order of the sequential version
+        searches = self._fan_out([(rxnorm_client.search_drugs, (query,)) for query in queries])
+        selected = _select_drugs(searches, allergies)
+        details = self._fan_out([
+            call
+            for _, rxcui in selected
+            for call in ((rxnorm_client.get_drug_info, (rxcui,)), (rxnorm_client.get_drug_interactions, (rxcui,)))
+        ])
+        return self._format_medications(diagnosis, allergies, searches, selected, details)
+
+    async def _aget_medication_options(self, diagnosis: str, allergies: list = None) -> str:
+        """Get medication options using the async RxNorm client (same output as the sync version)"""
+        from backend.services.rxnorm_async import async_rxnorm_client as client
+
+        allergies = allergies or []
+        queries = self._get_drug_queries_for_diagnosis(diagnosis)[:3]  # Top 3 drug types
+        if not queries:
+            return self._medication_fallback(diagnosis, allergies, "No drug queries found for diagnosis")
+
+        searches = await asyncio.gather(*(client.search_drugs(query) for query in queries))
+        selected = _select_drugs(searches, allergies)
+        details = await asyncio.gather(*(
+            call
+            for _, rxcui in selected
+            for call in (client.get_drug_info(rxcui), client.get_drug_interactions(rxcui))
+        ))
+        return self._format_medications(diagnosis, allergies, searches, selected, details)
+
+    def _medication_fallback(self, diagnosis: str, allergies: list, reason: str) -> str:
+        """Fallback to mock data (not cached, so RxNorm is retried on the next call)"""
+        from backend.logger import get_logger
 
-        # Map diagnosis to common drug queries
-        drug_queries = self._get_drug_queries_for_diagnosis(diagnosis)
+        get_logger("tools.medication").warning(f"{reason}: {diagnosis}, using fallback")
+        medications = self.data_source.get_medication_options(diagnosis, allergies)
+        return _FallbackResult(self._format_mock_medications(diagnosis, medications))
 
-        if not drug_queries:
-            logger.warning(f"No drug queries found for diagnosis: {diagnosis}")
-            # Fallback to mock data
-            medications = self.data_source.get_medication_options(diagnosis, allergies)
-            return self._format_mock_medications(diagnosis, medications)
+    def _format_medications(self, diagnosis: str, allergies: list, searches: list,
+                            selected: list, details: list) -> str:
+        """Format RxNorm results (details = [info, interactions] per selected drug)"""
+        if not any(searches):
+            return self._medication_fallback(diagnosis, allergies, "No drugs found via RxNorm API")
 
         result = f"""## Medication Treatment Options (via RxNorm API)
 
@@ -301,42 +474,18 @@ class ToolRegistry:
 
 ### Primary Medications (FDA-approved)
 """
-
-        found_any = False
-        for query in drug_queries[:3]:  # Top 3 drug types
-            logger.info(f"Searching RxNorm for: {query}")
-            drugs = rxnorm_client.search_drugs(query)
-
-            if drugs:
-                found_any = True
-                for drug in drugs[:2]:  # Top 2 per category
-                    drug_name = drug.get('name', 'Unknown')
-                    rxcui = drug.get('rxcui', 'N/A')
-
-                    # Check for allergies
-                    if any(allergy.lower() in drug_name.lower() for allergy in allergies):
-                        continue
-
-                    # Get drug details
-                    drug_info = rxnorm_client.get_drug_info(rxcui)
-
-                    result += f"""
+        for index, (drug_name, rxcui) in enumerate(selected):
+            drug_info, interactions = details[2 * index], details[2 * index + 1]
+            result += f"""
 **{drug_name}**
 - RxCUI: {rxcui}
 - Type: {drug_info.get('tty', 'N/A') if drug_info else 'N/A'}
 - Note: Consult healthcare provider for dosage and usage
 """
 
-                    # Get interactions if available
-                    interactions = rxnorm_client.get_drug_interactions(rxcui)
-                    if interactions:
-                        result += f"- ⚠️ Known interactions: {len(interactions)} found\n"
-
-        if not found_any:
-            logger.warning(f"No drugs found via RxNorm API, using fallback")
-            # Fallback to mock data
-            medications = self.data_source.get_medication_options(diagnosis, allergies)
-            return self._format_mock_medications(diagnosis, medications)
+            # Get interactions if available
+            if interactions:
+                result += f"- ⚠️ Known interactions: {len(interactions)} found\n"
 
         result += """
 
@@ -423,3 +572,21 @@ class ToolRegistry:
         if content:
             return content
         return f"스킬을 찾을 수 없습니다: {skill_name}"
+
+
+def _select_drugs(searches: list, allergies: list) -> list:
+    """검색 결과별 상위 2개 약물 중 알레르기 성분을 제외한 (이름, RxCUI) 목록"""
+    selected = []
+    for drugs in searches:
+        for drug in drugs[:2]:  # Top 2 per category
+            drug_name = drug.get('name', 'Unknown')
+            if any(allergy.lower() in drug_name.lower() for allergy in allergies):
+                continue
+            selected.append((drug_name, drug.get('rxcui', 'N/A')))
+    return selected
+
+
+def _cache_key(args: dict) -> str:
+    """인자 정규화 키 - 키 순서와 무관, 큰 인자(이미지 등)도 고정 길이"""
+    canonical = json.dumps(args, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,305 @@
+"""AI Doctor Agent - Tracing
+
+상담 단위 트레이스와 중첩 스팬 (OpenTelemetry 데이터 모델 호환).
+
+상담마다 루트 스팬을 만들고 스킬 로드, LLM 호출, 도구 실행, RxNorm 호출을 자식 스팬으로
+기록한다. 최근 트레이스는 메모리에 보관하여 trace_id로 바로 조회할 수 있고, 설정 시 루트
+스팬이 끝날 때 OTLP/JSON 형식(한 줄에 트레이스 하나 - 컬렉터 otlpjsonfile 리시버 입력
+형식)으로 파일에 내보낸다.
+
+현재 스팬은 contextvars로 전달되므로 도구 레지스트리나 RxNorm 클라이언트처럼 트레이스를
+모르는 코드도 span()으로 자식 스팬을 만들 수 있다. 활성 스팬이 없으면 no-op 스팬을 반환한다.
+비동기 제너레이터처럼 yield를 가로지르는 구간은 컨텍스트가 유지되지 않으므로 부모 스팬의
+child()를 직접 호출하고 end()로 닫는다.
+
+파일 내보내기는 백그라운드 스레드가 담당하므로 루트 스팬을 닫는 이벤트 루프는 파일 I/O를
+하지 않는다. 파일은 계속 커지므로 회전(logrotate 등)은 운영자가 설정한다 - 묶음마다 파일을
+다시 열기 때문에 이름을 바꾸는 방식의 회전도 그대로 동작한다.
+"""
+
+import json
+import queue
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from pathlib import Path
+
+from backend.logger import get_logger
+
+logger = get_logger("tracing")
+
+_current_span: ContextVar = ContextVar("current_span", default=None)
+
+
+def new_trace_id() -> str:
+    """32자리 16진수 trace id (W3C/OTLP 형식)"""
+    return secrets.token_hex(16)
+
+
+class Span:
+    """시작/종료 시각, 속성, 오류를 가진 작업 구간"""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error", "_token")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None = None, attributes: dict | None = None):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+        self._token = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration(self) -> float:
+        """경과 시간 (초, 진행 중이면 현재까지)"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def child(self, name: str, **attributes) -> "Span":
+        return self.trace.start_span(name, self.span_id, attributes)
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException | str) -> None:
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if self.parent_id is None:
+                self.trace.tracer.finish(self.trace)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.record_error(exc)
+        self.end()
+        return False
+
+
+class _NoopSpan:
+    """트레이싱 비활성/활성 스팬 없음 - 아무것도 기록하지 않음"""
+
+    trace_id = None
+    duration = 0.0
+
+    def child(self, name: str, **attributes) -> "_NoopSpan":
+        return self
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def record_error(self, error) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """trace_id 하나에 속한 스팬 목록 (max_spans 초과분은 버리고 개수만 기록)"""
+
+    def __init__(self, tracer: "Tracer", trace_id: str, max_spans: int):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self.dropped = 0
+
+    def start_span(self, name: str, parent_id: str | None, attributes: dict) -> Span | _NoopSpan:
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return NOOP_SPAN
+        span = Span(self, name, parent_id, attributes)
+        self.spans.append(span)
+        return span
+
+    def to_dict(self) -> dict:
+        """조회용 요약 (루트 시작 기준 오프셋/지속 시간 ms)"""
+        origin = self.spans[0].start_ns if self.spans else 0
+        return {
+            "trace_id": self.trace_id,
+            "finished": bool(self.spans) and self.spans[0].end_ns is not None,
+            "dropped_spans": self.dropped,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_ms": round((span.start_ns - origin) / 1e6, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }
+                for span in list(self.spans)
+            ],
+        }
+
+    def to_otlp(self, service_name: str) -> dict:
+        """OTLP/JSON ExportTraceServiceRequest"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "backend.tracing"},
+                    "spans": [_otlp_span(span) for span in list(self.spans)],
+                }],
+            }],
+        }
+
+
+class Tracer:
+    """트레이스 생성, 최근 트레이스 보관(LRU), 파일 내보내기"""
+
+    def __init__(self, enabled: bool = True, max_traces: int = 200, max_spans: int = 1000,
+                 export_path: str | Path | None = None, service_name: str = "doctor-agent",
+                 export_queue_size: int = 1000):
+        self.enabled = enabled
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        self.export_path = Path(export_path) if export_path else None
+        self.service_name = service_name
+        self._traces: OrderedDict[str, Trace] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 내보내기 대기열 (가득 차면 버리고 개수만 기록) + 전용 쓰기 스레드 (첫 내보내기 때 시작)
+        self.export_dropped = 0
+        self._export_queue: queue.Queue[Trace | None] = queue.Queue(maxsize=export_queue_size)
+        self._exporter: threading.Thread | None = None
+
+    def start_trace(self, name: str, trace_id: str | None = None, **attributes) -> Span | _NoopSpan:
+        """새 트레이스의 루트 스팬 시작 (진행 중에도 get()으로 조회 가능)"""
+        if not self.enabled:
+            return NOOP_SPAN
+        trace = Trace(self, trace_id or new_trace_id(), self.max_spans)
+        with self._lock:
+            self._traces[trace.trace_id] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return trace.start_span(name, None, attributes)
+
+    def get(self, trace_id: str) -> dict | None:
+        with self._lock:
+            trace = self._traces.get(trace_id)
+        return trace.to_dict() if trace else None
+
+    def finish(self, trace: Trace) -> None:
+        """루트 스팬 종료 시 호출 - 내보내기 경로가 있으면 쓰기 스레드에 넘김 (블로킹 I/O 없음)"""
+        if self.export_path is None:
+            return
+        with self._lock:
+            if self._exporter is None:
+                self._exporter = threading.Thread(target=self._export_loop, name="trace-export", daemon=True)
+                self._exporter.start()
+        try:
+            self._export_queue.put_nowait(trace)
+        except queue.Full:
+            self.export_dropped += 1
+
+    def flush(self) -> None:
+        """대기 중인 트레이스를 모두 파일에 쓸 때까지 대기"""
+        if self._exporter is not None:
+            self._export_queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 트레이스를 쓰고 쓰기 스레드 종료"""
+        exporter = self._exporter
+        if exporter is None:
+            return
+        try:
+            self._export_queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        exporter.join(timeout)
+        self._exporter = None
+
+    def _export_loop(self) -> None:
+        """쓰기 스레드 - 쌓인 트레이스를 묶어 한 번에 추가 (묶음마다 파일을 다시 열어 회전 허용)"""
+        while True:
+            batch = [self._export_queue.get()]
+            while True:
+                try:
+                    batch.append(self._export_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                lines = [
+                    json.dumps(trace.to_otlp(self.service_name), ensure_ascii=False)
+                    for trace in batch if trace is not None
+                ]
+                if lines:
+                    self.export_path.parent.mkdir(parents=True, exist_ok=True)
+                    with self.export_path.open("a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+            except Exception as e:
+                logger.error(f"Trace export failed ({len(batch)} traces): {e}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._export_queue.task_done()
+            if None in batch:
+                return
+
+
+def span(name: str, **attributes) -> Span | _NoopSpan:
+    """현재 스팬의 자식 스팬 (with 문으로 사용, 활성 스팬이 없으면 no-op)"""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return parent.child(name, **attributes)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def _otlp_span(span: Span) -> dict:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or time.time_ns()),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+def _otlp_attributes(attributes: dict) -> list:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
@@ -0,0 +1,92 @@
+"""AI Doctor Agent - Token Usage Accounting
+
+LLM 호출별 토큰 사용량(프롬프트/캐시/완료)을 기록하고,
+프롬프트 캐시 재사용률과 절감 비용을 계산한다.
+"""
+
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass
+class TokenPricing:
+    """토큰 단가 (USD / 1M 토큰)"""
+    input: float = 2.50
+    cached_input: float = 1.25
+    output: float = 10.00
+
+
+@dataclass
+class IterationUsage:
+    """LLM 호출 1회의 토큰 사용량"""
+    iteration: int
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+
+
+@dataclass
+class UsageTracker:
+    """요청(상담) 단위 토큰 사용량 누적"""
+    pricing: TokenPricing = field(default_factory=TokenPricing)
+    iterations: list[IterationUsage] = field(default_factory=list)
+
+    def record(self, iteration: int, usage) -> IterationUsage:
+        """API 응답의 usage 객체 기록 (usage가 없으면 0으로 기록)"""
+        entry = IterationUsage(iteration=iteration)
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            entry.prompt_tokens = usage.prompt_tokens or 0
+            entry.cached_tokens = getattr(details, "cached_tokens", None) or 0
+            entry.completion_tokens = usage.completion_tokens or 0
+        self.iterations.append(entry)
+        return entry
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(entry.prompt_tokens for entry in self.iterations)
+
+    @property
+    def cached_tokens(self) -> int:
+        return sum(entry.cached_tokens for entry in self.iterations)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(entry.completion_tokens for entry in self.iterations)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """프롬프트 토큰 중 캐시에서 재사용된 비율"""
+        prompt_tokens = self.prompt_tokens
+        return self.cached_tokens / prompt_tokens if prompt_tokens else 0.0
+
+    @property
+    def cost(self) -> float:
+        """실제 비용 (USD) - 캐시 토큰은 할인 단가 적용"""
+        uncached = self.prompt_tokens - self.cached_tokens
+        return (
+            uncached * self.pricing.input
+            + self.cached_tokens * self.pricing.cached_input
+            + self.completion_tokens * self.pricing.output
+        ) / 1_000_000
+
+    @property
+    def savings(self) -> float:
+        """프롬프트 캐시로 절감된 비용 (USD)"""
+        return self.cached_tokens * (self.pricing.input - self.pricing.cached_input) / 1_000_000
+
+    def summary(self) -> dict:
+        """이벤트/로그용 요약"""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 4),
+            "cost_usd": round(self.cost, 6),
+            "saved_usd": round(self.savings, 6),
+            "iterations": [asdict(entry) for entry in self.iterations],
+        }
@@ -0,0 +1,4 @@
+"""AI Doctor Agent - Benchmarks
+
+부하 테스트/마이크로벤치마크 (pytest 대상 아님, 직접 실행).
+"""
@@ -0,0 +1,265 @@
+"""/api/chat 엔드투엔드 부하 테스트
+
+uvicorn 워커 1개를 로컬 대체 LLM(LLM_BACKEND=scripted)과 로컬 RxNorm 스텁으로
+실행하고, 동시성 단계별로 상담 요청을 보내 다음을 측정한다.
+
+- 처리량 (완료 상담/초)
+- 첫 이벤트까지 시간 (time-to-first-event)
+- 최종 응답까지 시간 (time-to-final-response) p50/p95/p99
+- 서버 이벤트 루프 지연
+
+결과는 JSON 파일로 저장되어 커밋 간 비교할 수 있다.
+
+    python -m benchmarks.load_test --concurrency 1,8,32 --requests 64
+    python -m benchmarks.load_test --compare benchmarks/results/load-abc1234-....json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.rxnorm_stub import RxNormStub
+from benchmarks.stats import environment, summarize, write_results
+
+BASE_DIR = Path(__file__).parent.parent
+
+MESSAGES = [
+    ("허리가 아프고 다리가 저려요", "P001"),
+    ("두통이 3일째 계속돼요", "P002"),
+    ("무릎이 붓고 계단을 오를 때 아파요", "P001"),
+    ("어깨가 결리고 팔을 올리기 힘들어요", "P002"),
+]
+
+
+async def consult(client: httpx.AsyncClient, index: int, unique: bool) -> dict:
+    """상담 1건 - 이벤트 도착 시각 측정"""
+    message, patient_id = MESSAGES[index % len(MESSAGES)]
+    if unique:
+        message = f"{message} (#{index})"
+
+    sample = {"ok": False, "status": None, "ttfe": None, "ttfr": None, "total": None}
+    started = time.perf_counter()
+    try:
+        async with client.stream("POST", "/api/chat", json={"message": message, "patient_id": patient_id}) as response:
+            sample["status"] = response.status_code
+            if response.status_code != 200:
+                await response.aread()
+                return sample
+
+            error = False
+            async for line in response.aiter_lines():
+                # SSE: "data: {...}" 줄만 이벤트, 빈 줄(프레임 구분)과 ": ping" heartbeat는 무시
+                if not line.startswith("data:"):
+                    continue
+                now = time.perf_counter() - started
+                if sample["ttfe"] is None:
+                    sample["ttfe"] = now
+                event = json.loads(line[5:])
+                if event["type"] == "response":
+                    sample["ttfr"] = now
+                    error = error or event["data"].get("partial", False)
+                elif event["type"] == "log" and event["data"].get("step") == "error":
+                    error = True
+            sample["ok"] = sample["ttfr"] is not None and not error
+    except httpx.HTTPError as e:
+        sample["status"] = type(e).__name__
+    sample["total"] = time.perf_counter() - started
+    return sample
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, requests: int, unique: bool) -> dict:
+    """동시성 단계 1개 실행 - concurrency개의 가상 사용자가 requests건을 나눠 요청"""
+    await _loop_lag(client, reset=True)
+
+    pending = iter(range(requests))
+    samples = []
+
+    async def user():
+        for index in pending:
+            samples.append(await consult(client, index, unique))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    completed = [s for s in samples if s["ok"]]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "completed": len(completed),
+        "rejected": sum(1 for s in samples if s["status"] == 429),
+        "errors": sum(1 for s in samples if not s["ok"] and s["status"] != 429),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(completed) / duration, 2) if duration else 0.0,
+        "time_to_first_event_ms": summarize([s["ttfe"] for s in completed], scale=1000),
+        "time_to_final_response_ms": summarize([s["ttfr"] for s in completed], scale=1000),
+        "total_ms": summarize([s["total"] for s in completed], scale=1000),
+        "loop_lag_ms": await _loop_lag(client, reset=True),
+    }
+
+
+async def _loop_lag(client: httpx.AsyncClient, reset: bool) -> dict | None:
+    """서버 이벤트 루프 지연 (benchmarks.serve로 실행한 서버에서만 제공)"""
+    try:
+        response = await client.get("/bench/loop-lag", params={"reset": reset})
+    except httpx.HTTPError:
+        return None
+    return response.json() if response.status_code == 200 else None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, rxnorm_url: str) -> tuple[subprocess.Popen, str]:
+    """대체 LLM/RxNorm 스텁을 사용하는 서버 프로세스 실행"""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "sk-bench",
+        "LLM_BACKEND": "scripted",
+        "SCRIPTED_LLM_LATENCY": str(args.llm_latency),
+        "SCRIPTED_LLM_CHUNK_DELAY": str(args.llm_chunk_delay),
+        "SCRIPTED_LLM_MEDICATIONS": "true",
+        "RXNORM_BASE_URL": rxnorm_url,
+        "STREAM_PACING": "fast",
+        "RESPONSE_CACHE_ENABLED": "false",
+        "TOOL_CACHE_ENABLED": str(not args.no_tool_cache).lower(),
+        "CHAT_MAX_CONCURRENT": str(args.max_concurrent or max(args.concurrency)),
+        "CHAT_MAX_QUEUE": str(max(args.concurrency)),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.serve", "--port", str(port)],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def run(args) -> dict:
+    stub = server = None
+    base_url = args.url
+    if base_url is None:
+        stub = RxNormStub(latency=args.rxnorm_latency).start()
+        server, base_url = start_server(args, stub.base_url)
+
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 8, max_keepalive_connections=max(args.concurrency) + 8)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            await wait_ready(client)
+            for index in range(args.warmup):
+                await consult(client, index, unique=False)
+
+            levels = []
+            for concurrency in args.concurrency:
+                level = await run_level(client, concurrency, args.requests, args.unique)
+                levels.append(level)
+                _print_level(level)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        if stub is not None:
+            stub.stop()
+
+    return {
+        "benchmark": "load",
+        "environment": environment(),
+        "settings": {
+            "url": args.url or "local",
+            "requests_per_level": args.requests,
+            "llm_latency_s": args.llm_latency,
+            "llm_chunk_delay_s": args.llm_chunk_delay,
+            "rxnorm_latency_s": args.rxnorm_latency,
+            "tool_cache": not args.no_tool_cache,
+            "unique_messages": args.unique,
+        },
+        "levels": levels,
+    }
+
+
+def _print_level(level: dict) -> None:
+    ttfr = level["time_to_final_response_ms"]
+    ttfe = level["time_to_first_event_ms"]
+    lag = level["loop_lag_ms"] or {}
+    print(
+        f"c={level['concurrency']:<4} ok={level['completed']}/{level['requests']} "
+        f"rps={level['throughput_rps']:<8} "
+        f"ttfe p50={ttfe.get('p50', '-')}ms "
+        f"ttfr p50={ttfr.get('p50', '-')} p95={ttfr.get('p95', '-')} p99={ttfr.get('p99', '-')}ms "
+        f"lag p99={lag.get('p99', '-')}ms max={lag.get('max', '-')}ms"
+    )
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    """이전 결과 대비 변화율 출력"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    print(f"\nvs {baseline['environment']['commit']} ({baseline_path})")
+    for level in current["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+        print(
+            f"c={level['concurrency']:<4} "
+            f"rps {_delta(before['throughput_rps'], level['throughput_rps'])} "
+            f"ttfr p50 {_delta(before['time_to_final_response_ms'].get('p50'), level['time_to_final_response_ms'].get('p50'))} "
+            f"p99 {_delta(before['time_to_final_response_ms'].get('p99'), level['time_to_final_response_ms'].get('p99'))}"
+        )
+
+
+def _delta(before, after) -> str:
+    if not before or after is None:
+        return f"{before} -> {after}"
+    return f"{before} -> {after} ({(after - before) / before:+.1%})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test for /api/chat")
+    parser.add_argument("--concurrency", type=lambda v: [int(x) for x in v.split(",")], default=[1, 8, 32],
+                        help="comma-separated concurrency levels (default: 1,8,32)")
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=4, help="unrecorded warm-up requests")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="scripted LLM latency per call (seconds)")
+    parser.add_argument("--llm-chunk-delay", type=float, default=0.0, help="scripted LLM delay between chunks")
+    parser.add_argument("--rxnorm-latency", type=float, default=0.02, help="RxNorm stub latency per request")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="server CHAT_MAX_CONCURRENT (default: highest concurrency level)")
+    parser.add_argument("--no-tool-cache", action="store_true", help="disable tool result memoization")
+    parser.add_argument("--unique", action="store_true", help="make every message unique (defeats tool caches)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request client timeout")
+    parser.add_argument("--url", default=None, help="target an already running server instead of starting one")
+    parser.add_argument("--output", default=None, help="result JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="previous result JSON to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    path = write_results("load", results, args.output)
+    print(f"\nresults: {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""핫 경로 마이크로벤치마크
+
+도구 결과 마크다운 렌더링(ToolRegistry), 스킬 탐색/본문 로드(SkillLoader),
+목업 데이터 키워드 매칭(MockDataSource), 이벤트 JSON 인코딩(_log_event, backend.events)의
+호출당 비용을 합성 입력 규모별로 측정한다.
+
+- ops/sec: 반복 측정의 중앙값 (GC 비활성화 상태), 편차(%)를 함께 기록
+- 할당: tracemalloc으로 측정한 호출 1회의 최대 임시 할당량(peak)과
+  반복 호출 후 남은 순증가량(retained)
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter skill --compare benchmarks/results/micro-....json
+"""
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.stats import environment, write_results
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("LLM_BACKEND", "scripted")
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> dict:
+    """fn 호출당 시간/할당 측정"""
+    # 1회 실행 시간이 min_time 근처가 되도록 반복 횟수 보정
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 4 or number >= 1 << 24:
+            break
+        number *= 4
+    number = max(1, int(number * (min_time / max(elapsed, 1e-9))))
+
+    per_op = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            per_op.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    median = statistics.median(per_op)
+    spread = statistics.pstdev(per_op) / median * 100 if median else 0.0
+    return {
+        "ops_per_sec": round(1 / median, 1) if median else 0.0,
+        "ns_per_op": round(median * 1e9, 1),
+        "spread_pct": round(spread, 2),
+        "iterations": number * repeat,
+        **_allocations(fn, min(number, 200)),
+    }
+
+
+def _allocations(fn: Callable[[], object], number: int) -> dict:
+    """호출 1회 peak 할당 / number회 호출 후 호출당 순증가"""
+    fn()  # 지연 초기화 제외
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            fn()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_per_op": max(0, peak - baseline),
+        "retained_bytes_per_op": round(max(0, after - before) / number, 1),
+    }
+
+
+# === 합성 입력 ===
+
+def make_skills_dir(root: Path, count: int, body_chars: int = 4000) -> Path:
+    """SKILL.md count개 생성 (frontmatter + body_chars 길이 본문)"""
+    skills_dir = root / f"skills-{count}"
+    body = ("## 지침\n" + "증상을 확인하고 필요한 도구를 호출합니다.\n" * (body_chars // 24))[:body_chars]
+    for i in range(count):
+        skill_dir = skills_dir / f"skill-{i:05d}"
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: skill-{i:05d}\ndescription: 합성 스킬 {i} - 벤치마크용 설명 문장\n"
+            f"allowed-tools: analyze_symptoms assess_severity\n---\n\n# Skill {i}\n\n{body}\n",
+            encoding="utf-8",
+        )
+    return skills_dir
+
+
+def make_data_source(keywords: int):
+    """증상 키워드 수를 늘린 MockDataSource (원래 키워드는 맨 뒤로 - 최악의 매칭 순서)"""
+    from data import MockDataSource
+
+    source = MockDataSource()
+    synthetic = {
+        f"합성증상{i:05d}": {
+            "analysis": f"합성 증상 {i} 분석",
+            "related_symptoms": ["피로"],
+            "red_flags": [],
+            "possible_diagnoses": [f"합성 질환 {i}"],
+        }
+        for i in range(keywords)
+    }
+    source.symptom_analysis = {**synthetic, **source.symptom_analysis}
+    return source
+
+
+def long_text(chars: int) -> str:
+    line = "| 항목 | 소견 | 비고 |\n"
+    return (line * (chars // len(line) + 1))[:chars]
+
+
+# === 벤치마크 ===
+
+def bench_tool_rendering(scale: dict) -> list:
+    from backend.config import config
+    from backend.skill_loader import SkillLoader
+    from backend.tools.registry import ToolRegistry
+    from data import MockDataSource
+
+    registry = ToolRegistry(MockDataSource(), SkillLoader(config.skills_dir), cache_policies={})
+    calls = {
+        "analyze_symptoms": {"symptoms": "허리 통증과 다리 저림", "pain_scale": 6, "duration": "2주", "pain_type": "radiating"},
+        "analyze_mri": {"body_part": "spine"},
+        "assess_severity": {"diagnosis": "요추 추간판 탈출증", "imaging_summary": "L4-5 탈출"},
+        "recommend_treatment": {"diagnosis": "요추 추간판 탈출증", "severity": "moderate"},
+        "get_surgery_options": {"diagnosis": "요추 추간판 탈출증"},
+        "read_skill": {"skill_name": "symptom-analysis"},
+    }
+    return [
+        ("tool_render", {"tool": name}, lambda name=name, args=args: registry.execute(name, args))
+        for name, args in calls.items()
+    ]
+
+
+def bench_skill_loader(scale: dict) -> list:
+    from backend.skill_loader import SkillLoader
+
+    cases = []
+    root = Path(tempfile.mkdtemp(prefix="bench-skills-"))
+    atexit.register(shutil.rmtree, root, True)
+    for count in scale["skills"]:
+        loader = SkillLoader(make_skills_dir(root, count))
+        name = next(reversed(loader.skills))
+
+        def cold_content(loader=loader, name=name):
+            loader.skills[name].content = None
+            return loader.get_skill_content(name)
+
+        cases += [
+            ("skill_discover", {"skills": count}, loader._discover),
+            ("skill_content_cold", {"skills": count}, cold_content),
+            ("skill_content_warm", {"skills": count}, lambda loader=loader, name=name: loader.get_skill_content(name)),
+            ("skills_xml", {"skills": count}, loader.generate_available_skills_xml),
+        ]
+    return cases
+
+
+def bench_data_lookup(scale: dict) -> list:
+    cases = []
+    for keywords in scale["keywords"]:
+        source = make_data_source(keywords)
+        cases += [
+            ("symptom_match_hit", {"keywords": keywords}, lambda s=source: s.analyze_symptoms("무릎 통증")),
+            ("symptom_match_miss", {"keywords": keywords}, lambda s=source: s.analyze_symptoms("알 수 없는 증상")),
+            ("treatment_lookup", {"keywords": keywords},
+             lambda s=source: s.recommend_treatment("요추 추간판 탈출증", "moderate")),
+        ]
+    return cases
+
+
+def bench_event_encoding(scale: dict) -> list:
+    from backend import events, main
+
+    cases = []
+    for chars in scale["output_chars"]:
+        output = long_text(chars)
+        cases += [
+            ("log_event_tool_result", {"output_chars": chars},
+             lambda output=output: main._log_event("tool_result", "✅ analyze_mri 완료", tool="analyze_mri",
+                                                   result=output[:300] if len(output) > 300 else output)),
+            ("log_event_full_payload", {"output_chars": chars},
+             lambda output=output: main._log_event("tool_result", "✅ analyze_mri 완료", result=output)),
+            ("response_event", {"output_chars": chars}, lambda output=output: main._response_event(output)),
+        ]
+    cases.append(("response_delta_event", {}, lambda: main._response_delta_event("요추 염", 3)))
+
+    # 고정 이벤트: 매번 인코딩 vs static_event 캐시, JSON 백엔드 비교, SSE 프레이밍
+    static = {"step": "skills_loaded", "message": "📚 Skills loaded", "description": "사용 가능한 스킬 목록"}
+    payload = {"type": "log", "data": {"step": "tool_result", "message": "✅ analyze_mri 완료",
+                                       "result": long_text(scale["output_chars"][0])}}
+    line = events.encode_event("log", static)
+    cases += [
+        ("static_event_encode", {}, lambda: events.encode_event("log", static)),
+        ("static_event_cached", {}, lambda: events.static_event("log", **static)),
+        (f"dumps_{events.JSON_BACKEND}", {"output_chars": scale["output_chars"][0]}, lambda: events.dumps(payload)),
+        ("dumps_json", {"output_chars": scale["output_chars"][0]},
+         lambda: json.dumps(payload, ensure_ascii=False, separators=(",", ":"))),
+        ("sse_frame", {}, lambda: events.sse_frame(line)),
+    ]
+    return cases
+
+
+BENCHMARKS = {
+    "tool_rendering": bench_tool_rendering,
+    "skill_loader": bench_skill_loader,
+    "data_lookup": bench_data_lookup,
+    "event_encoding": bench_event_encoding,
+}
+
+SCALES = {
+    "quick": {"skills": [10, 500], "keywords": [10, 1000], "output_chars": [1_000, 64_000]},
+    "full": {"skills": [10, 1000, 5000], "keywords": [10, 1000, 10000], "output_chars": [1_000, 32_000, 256_000]},
+}
+
+
+def run(args) -> dict:
+    scale = SCALES[args.scale]
+    results = []
+    for group, build in BENCHMARKS.items():
+        for name, params, fn in build(scale):
+            label = f"{group}.{name}"
+            if args.filter and args.filter not in label:
+                continue
+            result = {"group": group, "name": name, "params": params,
+                      **measure(fn, min_time=args.min_time, repeat=args.repeat)}
+            results.append(result)
+            _print_result(result)
+
+    return {
+        "benchmark": "micro",
+        "environment": environment(),
+        "settings": {"scale": args.scale, "min_time_s": args.min_time, "repeat": args.repeat},
+        "results": results,
+    }
+
+
+def _label(result: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in result["params"].items())
+    return f"{result['group']}.{result['name']}" + (f"[{params}]" if params else "")
+
+
+def _print_result(result: dict) -> None:
+    print(
+        f"{_label(result):<60} {result['ops_per_sec']:>14,.0f} ops/s "
+        f"{result['ns_per_op']:>14,.0f} ns ±{result['spread_pct']:.1f}% "
+        f"peak {result['peak_bytes_per_op']:>10,} B  retained {result['retained_bytes_per_op']:>8,.0f} B"
+    )
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    """이전 결과 대비 ops/sec 변화율 출력"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {_label(r): r for r in baseline["results"]}
+    print(f"\nvs {baseline['environment']['commit']} ({baseline_path})")
+    for result in current["results"]:
+        before = previous.get(_label(result))
+        if before and before["ops_per_sec"]:
+            change = (result["ops_per_sec"] - before["ops_per_sec"]) / before["ops_per_sec"]
+            print(f"{_label(result):<60} {before['ops_per_sec']:>14,.0f} -> {result['ops_per_sec']:>14,.0f} ({change:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for agent hot paths")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="full", help="synthetic input sizes")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose group.name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="target seconds per repeat")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats (median is reported)")
+    parser.add_argument("--output", default=None, help="result JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="previous result JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args)
+    path = write_results("micro", results, args.output)
+    print(f"\nresults: {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""로컬 RxNorm REST 스텁 서버
+
+부하 테스트에서 실제 RxNav 대신 사용한다. RxNormAPI가 사용하는 엔드포인트를
+결정적인 응답과 설정 가능한 지연으로 흉내낸다.
+
+    python -m benchmarks.rxnorm_stub --port 8765 --latency 0.05
+    RXNORM_BASE_URL=http://127.0.0.1:8765/REST python run.py
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _rxcui(name: str, index: int) -> str:
+    """이름 기반 결정적 RxCUI"""
+    digest = hashlib.sha256(f"{name}:{index}".encode("utf-8")).hexdigest()
+    return str(int(digest[:8], 16) % 2_000_000)
+
+
+def drugs(name: str) -> dict:
+    concepts = [
+        {"rxcui": _rxcui(name, i), "name": f"{name} {dose} MG Oral Tablet", "synonym": "", "tty": "SCD"}
+        for i, dose in enumerate((200, 400, 800))
+    ]
+    return {"drugGroup": {"name": name, "conceptGroup": [{"tty": "SCD", "conceptProperties": concepts}]}}
+
+
+def properties(rxcui: str) -> dict:
+    return {"properties": {"rxcui": rxcui, "name": f"drug {rxcui}", "synonym": "", "tty": "SCD"}}
+
+
+def interactions(rxcui: str) -> dict:
+    pairs = [
+        {
+            "interactionConcept": [
+                {"minConceptItem": {"rxcui": rxcui, "name": f"drug {rxcui}"}},
+                {"minConceptItem": {"rxcui": str(i), "name": other}},
+            ],
+            "severity": "N/A",
+            "description": f"drug {rxcui} may interact with {other}.",
+        }
+        for i, other in enumerate(("warfarin", "lithium"))
+    ]
+    return {"interactionTypeGroup": [{"interactionType": [{"interactionPair": pairs}]}]}
+
+
+def related(rxcui: str, tty: str) -> dict:
+    concepts = [{"rxcui": _rxcui(rxcui, i), "name": f"related {rxcui}-{i}", "tty": tty} for i in range(2)]
+    return {"relatedGroup": {"conceptGroup": [{"tty": tty, "conceptProperties": concepts}]}}
+
+
+class RxNormStub:
+    """백그라운드 스레드에서 실행되는 스텁 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/REST"
+
+    def start(self) -> "RxNormStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="rxnorm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, path: str, query: dict) -> dict | None:
+        """요청 경로 → 응답 JSON (없으면 None)"""
+        parts = path.strip("/").split("/")
+        if parts[:1] != ["REST"]:
+            return None
+        parts = parts[1:]
+        if parts == ["drugs.json"]:
+            return drugs(query.get("name", [""])[0])
+        if parts == ["interaction", "interaction.json"]:
+            return interactions(query.get("rxcui", [""])[0])
+        if len(parts) == 3 and parts[0] == "rxcui" and parts[2] == "properties.json":
+            return properties(parts[1])
+        if len(parts) == 3 and parts[0] == "rxcui" and parts[2] == "related.json":
+            return related(parts[1], query.get("tty", ["SCD"])[0])
+        return None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency > 0:
+                    time.sleep(stub.latency)
+
+                url = urlparse(self.path)
+                payload = stub.route(url.path, parse_qs(url.query))
+                body = json.dumps(payload if payload is not None else {"error": "not found"}).encode("utf-8")
+                self.send_response(200 if payload is not None else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local RxNorm REST stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="per-request latency (seconds)")
+    args = parser.parse_args()
+
+    stub = RxNormStub(args.host, args.port, args.latency)
+    print(f"RxNorm stub listening on {stub.base_url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
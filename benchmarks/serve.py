@@ -0,0 +1,66 @@
+"""부하 테스트용 서버 실행 (uvicorn 워커 1개 + 이벤트 루프 지연 측정)
+
+load_test.py가 서브프로세스로 실행한다. 앱에 벤치마크 전용 엔드포인트
+/bench/loop-lag 를 추가하여 측정 구간의 이벤트 루프 지연을 조회/초기화한다.
+
+    LLM_BACKEND=scripted python -m benchmarks.serve --port 8100
+"""
+
+import argparse
+import asyncio
+
+import uvicorn
+
+from benchmarks.stats import summarize
+
+
+class LoopLagMonitor:
+    """interval마다 깨어나 예정 시각 대비 지연을 기록"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def snapshot(self, reset: bool = False) -> dict:
+        summary = summarize(self.samples, scale=1000)
+        if reset:
+            self.samples = []
+        return summary
+
+
+async def serve(host: str, port: int, interval: float) -> None:
+    from backend.main import app
+
+    monitor = LoopLagMonitor(interval)
+
+    @app.get("/bench/loop-lag", include_in_schema=False)
+    async def loop_lag(reset: bool = False):
+        return monitor.snapshot(reset)
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    task = asyncio.create_task(monitor.run())
+    try:
+        await server.serve()
+    finally:
+        task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark server with event-loop lag probe")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--lag-interval", type=float, default=0.01, help="loop lag probe interval (seconds)")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.port, args.lag_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures"""
 
+import os
 import sys
 from pathlib import Path
 
@@ -10,12 +11,25 @@ from fastapi.testclient import TestClient
 ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
-from backend.main import app
+# 클라이언트 초기화용 더미 키 (실제 API 호출은 테스트에서 대체)
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+# 테스트가 로컬 RxNorm 디스크 캐시를 읽거나 쓰지 않도록 비활성화
+os.environ.setdefault("RXNORM_CACHE_ENABLED", "false")
+
+from backend.main import app, tool_registry
 from backend.skill_loader import SkillLoader
 from backend.config import config
+from benchmarks.rxnorm_stub import RxNormStub
 from data.mock_data import MockDataSource
 
 
+@pytest.fixture(autouse=True)
+def clear_tool_cache():
+    """테스트 간 도구 결과 캐시 격리"""
+    tool_registry.clear_cache()
+    yield
+
+
 @pytest.fixture
 def client():
     """FastAPI TestClient fixture"""
@@ -34,6 +48,14 @@ def mock_data():
     return MockDataSource()
 
 
+@pytest.fixture
+def stub():
+    """로컬 RxNav 스텁 서버 (benchmarks.rxnorm_stub)"""
+    stub = RxNormStub().start()
+    yield stub
+    stub.stop()
+
+
 @pytest.fixture
 def sample_symptoms():
     """샘플 증상 데이터"""
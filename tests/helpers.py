@@ -0,0 +1,15 @@
+"""테스트 공용 헬퍼 - 상담 이벤트 수집"""
+
+import json
+
+from backend import main
+
+
+async def consultation_events(message="허리가 아파요", patient_id="P002") -> list:
+    """process_chat 이벤트를 dict 목록으로 수집"""
+    return [json.loads(line) async for line in main.process_chat(message, patient_id)]
+
+
+def tool_names(events: list) -> list:
+    """호출된 도구 이름 (스킬 로드 포함, 호출 순서)"""
+    return [e["data"]["tool"] for e in events if e["type"] == "log" and e["data"]["step"] in ("activation", "tool_call")]
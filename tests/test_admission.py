@@ -0,0 +1,203 @@
+"""동시 상담 제한 (AdmissionController) 테스트"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.admission import AdmissionController, AdmissionTimeout, QueueFullError
+from tests.test_chat_stream import FINAL_ANSWER, StubClient, use_stub_llm
+
+
+async def _positions(controller: AdmissionController) -> list[int]:
+    """reserve() 후 슬롯을 얻을 때까지 전달된 대기열 위치 목록"""
+    return [position async for position in controller.reserve().wait()]
+
+
+class TestAdmissionController:
+    """동시 실행 제한 + 대기열 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_admits_immediately_under_limit(self):
+        """제한 이하에서는 대기 없이 바로 실행"""
+        controller = AdmissionController(max_concurrent=2, max_queue=1)
+
+        assert await _positions(controller) == []
+        assert await _positions(controller) == []
+        assert controller.active == 2
+
+        controller.release()
+        assert controller.active == 1
+
+    @pytest.mark.asyncio
+    async def test_waiters_admitted_in_fifo_order(self):
+        """슬롯 반환 시 가장 오래 기다린 요청부터 실행"""
+        controller = AdmissionController(max_concurrent=1, max_queue=4, position_update_interval=0.01)
+        await _positions(controller)
+
+        admitted = []
+
+        async def wait(name):
+            positions = await _positions(controller)
+            admitted.append((name, positions[0]))
+
+        tasks = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+        await asyncio.sleep(0.05)
+        assert controller.queue_depth == 2
+
+        controller.release()
+        await asyncio.sleep(0.05)
+        controller.release()
+        await asyncio.gather(*tasks)
+
+        assert admitted == [("a", 1), ("b", 2)]
+        assert controller.active == 1
+        assert controller.stats()["admitted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_position_updates_while_waiting(self):
+        """앞 요청이 빠지면 줄어든 대기열 위치를 다시 전달"""
+        controller = AdmissionController(max_concurrent=1, max_queue=4, position_update_interval=0.01)
+        await _positions(controller)
+
+        first = asyncio.create_task(_positions(controller))
+        await asyncio.sleep(0.02)
+        second = asyncio.create_task(_positions(controller))
+        await asyncio.sleep(0.02)
+
+        controller.release()
+        assert await first == [1]
+        await asyncio.sleep(0.05)
+        controller.release()
+        assert await second == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejected(self):
+        """대기열이 가득 차면 즉시 거절"""
+        controller = AdmissionController(max_concurrent=1, max_queue=0, retry_after=7)
+        await _positions(controller)
+
+        with pytest.raises(QueueFullError) as excinfo:
+            await _positions(controller)
+        assert excinfo.value.retry_after == 7
+        assert controller.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """대기 시간 초과 시 대기열에서 제거"""
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05,
+                                         position_update_interval=0.01)
+        await _positions(controller)
+
+        with pytest.raises(AdmissionTimeout):
+            await _positions(controller)
+        assert controller.queue_depth == 0
+        assert controller.stats()["timed_out"] == 1
+
+        controller.release()
+        assert controller.active == 0
+
+    @pytest.mark.asyncio
+    async def test_reserve_claims_slot_immediately(self):
+        """reserve()는 await 없이 슬롯/대기열 자리를 바로 차지하고 release()는 한 번만 반영"""
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        slot = controller.reserve()
+        queued = controller.reserve()
+
+        assert (controller.active, controller.queue_depth) == (1, 1)
+        with pytest.raises(QueueFullError):
+            controller.reserve()
+
+        queued.release()
+        queued.release()
+        assert controller.queue_depth == 0
+        slot.release()
+        slot.release()
+        assert controller.active == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """대기 중 취소된 요청은 슬롯을 차지하지 않음"""
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        await _positions(controller)
+
+        waiter = asyncio.create_task(_positions(controller))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert controller.queue_depth == 0
+        controller.release()
+        assert controller.active == 0
+
+
+class TestAdmittedChat:
+    """/api/chat 동시 상담 제한 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_queued_event_then_consultation(self, monkeypatch):
+        """대기 중 queued 이벤트 후 슬롯을 얻으면 상담 진행, 종료 시 슬롯 반환"""
+        controller = AdmissionController(max_concurrent=1, max_queue=1, position_update_interval=0.01)
+        monkeypatch.setattr(main, "admission", controller)
+        use_stub_llm(monkeypatch, StubClient())
+        await _positions(controller)
+
+        async def collect():
+            return [json.loads(line) async for line in main.admit(main.process_chat("허리가 아파요"))]
+
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0.05)
+        controller.release()
+        events = await task
+
+        assert events[0] == {"type": "queued", "data": {"position": 1, "active": 1, "queue_depth": 1}}
+        assert events[-2] == {"type": "response", "data": {"content": FINAL_ANSWER}}
+        assert controller.active == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_ends_stream(self, monkeypatch):
+        """대기 시간 초과 시 상담 없이 안내 응답으로 종료"""
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05,
+                                         position_update_interval=0.01)
+        client = StubClient()
+        monkeypatch.setattr(main, "admission", controller)
+        use_stub_llm(monkeypatch, client)
+        await _positions(controller)
+
+        events = [json.loads(line) async for line in main.admit(main.process_chat("허리가 아파요"))]
+
+        assert [e["type"] for e in events] == ["queued", "log", "response"]
+        assert events[1]["data"]["step"] == "error"
+        assert client.completions.calls == []
+        assert controller.active == 1
+
+    @pytest.mark.asyncio
+    async def test_last_slot_reserved_before_stream_starts(self, monkeypatch):
+        """응답 생성 시점에 자리를 확보하므로 스트림 시작 전 두 번째 요청은 200이 아닌 429"""
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        monkeypatch.setattr(main, "admission", controller)
+        http_request = Request({"type": "http", "method": "POST", "path": "/api/chat", "headers": []})
+
+        first = await main.chat(main.ChatRequest(message="허리가 아파요"), http_request)
+        assert controller.active == 1
+        with pytest.raises(HTTPException) as excinfo:
+            await main.chat(main.ChatRequest(message="무릎이 아파요"), http_request)
+        assert excinfo.value.status_code == 429
+
+        first.reservation.release()
+        assert controller.active == 0
+
+    def test_rejects_with_429_when_queue_full(self, monkeypatch):
+        """대기열이 가득 차면 스트림을 열지 않고 429 + Retry-After"""
+        controller = AdmissionController(max_concurrent=0, max_queue=0, retry_after=3)
+        monkeypatch.setattr(main, "admission", controller)
+
+        response = TestClient(main.app).post("/api/chat", json={"message": "허리가 아파요"})
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+        assert TestClient(main.app).get("/api/admission/stats").json()["rejected"] == 1
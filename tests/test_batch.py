@@ -0,0 +1,147 @@
+"""배치 상담 (/api/chat/batch) 테스트"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.admission import AdmissionController
+from backend.config import config
+from tests.test_chat_stream import FINAL_ANSWER, StubClient, use_stub_llm
+
+
+def _cases(count: int) -> list:
+    return [main.ChatRequest(message=f"허리가 아파요 {i}", patient_id=f"P{i:03d}") for i in range(count)]
+
+
+async def _results(requests: list, parallelism: int) -> list:
+    return [json.loads(line) async for line in main.process_batch(requests, parallelism)]
+
+
+class TestProcessBatch:
+    """process_batch 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_runs_cases_in_parallel(self, monkeypatch):
+        """parallelism만큼 동시에 실행되어 전체 시간이 케이스 수에 비례하지 않음"""
+        delay = 0.2
+        use_stub_llm(monkeypatch, StubClient(delay=delay))
+
+        started = time.perf_counter()
+        results = await _results(_cases(6), parallelism=3)
+        elapsed = time.perf_counter() - started
+
+        assert sorted(r["index"] for r in results) == list(range(6))
+        assert elapsed < delay * 6 * 0.75
+        for r in results:
+            assert r["status"] == "ok"
+            assert r["content"] == FINAL_ANSWER
+            assert r["patient_id"] == f"P{r['index']:03d}"
+            assert r["iterations"] == 1
+            assert r["elapsed_ms"] >= delay * 1000 * 0.9
+            assert r["usage"]["total_tokens"] == 1250
+
+    @pytest.mark.asyncio
+    async def test_parallelism_cap(self, monkeypatch):
+        """동시에 진행 중인 LLM 호출 수가 parallelism을 넘지 않음"""
+        client = StubClient(delay=0.05)
+        in_flight, peak = 0, 0
+        create = client.completions.create
+
+        async def counting_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await create(**kwargs)
+            finally:
+                in_flight -= 1
+
+        client.completions.create = counting_create
+        use_stub_llm(monkeypatch, client)
+
+        results = await _results(_cases(8), parallelism=2)
+
+        assert len(results) == 8
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_case_reported(self, monkeypatch):
+        """LLM 오류 케이스는 error 상태로 보고되고 나머지 케이스는 계속 진행"""
+        client = StubClient()
+        create = client.completions.create
+
+        async def failing_create(**kwargs):
+            if "실패" in kwargs["messages"][-1]["content"]:
+                raise RuntimeError("boom")
+            return await create(**kwargs)
+
+        client.completions.create = failing_create
+        use_stub_llm(monkeypatch, client)
+
+        requests = [main.ChatRequest(message="허리가 아파요"), main.ChatRequest(message="실패")]
+        results = sorted(await _results(requests, parallelism=2), key=lambda r: r["index"])
+
+        assert [r["status"] for r in results] == ["ok", "error"]
+        assert "boom" in results[1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_cases_use_admission_slots(self, monkeypatch):
+        """배치 케이스도 전역 동시 상담 슬롯을 사용 - 초과분은 대기열에서 대기"""
+        controller = AdmissionController(max_concurrent=1, max_queue=4, position_update_interval=0.01)
+        monkeypatch.setattr(main, "admission", controller)
+        use_stub_llm(monkeypatch, StubClient(delay=0.1))
+
+        task = asyncio.create_task(_results(_cases(3), parallelism=3))
+        await asyncio.sleep(0.05)
+        assert (controller.active, controller.queue_depth) == (1, 2)
+
+        results = await task
+        assert all(r["status"] == "ok" for r in results)
+        assert controller.active == 0
+        assert controller.stats()["admitted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_case_rejected_when_queue_full(self, monkeypatch):
+        """대기열이 가득 차면 해당 케이스는 error로 보고"""
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        monkeypatch.setattr(main, "admission", controller)
+        use_stub_llm(monkeypatch, StubClient(delay=0.05))
+
+        results = await _results(_cases(2), parallelism=2)
+
+        assert sorted(r["status"] for r in results) == ["error", "ok"]
+        assert controller.active == 0
+        assert controller.stats()["rejected"] == 1
+
+
+class TestBatchEndpoint:
+    """/api/chat/batch 엔드포인트 테스트"""
+
+    def test_streams_ndjson_lines(self, monkeypatch):
+        """케이스별 NDJSON 한 줄"""
+        use_stub_llm(monkeypatch, StubClient())
+
+        response = TestClient(main.app).post("/api/chat/batch", json={
+            "requests": [{"message": "허리가 아파요"}, {"message": "무릎이 아파요", "patient_id": "P002"}],
+            "parallelism": 2,
+        })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(line["index"] for line in lines) == [0, 1]
+        assert all(line["status"] == "ok" for line in lines)
+
+    def test_too_many_cases_rejected(self, monkeypatch):
+        """최대 케이스 수 초과 시 413"""
+        monkeypatch.setattr(config, "batch_max_cases", 1)
+
+        response = TestClient(main.app).post("/api/chat/batch", json={
+            "requests": [{"message": "a"}, {"message": "b"}],
+        })
+
+        assert response.status_code == 413
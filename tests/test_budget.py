@@ -0,0 +1,146 @@
+"""토큰/비용 예산 테스트"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.budget import Budget, BudgetLedger
+from backend.llm import LLMBackend, ScriptedBackend
+from backend.llm.base import assistant_message
+from backend.response_cache import ResponseCache
+from backend.usage import UsageTracker
+from tests.helpers import consultation_events, tool_names
+
+
+class LoopingBackend(LLMBackend):
+    """tool_choice="none"이 올 때까지 계속 도구를 호출하는 백엔드"""
+
+    name = "looping"
+
+    def __init__(self):
+        self.tool_choices = []
+
+    async def complete(self, **request):
+        self.tool_choices.append(request["tool_choice"])
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=10, prompt_tokens_details=None)
+        if request["tool_choice"] == "none":
+            return assistant_message("최종 답변", []), usage
+        tool_call = {
+            "id": f"call_{len(self.tool_choices)}",
+            "type": "function",
+            "function": {"name": "read_skill", "arguments": json.dumps({"skill_name": "symptom-analysis"})},
+        }
+        return assistant_message(None, [tool_call]), usage
+
+
+class TestBudgetLedger:
+    """예산 확인/누적 테스트"""
+
+    def test_budget_exceeded(self):
+        assert Budget().exceeded(10**9, 10**6) is None
+        assert Budget(tokens=100).exceeded(100, 0) == "tokens"
+        assert Budget(cost=0.01).exceeded(0, 0.02) == "cost"
+
+    def test_consultation_budget(self):
+        ledger = BudgetLedger(Budget(tokens=1000), Budget())
+        usage = UsageTracker()
+        usage.record(1, SimpleNamespace(prompt_tokens=900, completion_tokens=50, prompt_tokens_details=None))
+        assert ledger.check("P001", usage) is None
+
+        usage.record(2, SimpleNamespace(prompt_tokens=900, completion_tokens=50, prompt_tokens_details=None))
+        assert ledger.check("P001", usage) == "consultation_tokens"
+
+    def test_patient_budget_window(self):
+        now = [0.0]
+        ledger = BudgetLedger(Budget(), Budget(cost=1.0), window=60, clock=lambda: now[0])
+        ledger.charge("P001", 1000, 0.6)
+        ledger.charge("P001", 1000, 0.6)
+
+        assert ledger.check("P001", UsageTracker()) == "patient_cost"
+        assert ledger.check("P002", UsageTracker()) is None
+
+        now[0] = 61.0
+        assert ledger.check("P001", UsageTracker()) is None
+        assert ledger.stats()["total_tokens"] == 2000
+
+
+class TestBudgetEnforcement:
+    """예산 소진 시 도구 없이 최종 답변"""
+
+    @pytest.fixture
+    def ledger(self, monkeypatch):
+        ledger = BudgetLedger(Budget(), Budget())
+        monkeypatch.setattr(main, "budget_ledger", ledger)
+        return ledger
+
+    @pytest.mark.asyncio
+    async def test_consultation_budget_forces_final_answer(self, monkeypatch, ledger):
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        ledger.consultation = Budget(tokens=1)
+
+        events = await consultation_events()
+
+        assert tool_names(events) == ["read_skill"]
+        exhausted = [e for e in events if e["type"] == "log" and e["data"]["step"] == "budget_exhausted"]
+        assert exhausted[0]["data"]["reason"] == "consultation_tokens"
+        assert "요추 추간판 탈출증" in next(e for e in events if e["type"] == "response")["data"]["content"]
+        usage = events[-1]["data"]
+        assert usage["budget"]["exhausted"] == "consultation_tokens"
+        assert len(usage["iterations"]) == 2
+        assert ledger.stats()["budget_exhausted"] == {"consultation_tokens": 1}
+
+    @pytest.mark.asyncio
+    async def test_budget_exhausted_answer_not_cached(self, monkeypatch, ledger):
+        """예산 소진으로 강제된 답변은 응답 캐시에 기록하지 않음"""
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=8, ttl=60))
+        ledger.consultation = Budget(tokens=1)
+
+        result = main.ConsultationResult()
+        [e async for e in main.process_chat_cached("허리가 아파요", "P002", result=result)]
+
+        assert result.budget_exhausted == "consultation_tokens"
+        assert main.response_cache.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_patient_budget_carries_over(self, monkeypatch, ledger):
+        """이전 상담에서 환자 예산을 다 쓰면 다음 상담은 첫 턴부터 최종 답변"""
+        backend = ScriptedBackend()
+        monkeypatch.setattr(main, "llm_backend", backend)
+        ledger.patient = Budget(tokens=1)
+
+        await consultation_events(patient_id="P900")
+        events = await consultation_events(patient_id="P900")
+
+        assert tool_names(events) == []
+        assert events[-1]["data"]["budget"]["exhausted"] == "patient_tokens"
+        assert events[-1]["data"]["budget"]["patient"]["consultations"] == 2
+        assert next(e for e in events if e["type"] == "response")
+
+    @pytest.mark.asyncio
+    async def test_last_iteration_forces_final_answer(self, monkeypatch, ledger):
+        """마지막 반복은 tool_choice="none"으로 호출하여 항상 답변으로 끝남"""
+        backend = LoopingBackend()
+        monkeypatch.setattr(main, "llm_backend", backend)
+        monkeypatch.setattr(main.config, "llm_streaming", False)
+
+        events = await consultation_events()
+
+        assert backend.tool_choices == ["auto"] * 9 + ["none"]
+        assert next(e for e in events if e["type"] == "response")["data"]["content"] == "최종 답변"
+        assert events[-1]["data"]["budget"]["exhausted"] is None
+
+    def test_usage_stats_endpoint(self, monkeypatch, ledger):
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        client = TestClient(main.app)
+
+        client.post("/api/chat", json={"message": "무릎이 아파요", "patient_id": "P003"})
+        stats = client.get("/api/usage/stats", params={"patient_id": "P003"}).json()
+
+        assert stats["consultations"] == 1
+        assert stats["total_tokens"] > 0
+        assert stats["total_cost_usd"] > 0
+        assert stats["patient"]["tokens"] == stats["total_tokens"]
@@ -0,0 +1,167 @@
+"""LRU/TTL 캐시, SingleFlight 테스트"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.cache import AsyncSingleFlight, SingleFlight, TTLCache
+
+
+class FakeClock:
+    """테스트용 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestTTLCache:
+    """TTLCache 테스트"""
+
+    def test_get_set(self, clock):
+        """저장 후 조회, 없는 키는 기본값"""
+        cache = TTLCache(max_entries=4, clock=clock)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b", "default") == "default"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self, clock):
+        """최근 사용되지 않은 항목부터 제거"""
+        cache = TTLCache(max_entries=2, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, clock):
+        """TTL 경과 시 만료, 항목별 TTL 지정 가능"""
+        cache = TTLCache(max_entries=4, ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=100)
+        cache.set("c", 3, ttl=None)
+
+        clock.now = 11
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+        assert cache.stats()["expirations"] == 1
+
+    def test_none_value_is_cached(self, clock):
+        """None 값도 적중으로 처리"""
+        cache = TTLCache(max_entries=4, clock=clock)
+        cache.set("a", None)
+
+        assert cache.get("a", "default") is None
+        assert cache.stats()["hits"] == 1
+
+    def test_pop_and_clear(self, clock):
+        """제거 및 전체 비우기"""
+        cache = TTLCache(max_entries=4, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.pop("a") == 1
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestSingleFlight:
+    """동시 호출 합치기 테스트"""
+
+    def _run_concurrently(self, flight, fn, count=8):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do("key", fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"value": 1}
+
+        results, _ = self._run_concurrently(flight, slow)
+
+        assert len(calls) == 1
+        assert results == [{"value": 1}] * 8
+        assert flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 7}
+
+    def test_error_shared_then_retried(self):
+        flight = SingleFlight()
+
+        def failing():
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        results, errors = self._run_concurrently(flight, failing, count=4)
+
+        assert not results
+        assert len(errors) == 4 and all(isinstance(e, ValueError) for e in errors)
+        assert flight.do("key", lambda: "ok") == "ok"
+        assert flight.stats()["calls"] == 2
+
+
+class TestAsyncSingleFlight:
+    """asyncio 동시 호출 합치기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_awaits_share_one_task(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("key", slow) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_task(self):
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "value"
+
+        first = asyncio.create_task(flight.do("key", slow))
+        second = asyncio.create_task(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "value"
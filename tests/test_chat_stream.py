@@ -0,0 +1,449 @@
+"""채팅 스트림 (process_chat) 테스트"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend import main
+from backend.config import config
+from backend.llm import OpenAIBackend
+
+
+FINAL_ANSWER = "요추 염좌가 의심됩니다. 충분한 휴식을 권장합니다."
+
+
+class StubStream:
+    """AsyncStream 대체 - 청크 비동기 반복"""
+
+    def __init__(self, chunks: list):
+        self._chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class StubCompletions:
+    """로컬 대체 LLM - 대화 단계별로 정해진 턴을 반환
+
+    turns: {"content": str} 또는 {"tool_calls": [(id, name, args)]} 목록
+    """
+
+    def __init__(self, turns: list, delay: float):
+        self.turns = turns
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, **kwargs):
+        # 이후 변경되는 messages 리스트와 분리하여 호출 시점 상태를 기록
+        self.calls.append({**kwargs, "messages": list(kwargs["messages"])})
+        await asyncio.sleep(self.delay)
+
+        step = sum(1 for m in kwargs["messages"] if _role(m) == "assistant")
+        turn = self.turns[min(step, len(self.turns) - 1)]
+        if kwargs.get("stream"):
+            return StubStream(_chunks(turn) + [_chunk(usage=_usage(step))])
+
+        tool_calls = [
+            SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=json.dumps(args)))
+            for call_id, name, args in turn.get("tool_calls", [])
+        ] or None
+        message = SimpleNamespace(content=turn.get("content"), tool_calls=tool_calls)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=_usage(step))
+
+
+class StubClient:
+    """AsyncOpenAI 대체 클라이언트"""
+
+    def __init__(self, turns: list = None, delay: float = 0.0):
+        self.completions = StubCompletions(turns or [{"content": FINAL_ANSWER}], delay)
+        self.chat = SimpleNamespace(completions=self.completions)
+
+
+def use_stub_llm(monkeypatch, client: StubClient) -> None:
+    """대체 클라이언트를 사용하는 OpenAI 백엔드로 교체"""
+    monkeypatch.setattr(main, "llm_backend", OpenAIBackend(client))
+
+
+def _role(message) -> str:
+    return message["role"] if isinstance(message, dict) else message.role
+
+
+def _usage(step: int):
+    """단계별 토큰 사용량 - 두 번째 호출부터 접두부 1000 토큰이 캐시됨"""
+    return SimpleNamespace(
+        prompt_tokens=1200 + 100 * step,
+        completion_tokens=50,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1000 if step else 0),
+    )
+
+
+def _chunk(content=None, tool_calls=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choices = [] if usage is not None else [SimpleNamespace(delta=delta)]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def _chunks(turn: dict) -> list:
+    """턴을 스트리밍 청크로 분할 (content는 3글자, arguments는 두 조각)"""
+    chunks = []
+    content = turn.get("content") or ""
+    for i in range(0, len(content), 3):
+        chunks.append(_chunk(content=content[i:i + 3]))
+
+    for index, (call_id, name, args) in enumerate(turn.get("tool_calls", [])):
+        arguments = json.dumps(args)
+        half = len(arguments) // 2
+        chunks.append(_chunk(tool_calls=[SimpleNamespace(
+            index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments[:half]),
+        )]))
+        chunks.append(_chunk(tool_calls=[SimpleNamespace(
+            index=index, id=None, function=SimpleNamespace(name=None, arguments=arguments[half:]),
+        )]))
+    return chunks
+
+
+async def _events(**kwargs) -> list:
+    """process_chat 이벤트를 모두 수집"""
+    return [json.loads(line) async for line in main.process_chat("허리가 아파요", "P001", **kwargs)]
+
+
+async def _collect(name: str, timeline: list):
+    """이벤트를 도착 순서대로 기록"""
+    async for line in main.process_chat("허리가 아파요", "P001"):
+        event = json.loads(line)
+        timeline.append((name, event["type"], event["data"].get("step")))
+
+
+class TestConcurrentStreams:
+    """동시 스트림 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_streams_interleave(self, monkeypatch):
+        """느린 LLM 호출이 다른 스트림을 막지 않음"""
+        delay = 0.5
+        use_stub_llm(monkeypatch, StubClient(delay=delay))
+
+        timeline = []
+        started = time.perf_counter()
+        await asyncio.gather(
+            _collect("a", timeline),
+            _collect("b", timeline),
+            _collect("c", timeline),
+        )
+        elapsed = time.perf_counter() - started
+
+        # 세 스트림 모두 최종 응답 도달
+        responses = [name for name, kind, _ in timeline if kind == "response"]
+        assert sorted(responses) == ["a", "b", "c"]
+
+        # 첫 응답이 나오기 전에 모든 스트림이 LLM 대기에 진입 (인터리빙)
+        first_response = next(i for i, e in enumerate(timeline) if e[1] == "response")
+        thinking = {name for name, _, step in timeline[:first_response] if step == "llm_thinking"}
+        assert thinking == {"a", "b", "c"}
+
+        # 직렬 실행이었다면 LLM 지연만 3 * delay
+        assert elapsed < 3 * delay
+
+
+class TestTokenStreaming:
+    """토큰 스트리밍 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_deltas_precede_final_response(self, monkeypatch):
+        """content 델타가 순서대로 전달되고 최종 response와 일치"""
+        use_stub_llm(monkeypatch, StubClient())
+        monkeypatch.setattr(config, "llm_streaming", True)
+
+        events = await _events()
+        types = [e["type"] for e in events]
+        deltas = [e["data"]["content"] for e in events if e["type"] == "response_delta"]
+
+        assert len(deltas) > 1
+        assert "".join(deltas) == FINAL_ANSWER
+        assert types[-2:] == ["response", "usage"]
+        assert events[-2]["data"]["content"] == FINAL_ANSWER
+        assert types.index("response_delta") < types.index("response")
+
+    @pytest.mark.asyncio
+    async def test_tool_call_deltas_assembled(self, monkeypatch):
+        """조각난 tool_call 델타가 하나의 호출로 조립되어 실행됨"""
+        client = StubClient([
+            {"tool_calls": [("call_1", "analyze_xray", {"body_part": "spine"})]},
+            {"content": FINAL_ANSWER},
+        ])
+        use_stub_llm(monkeypatch, client)
+        monkeypatch.setattr(config, "llm_streaming", True)
+
+        events = await _events()
+        tool_results = [e["data"] for e in events if e["data"].get("step") == "tool_result"]
+        assert [r["tool"] for r in tool_results] == ["analyze_xray"]
+
+        second_call = client.completions.calls[1]["messages"]
+        assistant = second_call[2]
+        assert assistant["tool_calls"][0]["function"]["arguments"] == json.dumps({"body_part": "spine"})
+        assert second_call[3]["tool_call_id"] == "call_1"
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_mode(self, monkeypatch):
+        """스트리밍 비활성화 시 델타 없이 최종 응답만 전달"""
+        use_stub_llm(monkeypatch, StubClient())
+        monkeypatch.setattr(config, "llm_streaming", False)
+
+        events = await _events()
+        assert not [e for e in events if e["type"] == "response_delta"]
+        response = next(e for e in events if e["type"] == "response")
+        assert response["data"]["content"] == FINAL_ANSWER
+
+
+class TestParallelToolCalls:
+    """한 턴의 다중 tool_calls 동시 실행 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_tools_overlap_and_keep_order(self, monkeypatch):
+        """도구들이 겹쳐 실행되고 결과는 tool_call 순서대로 이력에 추가"""
+        spans = {}
+        delays = {"get_patient_history": 0.3, "analyze_symptoms": 0.1, "analyze_xray": 0.2}
+
+        def slow_tool(name):
+            def tool(**kwargs):
+                start = time.perf_counter()
+                time.sleep(delays[name])
+                spans[name] = (start, time.perf_counter())
+                return f"{name} 결과"
+            return tool
+
+        for name in delays:
+            monkeypatch.setitem(main.tool_registry._tools, name, slow_tool(name))
+
+        client = StubClient([
+            {"tool_calls": [
+                ("call_1", "get_patient_history", {"patient_id": "P001"}),
+                ("call_2", "analyze_symptoms", {"symptoms": "허리 통증"}),
+                ("call_3", "analyze_xray", {"body_part": "spine"}),
+            ]},
+            {"content": FINAL_ANSWER},
+        ])
+        use_stub_llm(monkeypatch, client)
+
+        events = await _events()
+
+        # 모든 도구가 다른 도구가 끝나기 전에 시작 (동시 실행)
+        assert max(start for start, _ in spans.values()) < min(end for _, end in spans.values())
+
+        # 결과 이벤트는 완료 순서 (가장 빠른 도구 먼저)
+        finished = [e["data"]["tool"] for e in events if e["data"].get("step") == "tool_result"]
+        assert finished == ["analyze_symptoms", "analyze_xray", "get_patient_history"]
+
+        # 대화 이력은 원래 tool_call 순서
+        tool_messages = [m for m in client.completions.calls[1]["messages"] if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_messages] == ["call_1", "call_2", "call_3"]
+        assert tool_messages[0]["content"] == "get_patient_history 결과"
+
+
+class TestPacing:
+    """이벤트 페이싱 테스트"""
+
+    def test_pacing_delay(self, monkeypatch):
+        """요청 모드가 서버 기본값보다 우선"""
+        monkeypatch.setattr(config, "stream_pacing", "fast")
+        monkeypatch.setattr(config, "ui_pacing_delay", 0.1)
+
+        assert main._pacing_delay(None) == 0.0
+        assert main._pacing_delay("fast") == 0.0
+        assert main._pacing_delay("ui") == 0.1
+
+        monkeypatch.setattr(config, "stream_pacing", "ui")
+        assert main._pacing_delay(None) == 0.1
+        assert main._pacing_delay("fast") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_has_no_artificial_latency(self, monkeypatch):
+        """fast 모드는 지연 없이, ui 모드는 이벤트마다 지연"""
+        use_stub_llm(monkeypatch, StubClient())
+        monkeypatch.setattr(config, "ui_pacing_delay", 0.05)
+
+        started = time.perf_counter()
+        await _events(pacing="fast")
+        fast_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await _events(pacing="ui")
+        ui_elapsed = time.perf_counter() - started
+
+        # discovery 3회 + 진단 단계 1회
+        assert ui_elapsed >= 4 * 0.05
+        assert fast_elapsed < 0.05
+
+
+class TestPromptCacheLayout:
+    """프롬프트 캐시 친화적 요청 구성 및 토큰 집계 테스트"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_usage_recorded_per_iteration(self, monkeypatch, streaming):
+        """반복마다 prompt/cached/completion 토큰이 기록되고 마지막에 요약 전달"""
+        client = StubClient([
+            {"tool_calls": [("call_1", "analyze_xray", {"body_part": "spine"})]},
+            {"content": FINAL_ANSWER},
+        ])
+        use_stub_llm(monkeypatch, client)
+        monkeypatch.setattr(config, "llm_streaming", streaming)
+
+        events = await _events()
+        usage = events[-1]
+        assert usage["type"] == "usage"
+        assert [i["prompt_tokens"] for i in usage["data"]["iterations"]] == [1200, 1300]
+        assert [i["cached_tokens"] for i in usage["data"]["iterations"]] == [0, 1000]
+        assert usage["data"]["completion_tokens"] == 100
+        assert usage["data"]["saved_usd"] > 0
+
+    @pytest.mark.asyncio
+    async def test_static_prefix_is_identical_across_calls(self, monkeypatch):
+        """모든 호출이 동일한 도구 정의 객체와 시스템 프롬프트로 시작"""
+        client = StubClient([
+            {"tool_calls": [("call_1", "analyze_xray", {"body_part": "spine"})]},
+            {"content": FINAL_ANSWER},
+        ])
+        use_stub_llm(monkeypatch, client)
+
+        await _events()
+        await _events()
+
+        calls = client.completions.calls
+        assert len(calls) == 4
+        assert all(call["tools"] is calls[0]["tools"] for call in calls)
+        assert len({call["messages"][0]["content"] for call in calls}) == 1
+        assert len({call["extra_body"]["prompt_cache_key"] for call in calls}) == 1
+
+
+class TestDeadline:
+    """상담 시간 제한 테스트"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_slow_llm_cut_at_deadline(self, monkeypatch, streaming):
+        """마감 시각에 LLM 호출을 취소하고 부분 응답 후 usage로 종료"""
+        use_stub_llm(monkeypatch, StubClient(delay=2.0))
+        monkeypatch.setattr(config, "llm_streaming", streaming)
+        monkeypatch.setattr(config, "chat_deadline", 0.1)
+
+        started = time.perf_counter()
+        events = await _events()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert events[-3]["data"]["step"] == "deadline"
+        assert events[-2]["type"] == "response"
+        assert events[-2]["data"]["partial"] is True
+        assert events[-1]["type"] == "usage"
+
+    @pytest.mark.asyncio
+    async def test_streamed_text_kept_as_partial_answer(self, monkeypatch):
+        """이미 스트리밍된 답변은 부분 응답에 포함"""
+        async def stalled_stream(messages, final=False):
+            yield "delta", "요추 염좌가 "
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(main, "_stream_completion", stalled_stream)
+        monkeypatch.setattr(config, "llm_streaming", True)
+        monkeypatch.setattr(config, "chat_deadline", 0.1)
+
+        events = await _events()
+
+        assert events[-2]["data"]["content"].startswith("요추 염좌가 ")
+        assert events[-2]["data"]["partial"] is True
+
+    @pytest.mark.asyncio
+    async def test_pending_tools_cancelled_at_deadline(self, monkeypatch):
+        """마감 시각에 실행 중인 도구 태스크 취소"""
+        cancelled = []
+
+        async def slow_tool(tool_name, tool_args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(tool_name)
+                raise
+
+        use_stub_llm(monkeypatch, StubClient([
+            {"tool_calls": [("call_1", "analyze_xray", {"body_part": "spine"})]},
+            {"content": FINAL_ANSWER},
+        ]))
+        monkeypatch.setattr(main, "_run_tool", slow_tool)
+        monkeypatch.setattr(config, "chat_deadline", 0.1)
+
+        events = await _events()
+        await asyncio.sleep(0)
+
+        assert cancelled == ["analyze_xray"]
+        assert events[-2]["data"]["partial"] is True
+
+    @pytest.mark.asyncio
+    async def test_deadline_without_timeout_at(self, monkeypatch):
+        """Python 3.10 (asyncio.timeout_at 없음)에서도 마감 시각 적용"""
+        monkeypatch.delattr(asyncio, "timeout_at", raising=False)
+        monkeypatch.setattr(config, "chat_deadline", 0.1)
+        use_stub_llm(monkeypatch, StubClient([{"content": FINAL_ANSWER}]))
+
+        events = await _events()
+        assert events[-2]["data"]["content"] == FINAL_ANSWER
+
+        use_stub_llm(monkeypatch, StubClient(delay=2.0))
+        events = await _events()
+        assert events[-2]["data"]["partial"] is True
+
+
+class TestDisconnect:
+    """클라이언트 연결 종료 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_consultation(self, monkeypatch):
+        """도구 실행 중 연결이 끊기면 도구 태스크 취소 및 동시 상담 슬롯 반환"""
+        cancelled = []
+
+        async def slow_tool(tool_name, tool_args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(tool_name)
+                raise
+
+        client = StubClient([
+            {"tool_calls": [("call_1", "analyze_xray", {"body_part": "spine"})]},
+            {"content": FINAL_ANSWER},
+        ])
+        use_stub_llm(monkeypatch, client)
+        monkeypatch.setattr(main, "_run_tool", slow_tool)
+
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        request = SimpleNamespace(receive=receive)
+        steps = []
+        started = time.perf_counter()
+        async for line in main.cancel_on_disconnect(request, main.admit(main.process_chat("허리가 아파요"))):
+            event = json.loads(line)
+            steps.append(event["data"].get("step"))
+            if event["data"].get("step") == "tool_call":
+                disconnect.set()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert cancelled == ["analyze_xray"]
+        assert "complete" not in steps
+        assert len(client.completions.calls) == 1
+        assert main.admission.active == 0
@@ -0,0 +1,74 @@
+"""이벤트 인코딩/SSE 프레이밍 테스트"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import events, main
+from backend.llm import ScriptedBackend
+
+
+async def _lines(*items, delay=0.0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+class TestEncoding:
+    """JSON 직렬화 테스트"""
+
+    def test_dumps_matches_json(self):
+        payload = {"type": "log", "data": {"message": "✅ 요추 MRI", "n": 3, "ok": True, "x": None}}
+        assert json.loads(events.dumps(payload)) == payload
+        assert "요추" in events.dumps(payload)
+        assert " " not in events.dumps({"a": [1, 2]})
+
+    def test_encode_event_line(self):
+        line = events.encode_event("response", {"content": "답변"})
+        assert line.endswith("\n") and line.count("\n") == 1
+        assert json.loads(line) == {"type": "response", "data": {"content": "답변"}}
+
+    def test_static_event_cached(self):
+        first = events.static_event("log", step="discovery", message="🔍 Skills")
+        second = events.static_event("log", step="discovery", message="🔍 Skills")
+        assert first is second
+        assert first == events.encode_event("log", {"step": "discovery", "message": "🔍 Skills"})
+
+
+class TestSSE:
+    """SSE 프레이밍/heartbeat 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_sse_frames(self):
+        line = events.encode_event("log", {"step": "discovery"})
+        frames = [frame async for frame in events.sse_frames(_lines(line))]
+        assert frames == [f"data: {line.strip()}\n\n"]
+        assert events.parse_sse("".join(frames) + events.SSE_HEARTBEAT) == [json.loads(line)]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_while_idle(self):
+        """이벤트 사이 대기가 길면 heartbeat를 보내고 대기 중인 이벤트는 그대로 전달"""
+        request = SimpleNamespace(receive=asyncio.Event().wait)
+        frames = [
+            frame async for frame in main.cancel_on_disconnect(
+                request, events.sse_frames(_lines("{}\n", '{"a":1}\n', delay=0.05)), heartbeat_interval=0.01,
+            )
+        ]
+
+        assert events.SSE_HEARTBEAT in frames
+        assert events.parse_sse("".join(frames)) == [{}, {"a": 1}]
+
+    def test_chat_response_is_sse(self, monkeypatch):
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        response = TestClient(main.app).post("/api/chat", json={"message": "허리가 아파요", "pacing": "fast"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.text.startswith("data: ")
+        parsed = events.parse_sse(response.text)
+        assert parsed[0]["data"]["step"] == "discovery"
+        assert parsed[-1]["type"] == "usage"
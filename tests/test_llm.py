@@ -0,0 +1,92 @@
+"""LLM 백엔드 테스트"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend import main
+from backend.config import config
+from backend.llm import OpenAIBackend, ScriptedBackend, create_backend
+from tests.helpers import consultation_events, tool_names
+
+
+class TestCreateBackend:
+    """Config 기반 백엔드 선택 테스트"""
+
+    def test_openai_backend(self):
+        backend = create_backend(SimpleNamespace(
+            llm_backend="openai", openai_api_key="sk-test",
+            llm_max_connections=10, llm_max_keepalive_connections=5, llm_timeout=5.0,
+        ))
+        assert isinstance(backend, OpenAIBackend)
+
+    def test_scripted_backend(self):
+        backend = create_backend(SimpleNamespace(
+            llm_backend="scripted", scripted_llm_latency=0.2, scripted_llm_chunk_delay=0.01,
+            scripted_llm_medications=True,
+        ))
+        assert isinstance(backend, ScriptedBackend)
+        assert backend.latency == 0.2
+        assert backend.chunk_delay == 0.01
+        assert backend.medications is True
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_backend(SimpleNamespace(llm_backend="unknown"))
+
+
+class TestScriptedBackend:
+    """결정적 로컬 백엔드로 실제 에이전트 루프 실행"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_realistic_tool_sequence(self, monkeypatch, streaming):
+        """read_skill → analyze_symptoms → assess_severity → recommend_treatment → 최종 답변"""
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        monkeypatch.setattr(config, "llm_streaming", streaming)
+
+        events = await consultation_events()
+
+        assert tool_names(events) == [
+            "read_skill", "analyze_symptoms", "assess_severity", "recommend_treatment",
+        ]
+        assert not [e for e in events if e["type"] == "log" and e["data"]["step"] == "error"]
+        response = next(e for e in events if e["type"] == "response")["data"]["content"]
+        assert "요추 추간판 탈출증" in response
+        assert "P002" in response
+        assert events[-1]["data"]["prompt_tokens"] > 0
+        assert events[-1]["data"]["cached_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_deterministic(self, monkeypatch):
+        """같은 입력은 같은 이벤트 스트림"""
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+
+        first, second = await consultation_events(), await consultation_events()
+
+        assert [e for e in first if e["type"] != "usage"] == [e for e in second if e["type"] != "usage"]
+
+    @pytest.mark.asyncio
+    async def test_synthetic_latency(self, monkeypatch):
+        """호출마다 설정한 지연 적용 (LLM 호출 5회)"""
+        backend = ScriptedBackend(latency=0.05)
+        monkeypatch.setattr(main, "llm_backend", backend)
+
+        started = time.perf_counter()
+        await consultation_events()
+        elapsed = time.perf_counter() - started
+
+        assert backend.calls == 5
+        assert elapsed >= 0.25
+
+    @pytest.mark.asyncio
+    async def test_medication_step(self, monkeypatch):
+        """medications=True면 치료 추천과 약물 옵션을 같은 턴에 호출"""
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend(medications=True))
+        monkeypatch.setitem(main.tool_registry._tools, "get_medication_options", lambda diagnosis, allergies=None: "약물 옵션")
+
+        events = await consultation_events()
+
+        assert tool_names(events)[-2:] == ["recommend_treatment", "get_medication_options"]
+        assert next(e for e in events if e["type"] == "response")
@@ -0,0 +1,142 @@
+"""메트릭 수집/노출 테스트"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main, metrics
+from backend.llm import ScriptedBackend
+from backend.metrics import MetricsRegistry
+from backend.services.rxnorm_api import RxNormAPI
+from tests.test_chat_stream import FINAL_ANSWER, StubClient, use_stub_llm
+
+
+class TestRegistry:
+    """카운터/게이지/히스토그램 렌더링 테스트"""
+
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry("test")
+        counter = registry.counter("calls", "Calls", ["tool"])
+        gauge = registry.gauge("open", "Open streams")
+        counter.inc(tool="a")
+        counter.inc(2, tool="a")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        text = registry.render()
+
+        assert "# TYPE test_calls counter" in text
+        assert 'test_calls_total{tool="a"} 3' in text
+        assert "test_open 1" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry("test")
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.0625, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert 'test_latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'test_latency_seconds_bucket{le="1.0"} 3' in lines
+        assert 'test_latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "test_latency_seconds_count 4" in lines
+        assert "test_latency_seconds_sum 6.0625" in lines
+
+    def test_label_values_escaped(self):
+        registry = MetricsRegistry("test")
+        registry.counter("calls", "Calls", ["tool"]).inc(tool='a"b\\c')
+
+        assert 'test_calls_total{tool="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_collector(self):
+        registry = MetricsRegistry("test")
+        registry.register_collector(lambda: [("queue_depth", "gauge", "Depth", [({}, 7)])])
+
+        text = registry.render()
+
+        assert "# TYPE test_queue_depth gauge" in text
+        assert "test_queue_depth 7" in text
+
+
+class TestAppMetrics:
+    """상담/도구/RxNorm 계측 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_consultation_recorded(self, monkeypatch):
+        """LLM 호출 5회, 도구 4회, 반복 5회가 기록됨"""
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        llm_calls = metrics.llm_calls.value(outcome="ok")
+        iterations = metrics.consultation_iterations.count()
+        tool_calls = metrics.tool_calls.value(tool="analyze_symptoms", outcome="ok")
+        completion_tokens = metrics.llm_tokens.value(kind="completion")
+
+        [event async for event in main.process_chat("허리가 아파요", "P002")]
+
+        assert metrics.llm_calls.value(outcome="ok") == llm_calls + 5
+        assert metrics.consultation_iterations.count() == iterations + 1
+        assert metrics.tool_calls.value(tool="analyze_symptoms", outcome="ok") == tool_calls + 1
+        assert metrics.tool_duration.count(tool="analyze_symptoms") > 0
+        assert metrics.llm_call_duration.count(iteration=5) > 0
+        assert metrics.llm_tokens.value(kind="completion") > completion_tokens
+
+    @pytest.mark.asyncio
+    async def test_failed_tools_recorded(self, monkeypatch):
+        """도구 예외와 알 수 없는 도구는 outcome=error, 오류 이벤트, tool_errors로 기록"""
+        use_stub_llm(monkeypatch, StubClient([
+            {"tool_calls": [("c1", "analyze_symptoms", {"bogus": 1}), ("c2", "nonexistent_tool", {})]},
+            {"content": FINAL_ANSWER},
+        ]))
+        failed = metrics.tool_calls.value(tool="analyze_symptoms", outcome="error")
+        unknown = metrics.tool_calls.value(tool="nonexistent_tool", outcome="error")
+        succeeded = metrics.tool_calls.value(tool="analyze_symptoms", outcome="ok")
+        result = main.ConsultationResult()
+
+        events = [json.loads(e) async for e in main.process_chat("허리가 아파요", result=result)]
+
+        assert metrics.tool_calls.value(tool="analyze_symptoms", outcome="error") == failed + 1
+        assert metrics.tool_calls.value(tool="nonexistent_tool", outcome="error") == unknown + 1
+        assert metrics.tool_calls.value(tool="analyze_symptoms", outcome="ok") == succeeded
+        assert result.tool_errors == 2
+        assert not [e for e in events if e["data"].get("step") == "tool_result"]
+        assert len([e for e in events if e["data"].get("step") == "error"]) == 2
+
+    def test_metrics_endpoint(self, monkeypatch):
+        """/metrics는 Prometheus 텍스트 형식, 스트림 종료 후 active_streams 복귀"""
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        client = TestClient(main.app)
+        completed = metrics.requests.value(endpoint="chat", outcome="completed")
+
+        client.post("/api/chat", json={"message": "무릎이 아파요", "pacing": "fast"})
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert metrics.requests.value(endpoint="chat", outcome="completed") == completed + 1
+        assert metrics.active_streams.value(endpoint="chat") == 0
+        assert "doctor_agent_request_duration_seconds_bucket" in response.text
+        assert "doctor_agent_admission_queue_depth 0" in response.text
+        assert 'doctor_agent_cache_lookups_total{cache="tool:get_medication_options",result="miss"}' in response.text
+
+    def test_scrape_skips_rxnorm_sqlite(self, monkeypatch):
+        """스크레이프는 RxNorm 디스크 캐시/미러를 조회하지 않음 (메모리 카운터만 사용)"""
+        def sqlite_stats():
+            raise AssertionError("SQLite stats queried during scrape")
+
+        monkeypatch.setattr(main.rxnorm_api.rxnorm_client, "stats", sqlite_stats)
+
+        response = TestClient(main.app).get("/metrics")
+
+        assert response.status_code == 200
+        assert "doctor_agent_rxnorm_loads_total" in response.text
+
+    def test_rxnorm_calls_recorded(self):
+        """연결 실패도 endpoint별 error로 기록"""
+        client = RxNormAPI(base_url="http://127.0.0.1:9")
+        errors = metrics.rxnorm_requests.value(endpoint="drugs", outcome="error")
+
+        assert client.search_drugs("ibuprofen") == []
+        assert metrics.rxnorm_requests.value(endpoint="drugs", outcome="error") == errors + 1
+        assert metrics.rxnorm_request_duration.count(endpoint="drugs") > 0
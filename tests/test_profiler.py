@@ -0,0 +1,104 @@
+"""요청 단위 프로파일러 테스트"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.config import config
+from backend.events import parse_sse
+from backend.llm import ScriptedBackend
+from backend.profiler import SamplingProfiler
+
+
+def _busy(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """스택 샘플링/집계 테스트"""
+
+    def test_collapsed_stacks(self, tmp_path):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy, args=(stop,))
+        worker.start()
+        profiler = SamplingProfiler(lambda: [(worker.ident, "worker")], interval=0.001).start()
+        time.sleep(0.1)
+        profiler.stop()
+        stop.set()
+        worker.join()
+
+        path = profiler.write(tmp_path / "busy.collapsed")
+        lines = path.read_text(encoding="utf-8").splitlines()
+
+        assert profiler.samples > 0
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack.startswith("worker;")
+        assert "test_profiler:_busy" in stack
+        assert int(count) > 0
+        assert profiler.summary()["top"]
+
+    def test_idle_thread_not_recorded(self):
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait)
+        waiter.start()
+        profiler = SamplingProfiler(lambda: [(waiter.ident, "waiter")], interval=0.001).start()
+        time.sleep(0.05)
+        profiler.stop()
+        stop.set()
+        waiter.join()
+
+        assert profiler.idle_samples == profiler.samples
+        assert not profiler.stacks
+
+
+class TestProfileEndpoint:
+    """X-Profile 헤더 - 관리자 전용, 마지막 profile 이벤트로 결과 링크"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend(latency=0.01))
+        monkeypatch.setattr(config, "profile_dir", tmp_path)
+        return TestClient(main.app)
+
+    def test_requires_admin_token(self, client, monkeypatch):
+        monkeypatch.setattr(config, "admin_token", "")
+        response = client.post(
+            "/api/chat", json={"message": "허리가 아파요"},
+            headers={"X-Profile": "1", "X-Admin-Token": ""},
+        )
+        assert response.status_code == 403
+
+    def test_wrong_admin_token(self, client, monkeypatch):
+        monkeypatch.setattr(config, "admin_token", "secret")
+        response = client.post(
+            "/api/chat", json={"message": "허리가 아파요"},
+            headers={"X-Profile": "1", "X-Admin-Token": "wrong"},
+        )
+        assert response.status_code == 403
+
+    def test_profile_written_and_linked(self, client, monkeypatch, tmp_path):
+        monkeypatch.setattr(config, "admin_token", "secret")
+        headers = {"X-Profile": "1", "X-Admin-Token": "secret"}
+
+        response = client.post("/api/chat", json={"message": "허리가 아파요"}, headers=headers)
+        events = parse_sse(response.text)
+
+        assert events[-2]["type"] == "usage"
+        profile = events[-1]
+        assert profile["type"] == "profile"
+        assert profile["data"]["samples"] > 0
+        name = profile["data"]["url"].rsplit("/", 1)[-1]
+        assert (tmp_path / f"{name}.collapsed").exists()
+        assert client.get(profile["data"]["url"], headers=headers).status_code == 200
+        assert client.get(profile["data"]["url"]).status_code == 403
+
+    def test_no_profile_without_header(self, client):
+        response = client.post("/api/chat", json={"message": "허리가 아파요"})
+        events = parse_sse(response.text)
+
+        assert events[-1]["type"] == "usage"
+        assert not list(config.profile_dir.iterdir())
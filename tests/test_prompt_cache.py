@@ -0,0 +1,120 @@
+"""시스템 프롬프트 캐시 테스트"""
+
+import os
+
+import pytest
+
+from backend.prompt_cache import SystemPromptCache
+from backend.skill_loader import SkillLoader
+from backend.tools.registry import ToolRegistry
+from data.mock_data import MockDataSource
+
+
+def _write_skill(skills_dir, name: str, description: str):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(exist_ok=True)
+    skill_md = skill_dir / "SKILL.md"
+    skill_md.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n", encoding="utf-8")
+    return skill_md
+
+
+def _touch_later(path):
+    """mtime 해상도와 무관하게 변경이 감지되도록 mtime을 앞당김"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def prompt_env(tmp_path):
+    """임시 템플릿 + 스킬 디렉토리"""
+    template = tmp_path / "system.md"
+    template.write_text("# System\n\n{{available_skills}}\n", encoding="utf-8")
+    skills_dir = tmp_path / "skills"
+    skills_dir.mkdir()
+    _write_skill(skills_dir, "beta-skill", "두 번째 스킬")
+    _write_skill(skills_dir, "alpha-skill", "첫 번째 스킬")
+
+    loader = SkillLoader(skills_dir)
+    cache = SystemPromptCache(template, loader, check_interval=0)
+    return template, skills_dir, loader, cache
+
+
+class TestSystemPromptCache:
+    """SystemPromptCache 테스트"""
+
+    def test_renders_skills_in_stable_order(self, prompt_env):
+        """스킬 XML이 이름순으로 주입됨"""
+        _, _, _, cache = prompt_env
+        prompt = cache.get()
+
+        assert "{{available_skills}}" not in prompt
+        assert prompt.index("alpha-skill") < prompt.index("beta-skill")
+
+    def test_unchanged_files_reuse_prompt(self, prompt_env):
+        """파일 변경이 없으면 동일 객체 재사용"""
+        _, _, _, cache = prompt_env
+        first = cache.get()
+
+        assert cache.get() is first
+        assert cache.rebuilds == 1
+
+    def test_template_change_rebuilds(self, prompt_env):
+        """템플릿 변경 시 재생성 및 버전 변경"""
+        template, _, _, cache = prompt_env
+        cache.get()
+        version = cache.version
+
+        template.write_text("# Updated\n\n{{available_skills}}\n", encoding="utf-8")
+        _touch_later(template)
+
+        assert cache.get().startswith("# Updated")
+        assert cache.version != version
+        assert cache.rebuilds == 2
+
+    def test_skill_change_reloads_loader(self, prompt_env):
+        """SKILL.md 수정 및 스킬 추가가 반영됨"""
+        _, skills_dir, loader, cache = prompt_env
+        cache.get()
+        skills_version = cache.skills_version
+
+        skill_md = _write_skill(skills_dir, "alpha-skill", "수정된 설명")
+        _touch_later(skill_md)
+        assert "수정된 설명" in cache.get()
+        assert cache.skills_version != skills_version
+
+        _write_skill(skills_dir, "gamma-skill", "새 스킬")
+        assert "gamma-skill" in cache.get()
+        assert "gamma-skill" in loader.skills
+
+    def test_skill_change_clears_read_skill_cache(self, prompt_env):
+        """프롬프트 재생성과 함께 캐시된 read_skill 본문도 새 버전으로 교체"""
+        _, skills_dir, loader, cache = prompt_env
+        registry = ToolRegistry(MockDataSource(), loader)
+        cache.get()
+        args = {"skill_name": "alpha-skill"}
+        assert "첫 번째 스킬" in registry.execute("read_skill", args)
+
+        skill_md = _write_skill(skills_dir, "alpha-skill", "수정된 설명")
+        _touch_later(skill_md)
+        assert "첫 번째 스킬" in registry.execute("read_skill", args)  # 프롬프트도 아직 이전 버전
+
+        cache.get()
+        assert "수정된 설명" in registry.execute("read_skill", args)
+
+    def test_check_interval_skips_stat(self, prompt_env):
+        """확인 주기 내에서는 파일 변경을 확인하지 않음"""
+        template, skills_dir, loader, _ = prompt_env
+        cache = SystemPromptCache(template, loader, check_interval=3600)
+        first = cache.get()
+
+        _write_skill(skills_dir, "gamma-skill", "새 스킬")
+        assert cache.get() is first
+
+        cache.invalidate()
+        assert "gamma-skill" in cache.get()
+
+    def test_missing_template(self, tmp_path, skill_loader):
+        """템플릿이 없으면 FileNotFoundError"""
+        cache = SystemPromptCache(tmp_path / "missing.md", skill_loader, check_interval=0)
+        with pytest.raises(FileNotFoundError):
+            cache.get()
@@ -0,0 +1,135 @@
+"""응답 캐시 테스트"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.config import config
+from backend.response_cache import ResponseCache
+from tests.test_chat_stream import FINAL_ANSWER, StubClient, use_stub_llm
+
+
+def _key(message="허리가 아파요", patient_id="P001", image=None, prompt_version="v1"):
+    return ResponseCache.make_key(message, patient_id, image, "gpt-4o", prompt_version, "s1")
+
+
+async def _events(message="허리가 아파요", **kwargs) -> list:
+    return [json.loads(e) async for e in main.process_chat_cached(message, "P001", **kwargs)]
+
+
+@pytest.fixture
+def cached_app(monkeypatch):
+    """응답 캐시 활성화 + 도구 1회 호출 후 답변하는 대체 LLM"""
+    client = StubClient([
+        {"tool_calls": [("call_1", "analyze_xray", {"body_part": "spine"})]},
+        {"content": FINAL_ANSWER},
+    ])
+    use_stub_llm(monkeypatch, client)
+    monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=8, ttl=60))
+    return client
+
+
+class TestResponseCacheKey:
+    """캐시 키 정규화 테스트"""
+
+    def test_whitespace_and_case_normalized(self):
+        """공백/대소문자 차이는 같은 키"""
+        assert _key("Back  pain\n") == _key("back pain")
+
+    def test_key_components(self):
+        """환자, 이미지, 프롬프트 버전이 다르면 다른 키"""
+        base = _key()
+        assert _key(patient_id="P002") != base
+        assert _key(image="data:image/jpeg;base64,AAAA") != base
+        assert _key(prompt_version="v2") != base
+
+
+class TestCachedChat:
+    """process_chat_cached 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_agent_loop(self, cached_app):
+        """두 번째 동일 요청은 LLM 호출 없이 같은 답변"""
+        first = await _events()
+        calls = len(cached_app.completions.calls)
+        second = await _events("  허리가   아파요 ")
+
+        assert len(cached_app.completions.calls) == calls
+        assert second[0]["data"]["step"] == "cache_hit"
+        responses = [e["data"]["content"] for e in second if e["type"] == "response"]
+        assert responses == [FINAL_ANSWER]
+        assert second[-1]["data"]["response_cache"] == "hit"
+        assert second[-1]["data"]["total_tokens"] == 0
+        assert len(second) < len(first)
+
+        stats = main.response_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_full_stream(self, cached_app, monkeypatch):
+        """replay 옵션은 기록된 이벤트 스트림 전체를 재생"""
+        monkeypatch.setattr(config, "response_cache_replay", True)
+        first = await _events()
+        second = await _events()
+
+        assert second[1:-1] == first[:-1]
+
+    @pytest.mark.asyncio
+    async def test_session_requests_bypass_cache(self, cached_app):
+        """세션 요청은 캐시를 사용하지 않음"""
+        await _events(session_id="s-cache")
+        await _events(session_id="s-cache")
+
+        stats = main.response_cache.stats()
+        assert stats["hits"] == 0
+        assert stats["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, monkeypatch):
+        """오류로 끝난 상담은 기록하지 않음"""
+        class FailingCompletions:
+            async def create(self, **kwargs):
+                raise RuntimeError("LLM down")
+
+        failing = StubClient()
+        failing.chat.completions = FailingCompletions()
+        use_stub_llm(monkeypatch, failing)
+        monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=8, ttl=60))
+
+        await _events()
+        await _events()
+        assert main.response_cache.stats()["hits"] == 0
+        assert main.response_cache.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_tool_answers_not_cached(self, monkeypatch):
+        """도구 실패 결과를 바탕으로 한 답변은 기록하지 않음"""
+        client = StubClient([
+            {"tool_calls": [("call_1", "analyze_xray", {"bogus": "arg"})]},
+            {"content": FINAL_ANSWER},
+        ])
+        use_stub_llm(monkeypatch, client)
+        monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=8, ttl=60))
+
+        first = await _events()
+        second = await _events()
+
+        assert [e for e in first if e["data"].get("step") == "error"]
+        assert second[0]["data"]["step"] != "cache_hit"
+        assert main.response_cache.stats()["size"] == 0
+
+
+class TestCacheStatsAPI:
+    """캐시 통계 API 테스트"""
+
+    def test_stats_endpoint(self, client: TestClient, monkeypatch):
+        monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=8, ttl=60))
+        response = client.get("/api/cache/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["response_cache"]["hits"] == 0
+        assert "sessions" in data
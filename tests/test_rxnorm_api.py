@@ -144,6 +144,28 @@ class TestRxNormIntegration:
         print("="*60)
 
 
+class TestRxNormBaseURL:
+    """Test pointing the client at a local RxNorm stub"""
+
+    def test_base_url_argument(self, stub):
+        """Client uses the given base URL instead of RxNav"""
+        client = RxNormAPI(stub.base_url)
+
+        drugs = client.search_drugs("ibuprofen")
+        assert drugs[0]["name"].startswith("ibuprofen")
+        assert client.get_drug_info(drugs[0]["rxcui"])["rxcui"] == drugs[0]["rxcui"]
+        assert len(client.get_drug_interactions(drugs[0]["rxcui"])) == 2
+        assert stub.requests == 3
+
+    def test_base_url_env(self, stub, monkeypatch):
+        """RXNORM_BASE_URL overrides the default endpoint"""
+        monkeypatch.setenv("RXNORM_BASE_URL", stub.base_url + "/")
+
+        client = RxNormAPI()
+        assert client.BASE_URL == stub.base_url
+        assert client.search_drugs("naproxen")
+
+
 if __name__ == "__main__":
     # Run quick test
     print("Testing RxNorm API...")
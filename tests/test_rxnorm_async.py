@@ -0,0 +1,127 @@
+"""비동기 RxNorm 클라이언트 테스트"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.cache import TTLCache
+from backend.services import rxnorm_async
+from backend.services.rxnorm_api import RxNormAPI
+from backend.services.rxnorm_async import AsyncRxNormAPI
+from backend.services.rxnorm_cache import RxNormDiskCache
+
+
+class TestAsyncRxNormAPI:
+    """동기 클라이언트와 같은 반환 형태, 요청 합치기"""
+
+    @pytest.mark.asyncio
+    async def test_same_results_as_sync_client(self, stub):
+        sync = RxNormAPI(stub.base_url)
+        client = AsyncRxNormAPI(stub.base_url)
+        try:
+            assert await client.search_drugs("ibuprofen") == sync.search_drugs("ibuprofen")
+            assert await client.get_drug_info("5640") == sync.get_drug_info("5640")
+            assert await client.get_drug_interactions("5640") == sync.get_drug_interactions("5640")
+            assert await client.get_related_drugs("5640", "BN") == sync.get_related_drugs("5640", "BN")
+        finally:
+            await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors_return_empty(self):
+        client = AsyncRxNormAPI("http://127.0.0.1:9")
+        try:
+            assert await client.search_drugs("ibuprofen") == []
+            assert await client.get_drug_info("5640") is None
+        finally:
+            await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_coalesced(self, stub):
+        stub.latency = 0.05
+        client = AsyncRxNormAPI(stub.base_url, memory=TTLCache(max_entries=16))
+        try:
+            results = await asyncio.gather(*(client.get_drug_info("42") for _ in range(10)))
+        finally:
+            await client.aclose()
+
+        assert stub.requests == 1
+        assert all(result == results[0] for result in results)
+        assert client.stats()["singleflight"]["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_runs_off_loop(self, stub, tmp_path):
+        """SQLite 조회/저장은 워커 스레드에서 실행되어 잠금 대기 중에도 루프가 멈추지 않음"""
+        threads = []
+
+        class SlowCache(RxNormDiskCache):
+            def get(self, key):
+                threads.append(threading.current_thread())
+                time.sleep(0.2)  # 다른 프로세스가 쓰기 잠금을 잡고 있는 상황
+                return super().get(key)
+
+            def set(self, *args, **kwargs):
+                threads.append(threading.current_thread())
+                super().set(*args, **kwargs)
+
+        client = AsyncRxNormAPI(stub.base_url, cache=SlowCache(tmp_path / "rxnorm.sqlite3"))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            assert (await client.get_drug_info("42"))["rxcui"] == "42"
+        finally:
+            ticking.cancel()
+            await client.aclose()
+
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_concurrency(self, stub):
+        """max_connections로 동시 요청 수 제한"""
+        stub.latency = 0.05
+        client = AsyncRxNormAPI(stub.base_url, max_connections=2, max_keepalive_connections=2)
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(client.get_drug_info(str(i)) for i in range(6)))
+        finally:
+            await client.aclose()
+
+        assert time.perf_counter() - started >= 0.15
+        assert stub.requests == 6
+
+
+class TestAsyncMedicationTool:
+    """aexecute는 비동기 클라이언트로 약물 도구 실행"""
+
+    @pytest.mark.asyncio
+    async def test_matches_sync_output(self, monkeypatch, stub, skill_loader, mock_data):
+        from backend.services import rxnorm_api
+        from backend.tools.registry import ToolRegistry
+
+        client = AsyncRxNormAPI(stub.base_url)
+        monkeypatch.setattr(rxnorm_async, "async_rxnorm_client", client)
+        monkeypatch.setattr(rxnorm_api, "rxnorm_client", RxNormAPI(stub.base_url))
+        registry = ToolRegistry(mock_data, skill_loader, {})
+        args = {"diagnosis": "disc herniation", "allergies": ["celecoxib"]}
+
+        stub.latency = 0.1
+        started = time.perf_counter()
+        result = await registry.aexecute("get_medication_options", args)
+        elapsed = time.perf_counter() - started
+        await client.aclose()
+
+        assert elapsed < 0.6
+        assert "ibuprofen 200 MG Oral Tablet" in result
+        assert "celecoxib" not in result
+        assert result == registry.execute("get_medication_options", args)
+        registry.close()
@@ -0,0 +1,151 @@
+"""RxNorm 디스크 캐시, 인메모리 LRU/요청 합치기 테스트"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.cache import TTLCache
+from backend.services.rxnorm_api import RxNormAPI
+from backend.services.rxnorm_cache import DAY, RxNormDiskCache, cache_key
+
+
+@pytest.fixture
+def clock():
+    return [1_000_000.0]
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return RxNormDiskCache(tmp_path / "rxnorm.sqlite3", negative_ttl=60, stale_ttl=DAY, clock=lambda: clock[0])
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestRxNormDiskCache:
+    """저장/만료 상태 테스트"""
+
+    def test_key_ignores_param_order(self):
+        assert cache_key("u", {"b": 1, "a": 2}) == cache_key("u", {"a": 2, "b": 1}) == "u?a=2&b=1"
+
+    def test_fresh_stale_expired(self, cache, clock):
+        cache.set("k", "drugs", {"x": 1})
+        assert cache.get("k").state == "fresh"
+
+        clock[0] += 7 * DAY
+        assert cache.get("k").state == "stale"
+
+        clock[0] += DAY
+        entry = cache.get("k")
+        assert entry.state == "expired"
+        assert entry.data == {"x": 1}
+        assert cache.purge() == 1
+        assert cache.get("k") is None
+
+    def test_negative_ttl(self, cache, clock):
+        cache.set("k", "drugs", {}, negative=True)
+        clock[0] += 61
+        assert cache.get("k").state == "stale"
+        assert cache.stats()["negative_entries"] == 1
+
+    def test_shared_between_instances(self, tmp_path):
+        """같은 파일을 여는 다른 프로세스/인스턴스와 공유"""
+        path = tmp_path / "shared.sqlite3"
+        RxNormDiskCache(path).set("k", "properties", {"properties": {"rxcui": "1"}})
+        assert RxNormDiskCache(path).get("k").data == {"properties": {"rxcui": "1"}}
+
+
+class TestCachedClient:
+    """RxNormAPI + 디스크 캐시"""
+
+    def test_hit_skips_network(self, stub, cache):
+        client = RxNormAPI(stub.base_url, cache=cache)
+        first = client.search_drugs("ibuprofen")
+        second = RxNormAPI(stub.base_url, cache=cache).search_drugs("ibuprofen")
+
+        assert first == second
+        assert stub.requests == 1
+        assert cache.stats()["fresh"] == 1
+
+    def test_empty_result_negative_cached(self, stub, cache, clock):
+        client = RxNormAPI(stub.base_url, cache=cache)
+        stub.route = lambda path, query: {"properties": None}
+
+        assert client.get_drug_info("999") is None
+        assert client.get_drug_info("999") is None
+        assert stub.requests == 1
+
+        clock[0] += 61 + DAY
+        assert client.get_drug_info("999") is None
+        assert stub.requests == 2
+
+    def test_stale_while_revalidate(self, stub, cache, clock):
+        client = RxNormAPI(stub.base_url, cache=cache)
+        client.get_drug_info("42")
+        stub.route = lambda path, query: {"properties": {"rxcui": "42", "name": "renamed", "tty": "IN"}}
+        clock[0] += 30 * DAY + 1
+
+        stale = client.get_drug_info("42")
+
+        assert stale["name"] == "drug 42"
+        assert _wait_for(lambda: stub.requests == 2)
+        assert _wait_for(lambda: client.get_drug_info("42")["name"] == "renamed")
+        assert stub.requests == 2
+
+    def test_expired_entry_served_when_unreachable(self, stub, cache, clock):
+        client = RxNormAPI(stub.base_url, cache=cache)
+        drugs = client.search_drugs("naproxen")
+        stub.stop()
+        clock[0] += 30 * DAY
+
+        assert client.search_drugs("naproxen") == drugs
+
+
+class TestMemoryCache:
+    """인메모리 LRU + singleflight"""
+
+    def test_concurrent_lookups_coalesced(self, stub):
+        stub.latency = 0.1
+        client = RxNormAPI(stub.base_url, memory=TTLCache(max_entries=16))
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(lambda _: client.search_drugs("ibuprofen"), range(10)))
+
+        assert stub.requests == 1
+        assert all(result == results[0] for result in results)
+        stats = client.stats()
+        assert stats["singleflight"]["calls"] == 1
+        assert stats["singleflight"]["coalesced"] + stats["memory"]["hits"] == 9
+
+    def test_memory_hit_skips_disk(self, stub, cache):
+        client = RxNormAPI(stub.base_url, cache=cache, memory=TTLCache(max_entries=16))
+        client.get_drug_info("7")
+        client.get_drug_info("7")
+
+        assert stub.requests == 1
+        assert client.stats()["memory"]["hits"] == 1
+        assert cache.stats()["miss"] == 1
+        assert cache.stats()["fresh"] == 0
+
+    @pytest.mark.parametrize("age", [30 * DAY + 1, 60 * DAY])
+    def test_stale_disk_hit_not_promoted(self, stub, cache, clock, age):
+        """stale/expired 디스크 항목은 메모리에 올리지 않음 (갱신 실패 시에도 다음 조회는 디스크부터)"""
+        drug = RxNormAPI(stub.base_url, cache=cache).get_drug_info("42")
+        stub.stop()
+        clock[0] += age
+        client = RxNormAPI(stub.base_url, cache=cache, memory=TTLCache(max_entries=16))
+
+        assert client.get_drug_info("42") == drug
+        assert client.stats()["memory"]["size"] == 0
+
+    def test_errors_not_cached(self, stub):
+        client = RxNormAPI(stub.base_url, memory=TTLCache(max_entries=16))
+        stub.stop()
+
+        assert client.search_drugs("ibuprofen") == []
+        assert client.stats()["memory"]["size"] == 0
@@ -0,0 +1,157 @@
+"""오프라인 RxNorm 미러 테스트 (tests/fixtures/rxnorm/rrf 소규모 RRF 세트)"""
+
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.services.rxnorm_api import RxNormAPI
+from backend.services.rxnorm_async import AsyncRxNormAPI
+from backend.services.rxnorm_mirror import RxNormMirror
+
+RRF_DIR = Path(__file__).parent / "fixtures" / "rxnorm" / "rrf"
+
+# 네트워크 사용 시 즉시 실패하는 주소 (미러만 사용하는지 확인)
+UNREACHABLE = "http://127.0.0.1:9"
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = RxNormMirror(tmp_path / "mirror.sqlite3")
+    mirror.import_release(RRF_DIR, batch_size=4)
+    yield mirror
+    mirror.close()
+
+
+class TestImport:
+    """RRF 가져오기 테스트"""
+
+    def test_only_rxnorm_rows_imported(self, mirror):
+        counts = mirror.stats()["imports"]
+        assert counts["RXNCONSO.RRF"]["rows"] == 15
+        assert counts["RXNREL.RRF"]["rows"] == 20
+        assert counts["RXNSAT.RRF"]["rows"] == 8
+
+    def test_unchanged_files_skipped(self, mirror):
+        assert mirror.import_release(RRF_DIR) == {}
+        assert mirror.import_release(RRF_DIR, force=True)["RXNCONSO.RRF"] == 15
+
+    def test_incremental_update(self, mirror, tmp_path):
+        """변경된 행은 갱신, FTS 색인도 함께 갱신"""
+        update = tmp_path / "update"
+        update.mkdir()
+        lines = (RRF_DIR / "RXNCONSO.RRF").read_text(encoding="utf-8").splitlines(keepends=True)
+        (update / "RXNCONSO.RRF").write_text(
+            "".join(line.replace("naproxen 500 MG Oral Tablet", "naproxen sodium 550 MG Oral Tablet")
+                    for line in lines if "naproxen" in line),
+            encoding="utf-8",
+        )
+
+        assert mirror.import_release(update) == {"RXNCONSO.RRF": 2}
+        assert mirror.get_drug_info("198013")["name"] == "naproxen sodium 550 MG Oral Tablet"
+        assert [drug["rxcui"] for drug in mirror.search_drugs("naproxen sodium")] == ["198013"]
+        assert mirror.search_drugs("ibuprofen")
+
+    def test_full_release_deletes_retired_rows(self, mirror, tmp_path):
+        """다음 전체 릴리스에서 빠진 개념/관계/속성은 삭제 (FTS 색인 포함)"""
+        release = tmp_path / "next"
+        release.mkdir()
+        for name in ("RXNCONSO.RRF", "RXNREL.RRF", "RXNSAT.RRF"):
+            lines = (RRF_DIR / name).read_text(encoding="utf-8").splitlines(keepends=True)
+            (release / name).write_text("".join(line for line in lines if "198013" not in line), encoding="utf-8")
+
+        counts = mirror.import_release(release, full=True)
+
+        assert counts == {"RXNCONSO.RRF": 14, "RXNREL.RRF": 18, "RXNSAT.RRF": 7}
+        assert mirror.get_drug_info("198013") is None
+        assert mirror.search_drugs("naproxen") == []
+        assert mirror.get_related_drugs("7258") == []
+        assert mirror.get_attributes("198013") == {}
+        assert mirror.get_drug_info("7258")["name"] == "naproxen"
+        assert mirror.search_drugs("ibuprofen")
+
+    def test_update_release_keeps_missing_rows(self, mirror, tmp_path):
+        """전체 릴리스가 아니면(주간 업데이트) 파일에 없는 행을 지우지 않음"""
+        update = tmp_path / "weekly"
+        update.mkdir()
+        lines = (RRF_DIR / "RXNCONSO.RRF").read_text(encoding="utf-8").splitlines(keepends=True)
+        (update / "RXNCONSO.RRF").write_text("".join(line for line in lines if "198013" not in line), encoding="utf-8")
+
+        mirror.import_release(update)
+
+        assert mirror.get_drug_info("198013")["name"] == "naproxen 500 MG Oral Tablet"
+
+    def test_missing_files_skipped(self, tmp_path):
+        partial = tmp_path / "partial"
+        partial.mkdir()
+        shutil.copy(RRF_DIR / "RXNCONSO.RRF", partial)
+
+        mirror = RxNormMirror(tmp_path / "partial.sqlite3")
+        assert mirror.import_release(partial) == {"RXNCONSO.RRF": 15}
+        assert mirror.get_related_drugs("5640") == []
+
+
+class TestQueries:
+    """RxNormAPI와 같은 반환 형태"""
+
+    def test_search_drugs(self, mirror):
+        drugs = mirror.search_drugs("ibuprofen")
+
+        assert drugs[0] == {
+            "rxcui": "731533", "name": "ibuprofen 200 MG Oral Tablet [Advil]", "synonym": "Advil 200 MG Oral Tablet",
+        }
+        assert [drug["rxcui"] for drug in drugs[1:]] == ["310965", "197805", "197806", "197807"]
+        # 폐기(O)된 개념 제외
+        assert "204442" not in {drug["rxcui"] for drug in mirror.search_drugs("ibuprofen", limit=10)}
+
+    def test_search_by_brand_and_prefix(self, mirror):
+        assert [drug["rxcui"] for drug in mirror.search_drugs("Advil")] == ["731533"]
+        assert mirror.search_drugs("acetamin")[0]["rxcui"] == "313782"
+        assert mirror.search_drugs("unknowndrug") == []
+        assert mirror.search_drugs("\"*)") == []
+
+    def test_drug_info(self, mirror):
+        assert mirror.get_drug_info("5640") == {"rxcui": "5640", "name": "ibuprofen", "synonym": "", "tty": "IN"}
+        assert mirror.get_drug_info("197807")["synonym"] == "Ibuprofen 800mg tab"
+        assert mirror.get_drug_info("0") is None
+
+    def test_related_drugs(self, mirror):
+        related = mirror.get_related_drugs("5640", "SCD")
+        assert [drug["rxcui"] for drug in related] == ["310965", "197805", "197806", "197807"]
+        assert related[0] == {"rxcui": "310965", "name": "ibuprofen 200 MG Oral Tablet", "tty": "SCD"}
+        assert [drug["tty"] for drug in mirror.get_related_drugs("5640", "BN SBD")] == ["BN"]
+
+    def test_attributes(self, mirror):
+        assert mirror.get_attributes("197805") == {"RXN_STRENGTH": ["400 MG"], "RXN_AVAILABLE_STRENGTH": ["400 MG"]}
+
+    def test_search_latency(self, mirror):
+        mirror.search_drugs("ibuprofen")
+        started = time.perf_counter()
+        for _ in range(200):
+            mirror.search_drugs("ibuprofen")
+        assert (time.perf_counter() - started) / 200 < 0.001
+
+
+class TestClientsUseMirror:
+    """미러가 설정되면 검색/속성/관련 약물은 네트워크 없이 응답"""
+
+    def test_sync_client(self, mirror):
+        client = RxNormAPI(UNREACHABLE, mirror=mirror)
+
+        assert client.search_drugs("naproxen") == [
+            {"rxcui": "198013", "name": "naproxen 500 MG Oral Tablet", "synonym": ""},
+        ]
+        assert client.get_drug_info("161")["name"] == "acetaminophen"
+        assert len(client.get_related_drugs("161")) == 2
+        # 상호작용은 RRF에 없으므로 RxNav 조회 (여기서는 연결 실패 → 빈 목록)
+        assert client.get_drug_interactions("161") == []
+
+    @pytest.mark.asyncio
+    async def test_async_client(self, mirror):
+        client = AsyncRxNormAPI(UNREACHABLE, mirror=mirror)
+        try:
+            assert (await client.search_drugs("naproxen"))[0]["rxcui"] == "198013"
+            assert (await client.get_drug_info("161"))["tty"] == "IN"
+        finally:
+            await client.aclose()
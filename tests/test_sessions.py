@@ -0,0 +1,180 @@
+"""세션 저장소 및 컨텍스트 압축 테스트"""
+
+import json
+
+import pytest
+
+from backend import main
+from backend.config import config
+from backend.sessions import (
+    SUMMARY_PREFIX,
+    SessionStore,
+    compact_history,
+    estimate_tokens,
+)
+from tests.test_chat_stream import FINAL_ANSWER, StubClient, use_stub_llm
+
+
+def _turn(index: int, tool_output_chars: int = 3000) -> list:
+    """도구 호출 1회를 포함한 완료된 턴"""
+    return [
+        {"role": "user", "content": f"[환자 ID: P001]\n\n질문 {index}"},
+        {"role": "assistant", "content": None, "tool_calls": [{
+            "id": f"call_{index}",
+            "type": "function",
+            "function": {"name": "analyze_symptoms", "arguments": json.dumps({"symptoms": "허리"})},
+        }]},
+        {"role": "tool", "tool_call_id": f"call_{index}", "content": "## 증상 분석 결과\n" + "가" * tool_output_chars},
+        {"role": "assistant", "content": f"답변 {index}"},
+    ]
+
+
+class TestSessionStore:
+    """SessionStore 테스트"""
+
+    def test_get_or_create(self):
+        """없는 세션은 새로 생성, 저장 후 같은 객체 반환"""
+        store = SessionStore(max_sessions=2, ttl=60)
+        session = store.get_or_create("s1", "P001")
+        assert session.messages == []
+        assert session.patient_id == "P001"
+
+        session.turns = 1
+        store.save(session)
+        assert store.get_or_create("s1", "P001") is session
+        assert len(store) == 1
+
+    def test_lru_limit(self):
+        """최대 세션 수 초과 시 오래된 세션 제거"""
+        store = SessionStore(max_sessions=2, ttl=60)
+        for session_id in ("s1", "s2", "s3"):
+            store.save(store.get_or_create(session_id, "P001"))
+
+        assert len(store) == 2
+        assert store.get_or_create("s1", "P001").turns == 0
+        assert store.stats()["evictions"] == 1
+
+    def test_sessions_scoped_by_patient(self):
+        """같은 session_id라도 다른 환자에게는 새 세션"""
+        store = SessionStore()
+        session = store.get_or_create("s1", "P001")
+        session.turns = 1
+        store.save(session)
+
+        other = store.get_or_create("s1", "P002")
+        assert other is not session
+        assert other.turns == 0
+        assert other.patient_id == "P002"
+
+
+class TestCompaction:
+    """compact_history 테스트"""
+
+    def test_under_budget_unchanged(self):
+        """예산 이내면 그대로 반환"""
+        history = _turn(1, tool_output_chars=100)
+        assert compact_history(history, budget_tokens=10_000) is history
+
+    def test_consumed_tool_outputs_compacted(self):
+        """이전 턴의 도구 결과가 먼저 축약되고 최근 턴은 유지"""
+        history = _turn(1) + _turn(2)
+        compacted = compact_history(history, budget_tokens=1500, keep_recent_turns=1)
+
+        assert len(compacted) == len(history)
+        assert "생략" in compacted[2]["content"]
+        assert compacted[2]["content"].startswith("## 증상 분석 결과")
+        assert compacted[6] == history[6]
+        assert estimate_tokens(compacted) <= 1500
+
+    def test_old_turns_summarized(self):
+        """그래도 넘으면 오래된 턴을 요약 메시지로 병합"""
+        history = _turn(1) + _turn(2) + _turn(3, tool_output_chars=300)
+        compacted = compact_history(history, budget_tokens=170, keep_recent_turns=1)
+
+        assert compacted[0]["role"] == "user"
+        assert compacted[0]["content"].startswith(SUMMARY_PREFIX)
+        assert "질문 1" in compacted[0]["content"]
+        assert "답변 1" in compacted[0]["content"]
+        assert compacted[-4:] == history[-4:]
+        assert estimate_tokens(compacted) <= 170
+
+    def test_existing_summary_extended(self):
+        """기존 요약에 새 턴 요약이 누적"""
+        history = _turn(1) + _turn(2) + _turn(3, tool_output_chars=300)
+        first = compact_history(history, budget_tokens=170)
+        second = compact_history(first + _turn(4, tool_output_chars=300), budget_tokens=170)
+
+        summaries = [m for m in second if str(m.get("content")).startswith(SUMMARY_PREFIX)]
+        assert len(summaries) == 1
+        assert "질문 1" in summaries[0]["content"]
+        assert "질문 3" in summaries[0]["content"]
+
+    def test_images_dropped_from_old_turns(self):
+        """이전 턴의 첨부 이미지는 텍스트 표시로 교체"""
+        image_turn = _turn(1, tool_output_chars=10)
+        image_turn[0] = {"role": "user", "content": [
+            {"type": "text", "text": "사진 확인"},
+            {"type": "image_url", "image_url": {"url": "data:image/jpeg;base64,xxxx"}},
+        ]}
+        history = image_turn + _turn(2, tool_output_chars=10)
+        compacted = compact_history(history, budget_tokens=100)
+
+        assert isinstance(compacted[0]["content"], str)
+        assert "이미지" in compacted[0]["content"]
+
+
+class TestSessionChat:
+    """process_chat 세션 연동 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_follow_up_reuses_history(self, monkeypatch):
+        """후속 질문 요청에 이전 대화가 포함되고 시스템 프롬프트는 하나"""
+        client = StubClient([{"content": FINAL_ANSWER}])
+        use_stub_llm(monkeypatch, client)
+        monkeypatch.setattr(main, "session_store", SessionStore())
+
+        first = [json.loads(e) async for e in main.process_chat("허리가 아파요", session_id="s1")]
+        second = [json.loads(e) async for e in main.process_chat("약은 뭘 먹나요?", session_id="s1")]
+
+        follow_up = client.completions.calls[1]["messages"]
+        assert [m["role"] for m in follow_up] == ["system", "user", "assistant", "user"]
+        assert follow_up[2]["content"] == FINAL_ANSWER
+        assert not [e for e in first if e["data"].get("step") == "session_resumed"]
+        assert [e for e in second if e["data"].get("step") == "session_resumed"]
+
+    @pytest.mark.asyncio
+    async def test_other_patient_cannot_resume_session(self, monkeypatch):
+        """다른 환자의 session_id로는 이전 대화를 이어갈 수 없음"""
+        client = StubClient([{"content": FINAL_ANSWER}])
+        use_stub_llm(monkeypatch, client)
+        store = SessionStore()
+        monkeypatch.setattr(main, "session_store", store)
+
+        [e async for e in main.process_chat("허리가 아파요", patient_id="P001", session_id="s1")]
+        events = [json.loads(e) async for e in main.process_chat("제 기록 보여주세요", patient_id="P002", session_id="s1")]
+
+        assert [m["role"] for m in client.completions.calls[1]["messages"]] == ["system", "user"]
+        assert not [e for e in events if e["data"].get("step") == "session_resumed"]
+        assert store.get_or_create("s1", "P001").turns == 1
+        assert store.get_or_create("s1", "P002").turns == 1
+        assert "P002" not in json.dumps(store.get_or_create("s1", "P001").messages, ensure_ascii=False)
+
+    @pytest.mark.asyncio
+    async def test_history_compacted_over_budget(self, monkeypatch):
+        """예산 초과 시 압축 이벤트가 발생하고 압축된 이력이 저장됨"""
+        client = StubClient([{"content": FINAL_ANSWER}])
+        store = SessionStore()
+        session = store.get_or_create("s1", "P001")
+        session.messages = _turn(1) + _turn(2)
+        session.turns = 2
+        store.save(session)
+
+        use_stub_llm(monkeypatch, client)
+        monkeypatch.setattr(main, "session_store", store)
+        monkeypatch.setattr(config, "context_token_budget", 1500)
+
+        events = [json.loads(e) async for e in main.process_chat("추가 질문", session_id="s1")]
+
+        assert [e for e in events if e["data"].get("step") == "context_compacted"]
+        assert estimate_tokens(store.get_or_create("s1", "P001").messages) < estimate_tokens(_turn(1) + _turn(2))
+        assert store.get_or_create("s1", "P001").turns == 3
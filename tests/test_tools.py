@@ -1,7 +1,13 @@
 """도구 레지스트리 테스트"""
 
+import asyncio
+import json
+import threading
+import time
+
 import pytest
-from backend.tools.registry import ToolRegistry
+from backend.services import rxnorm_api
+from backend.tools.registry import ToolRegistry, ToolCachePolicy, ToolError
 from backend.skill_loader import SkillLoader
 from data.mock_data import MockDataSource
 
@@ -152,6 +158,182 @@ class TestToolRegistry:
         assert result is not None
 
 
+class TestAsyncExecute:
+    """ToolRegistry.aexecute 테스트"""
+
+    @pytest.fixture
+    def tool_registry(self, skill_loader, mock_data):
+        """ToolRegistry fixture"""
+        return ToolRegistry(mock_data, skill_loader)
+
+    @pytest.mark.asyncio
+    async def test_sync_tool_runs_off_loop(self, tool_registry):
+        """동기 도구는 이벤트 루프 밖의 스레드에서 실행"""
+        threads = []
+
+        def probe(**kwargs):
+            threads.append(threading.current_thread())
+            return "ok"
+
+        tool_registry._tools["probe"] = probe
+        result = await tool_registry.aexecute("probe", {})
+
+        assert result == "ok"
+        assert threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_async_tool_awaited_natively(self, tool_registry):
+        """코루틴 도구는 루프에서 직접 await"""
+        async def probe(value: str):
+            await asyncio.sleep(0)
+            return f"async:{value}"
+
+        tool_registry._tools["probe"] = probe
+        assert await tool_registry.aexecute("probe", {"value": "x"}) == "async:x"
+
+    @pytest.mark.asyncio
+    async def test_async_tool_error(self, tool_registry):
+        """코루틴 도구 예외는 ToolError로 전달"""
+        async def probe():
+            raise ValueError("boom")
+
+        tool_registry._tools["probe"] = probe
+        with pytest.raises(ToolError, match="boom"):
+            await tool_registry.aexecute("probe", {})
+
+    @pytest.mark.asyncio
+    async def test_sync_tool_error_and_unknown_tool(self, tool_registry):
+        """동기 도구 예외와 알 수 없는 도구도 ToolError (execute는 오류 JSON 유지)"""
+        def probe():
+            raise TypeError("bad args")
+
+        tool_registry._tools["probe"] = probe
+        with pytest.raises(ToolError, match="bad args"):
+            await tool_registry.aexecute("probe", {})
+        with pytest.raises(ToolError, match="nonexistent_tool"):
+            await tool_registry.aexecute("nonexistent_tool", {})
+        assert json.loads(tool_registry.execute("probe", {})) == {"error": "bad args"}
+
+    @pytest.mark.asyncio
+    async def test_matches_execute(self, tool_registry):
+        """동기 실행과 동일한 결과"""
+        args = {"body_part": "spine"}
+        assert await tool_registry.aexecute("analyze_xray", args) == tool_registry.execute("analyze_xray", args)
+
+
+class TestToolCache:
+    """도구 결과 메모이제이션 테스트"""
+
+    @pytest.fixture
+    def counted_registry(self, skill_loader, mock_data):
+        """호출 횟수를 세는 도구가 등록된 레지스트리"""
+        registry = ToolRegistry(mock_data, skill_loader, {
+            "pure": ToolCachePolicy(cacheable=True, ttl=60, max_entries=2),
+            "volatile": ToolCachePolicy(cacheable=False),
+        })
+        calls = {"pure": 0, "volatile": 0}
+
+        def pure(**kwargs):
+            calls["pure"] += 1
+            return f"pure:{sorted(kwargs.items())}"
+
+        def volatile(**kwargs):
+            calls["volatile"] += 1
+            return "volatile"
+
+        registry._tools.update(pure=pure, volatile=volatile)
+        return registry, calls
+
+    def test_cacheable_tool_memoized(self, counted_registry):
+        """같은 인자는 키 순서와 무관하게 한 번만 실행"""
+        registry, calls = counted_registry
+        first = registry.execute("pure", {"a": 1, "b": 2})
+        second = registry.execute("pure", {"b": 2, "a": 1})
+
+        assert first == second
+        assert calls["pure"] == 1
+        assert registry.cache_stats()["pure"]["hits"] == 1
+
+    def test_non_cacheable_tool_always_runs(self, counted_registry):
+        """캐시 불가 도구는 매번 실행, 통계에도 없음"""
+        registry, calls = counted_registry
+        registry.execute("volatile", {})
+        registry.execute("volatile", {})
+
+        assert calls["volatile"] == 2
+        assert "volatile" not in registry.cache_stats()
+
+    def test_lru_limit_per_tool(self, counted_registry):
+        """도구별 최대 항목 수 초과 시 오래된 항목 제거"""
+        registry, calls = counted_registry
+        for value in (1, 2, 3, 1):
+            registry.execute("pure", {"a": value})
+
+        assert calls["pure"] == 4
+        assert registry.cache_stats()["pure"]["evictions"] == 2
+
+    def test_errors_not_cached(self, skill_loader, mock_data):
+        """예외 결과는 캐시하지 않음"""
+        registry = ToolRegistry(mock_data, skill_loader)
+        registry.execute("analyze_symptoms", {})
+        registry.execute("analyze_symptoms", {})
+
+        assert registry.cache_stats()["analyze_symptoms"]["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_medication_fallback_not_cached(self, monkeypatch, skill_loader, mock_data):
+        """RxNav 장애 시 대체(데모) 데이터는 반환하되 캐시하지 않음 - 복구 후 바로 재조회"""
+        from backend.services import rxnorm_async
+
+        monkeypatch.setattr(rxnorm_api, "rxnorm_client", rxnorm_api.RxNormAPI("http://127.0.0.1:9"))
+        monkeypatch.setattr(rxnorm_async, "async_rxnorm_client", rxnorm_async.AsyncRxNormAPI("http://127.0.0.1:9"))
+        registry = ToolRegistry(mock_data, skill_loader)
+        args = {"diagnosis": "back pain"}
+
+        assert "Fallback Data" in registry.execute("get_medication_options", args)
+        assert "Fallback Data" in await registry.aexecute("get_medication_options", args)
+        await rxnorm_async.async_rxnorm_client.aclose()
+        registry.close()
+
+        assert registry.cache_stats()["get_medication_options"]["size"] == 0
+
+    def test_default_policies(self, skill_loader, mock_data):
+        """결정적 도구는 캐시, 환자 병력은 캐시하지 않음"""
+        registry = ToolRegistry(mock_data, skill_loader)
+        registry.execute("analyze_xray", {"body_part": "spine"})
+        registry.execute("analyze_xray", {"body_part": "spine"})
+        registry.execute("get_patient_history", {"patient_id": "P001"})
+
+        stats = registry.cache_stats()
+        assert stats["analyze_xray"]["hits"] == 1
+        assert "get_patient_history" not in stats
+
+    def test_clear_cache(self, counted_registry):
+        """캐시 비우기 후 재실행"""
+        registry, calls = counted_registry
+        registry.execute("pure", {"a": 1})
+        registry.clear_cache("pure")
+        registry.execute("pure", {"a": 1})
+
+        assert calls["pure"] == 2
+
+    @pytest.mark.asyncio
+    async def test_async_tool_memoized(self, counted_registry):
+        """코루틴 도구도 같은 정책으로 캐시"""
+        registry, _ = counted_registry
+        calls = []
+
+        async def pure(**kwargs):
+            calls.append(kwargs)
+            return "async"
+
+        registry._tools["pure"] = pure
+        await registry.aexecute("pure", {"a": 1})
+        await registry.aexecute("pure", {"a": 1})
+
+        assert len(calls) == 1
+
+
 class TestMockDataSource:
     """MockDataSource 테스트"""
 
@@ -191,3 +373,30 @@ class TestMockDataSource:
         assert "severity" in result
         assert result["severity"] in ["mild", "moderate", "severe"]
         assert "urgency" in result
+
+
+class TestMedicationFanOut:
+    """약물 조회 도구의 RxNorm 동시 조회"""
+
+    def test_lookups_run_concurrently_in_order(self, monkeypatch, stub, skill_loader, mock_data):
+        """조회 15건이 2단계(검색, 상세)로 실행되고 출력 순서는 검색 순서를 따름"""
+        from benchmarks.rxnorm_stub import _rxcui
+
+        stub.latency = 0.1
+        monkeypatch.setattr(rxnorm_api, "rxnorm_client", rxnorm_api.RxNormAPI(stub.base_url))
+        registry = ToolRegistry(mock_data, skill_loader, {}, lookup_workers=16)
+
+        started = time.perf_counter()
+        result = registry.execute("get_medication_options", {"diagnosis": "back pain", "allergies": ["naproxen"]})
+        elapsed = time.perf_counter() - started
+        registry.close()
+
+        assert stub.requests == 3 + 2 * 4
+        assert elapsed < 0.6
+        names = [line.strip("*") for line in result.splitlines() if line.startswith("**") and "MG" in line]
+        assert names == [
+            "ibuprofen 200 MG Oral Tablet", "ibuprofen 400 MG Oral Tablet",
+            "acetaminophen 200 MG Oral Tablet", "acetaminophen 400 MG Oral Tablet",
+        ]
+        assert f"- RxCUI: {_rxcui('ibuprofen', 0)}" in result
+        assert result.count("Known interactions: 2 found") == 4
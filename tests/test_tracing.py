@@ -0,0 +1,166 @@
+"""트레이싱 테스트"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main, tracing
+from backend.events import parse_sse
+from backend.llm import ScriptedBackend
+from backend.services import rxnorm_async
+from backend.tracing import Tracer
+
+
+def _names(trace: dict) -> list:
+    return [span["name"] for span in trace["spans"]]
+
+
+class TestTracer:
+    """스팬 중첩/보관/내보내기 테스트"""
+
+    def test_nested_spans_follow_context(self):
+        root = Tracer().start_trace("consultation", "t1")
+        with root.child("tool") as tool:
+            with tracing.span("rxnorm.drugs") as call:
+                pass
+        root.end()
+
+        assert call.parent_id == tool.span_id
+        assert tool.parent_id == root.span_id
+        assert call.trace_id == "t1"
+
+    def test_span_without_parent_is_noop(self):
+        with tracing.span("orphan") as span:
+            span.set(ignored=True)
+        assert span is tracing.NOOP_SPAN
+
+    def test_context_copied_to_executor_thread(self):
+        """동기 도구는 워커 스레드에서 실행되어도 현재 스팬을 부모로 사용"""
+        root = Tracer().start_trace("consultation")
+        main.tool_registry.clear_cache("read_skill")
+
+        async def run():
+            with root:
+                await main.tool_registry.aexecute("read_skill", {"skill_name": "symptom-analysis"})
+
+        asyncio.run(run())
+        execute = root.trace.to_dict()["spans"][1]
+        assert execute["name"] == "tool.execute"
+        assert execute["parent_id"] == root.span_id
+
+    def test_recent_traces_evicted(self):
+        tracer = Tracer(max_traces=2)
+        for trace_id in ("a", "b", "c"):
+            tracer.start_trace("consultation", trace_id).end()
+
+        assert tracer.get("a") is None
+        assert tracer.get("c")["finished"] is True
+
+    def test_error_recorded(self):
+        root = Tracer().start_trace("consultation")
+        with pytest.raises(ValueError):
+            with root.child("tool"):
+                raise ValueError("boom")
+
+        assert root.trace.to_dict()["spans"][1]["error"] == "ValueError: boom"
+
+    def test_disabled_tracer(self):
+        root = Tracer(enabled=False).start_trace("consultation")
+        assert root is tracing.NOOP_SPAN
+        assert root.trace_id is None
+
+    def test_otlp_export(self, tmp_path):
+        path = tmp_path / "traces" / "traces.jsonl"
+        tracer = Tracer(export_path=path)
+        root = tracer.start_trace("consultation", patient_id="P001", iterations=3)
+        root.child("llm.call", streaming=True).end()
+        root.end()
+        tracer.close()
+
+        exported = json.loads(path.read_text(encoding="utf-8"))
+        spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == ["consultation", "llm.call"]
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert {"key": "iterations", "value": {"intValue": "3"}} in spans[0]["attributes"]
+        assert {"key": "streaming", "value": {"boolValue": True}} in spans[1]["attributes"]
+
+    def test_export_written_by_background_thread(self, tmp_path, monkeypatch):
+        """루트 스팬을 닫는 스레드는 파일을 쓰지 않고, 쓰기 스레드가 순서대로 추가"""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(export_path=path)
+        writers = []
+        open_file = type(path).open
+
+        def recording_open(self, *args, **kwargs):
+            writers.append(threading.current_thread().name)
+            return open_file(self, *args, **kwargs)
+
+        monkeypatch.setattr(type(path), "open", recording_open)
+        for trace_id in ("a", "b", "c"):
+            tracer.start_trace("consultation", trace_id).end()
+        tracer.flush()
+
+        assert set(writers) == {"trace-export"}
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["traceId"] for line in lines] == ["a", "b", "c"]
+        tracer.close()
+
+    def test_export_queue_full_drops(self, tmp_path):
+        tracer = Tracer(export_path=tmp_path / "traces.jsonl", export_queue_size=1)
+        tracer._exporter = threading.current_thread()  # 쓰기 스레드가 비우지 않는 상태
+        tracer.start_trace("consultation").end()
+        tracer.start_trace("consultation").end()
+        assert tracer.export_dropped == 1
+
+
+class TestConsultationTrace:
+    """상담 트레이스 - LLM 반복, 도구, RxNorm 호출이 중첩 기록됨"""
+
+    @pytest.mark.asyncio
+    async def test_spans_recorded(self, monkeypatch, stub):
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend(medications=True))
+        client = rxnorm_async.AsyncRxNormAPI(stub.base_url)
+        monkeypatch.setattr(rxnorm_async, "async_rxnorm_client", client)
+        main.tool_registry.clear_cache()
+        result = main.ConsultationResult()
+
+        events = [json.loads(e) async for e in main.process_chat("허리가 아파요", "P002", result=result)]
+        await client.aclose()
+        trace = main.tracer.get(result.trace_id)
+        names = _names(trace)
+        spans = {span["span_id"]: span for span in trace["spans"]}
+
+        assert events[-1]["data"]["trace_id"] == result.trace_id
+        assert trace["finished"] is True
+        assert names[0] == "consultation"
+        assert names.count("llm.call") == 5
+        assert names.count("tool") == 5
+        assert "discovery" in names
+        rxnorm = [span for span in trace["spans"] if span["name"].startswith("rxnorm.")]
+        assert rxnorm
+        assert stub.requests == len(rxnorm)
+        # rxnorm.* → tool.execute → tool(get_medication_options) → consultation
+        execute = spans[rxnorm[0]["parent_id"]]
+        tool = spans[execute["parent_id"]]
+        assert execute["name"] == "tool.execute"
+        assert tool["attributes"]["tool"] == "get_medication_options"
+        assert tool["parent_id"] == trace["spans"][0]["span_id"]
+
+    def test_trace_id_header_and_lookup(self, monkeypatch):
+        monkeypatch.setattr(main, "llm_backend", ScriptedBackend())
+        client = TestClient(main.app)
+
+        response = client.post("/api/chat", json={"message": "어깨가 아파요", "pacing": "fast"})
+        trace_id = response.headers["x-trace-id"]
+        usage = parse_sse(response.text)[-1]
+
+        assert usage["data"]["trace_id"] == trace_id
+        trace = client.get(f"/api/traces/{trace_id}").json()
+        assert trace["trace_id"] == trace_id
+        assert trace["spans"][0]["attributes"]["iterations"] == 5
+
+    def test_unknown_trace(self):
+        assert TestClient(main.app).get("/api/traces/unknown").status_code == 404
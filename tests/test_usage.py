@@ -0,0 +1,65 @@
+"""토큰 사용량 집계 테스트"""
+
+import json
+from types import SimpleNamespace
+
+from backend.tools.definitions import TOOL_DEFINITIONS, CACHEABLE_TOOL_DEFINITIONS
+from backend.usage import TokenPricing, UsageTracker
+
+
+def _usage(prompt: int, cached: int, completion: int):
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+class TestUsageTracker:
+    """UsageTracker 테스트"""
+
+    def test_totals_and_ratio(self):
+        """반복별 사용량 누적 및 캐시 재사용률"""
+        tracker = UsageTracker()
+        tracker.record(1, _usage(1000, 0, 100))
+        tracker.record(2, _usage(1500, 1000, 50))
+
+        assert tracker.prompt_tokens == 2500
+        assert tracker.cached_tokens == 1000
+        assert tracker.completion_tokens == 150
+        assert tracker.total_tokens == 2650
+        assert tracker.cache_hit_ratio == 0.4
+
+    def test_cost_and_savings(self):
+        """캐시 토큰은 할인 단가로 계산"""
+        tracker = UsageTracker(pricing=TokenPricing(input=2.0, cached_input=1.0, output=8.0))
+        tracker.record(1, _usage(1_000_000, 500_000, 1_000_000))
+
+        assert tracker.cost == 500_000 * 2.0 / 1e6 + 500_000 * 1.0 / 1e6 + 8.0
+        assert tracker.savings == 0.5
+
+    def test_missing_usage(self):
+        """usage가 없는 응답도 0으로 기록"""
+        tracker = UsageTracker()
+        tracker.record(1, None)
+        tracker.record(2, SimpleNamespace(prompt_tokens=10, completion_tokens=2, prompt_tokens_details=None))
+
+        summary = tracker.summary()
+        assert summary["prompt_tokens"] == 10
+        assert summary["cached_tokens"] == 0
+        assert len(summary["iterations"]) == 2
+
+
+class TestCacheableToolDefinitions:
+    """정규화된 도구 정의 테스트"""
+
+    def test_sorted_by_name(self):
+        """이름순 정렬, 도구 누락 없음"""
+        names = [tool["function"]["name"] for tool in CACHEABLE_TOOL_DEFINITIONS]
+        assert names == sorted(names)
+        assert set(names) == {tool["function"]["name"] for tool in TOOL_DEFINITIONS}
+
+    def test_serialization_is_canonical(self):
+        """키 정렬 직렬화와 동일"""
+        serialized = json.dumps(CACHEABLE_TOOL_DEFINITIONS, ensure_ascii=False)
+        assert serialized == json.dumps(CACHEABLE_TOOL_DEFINITIONS, sort_keys=True, ensure_ascii=False)